@@ -0,0 +1,164 @@
+"""Compare the compiled metrics serializers with the previous reflective code.
+
+Three things are measured separately: to_dict itself, json.dumps through the
+metrics encoder, and the JSON round trip get_ai_analysis no longer makes.
+
+Run from the repository root:
+
+    python benchmarks/bench_metrics_serialization.py --repos 200 --users 500
+"""
+
+import argparse
+import json
+import random
+import sys
+import timeit
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from coderush_cli.github.models.metrics import OrganizationMetrics  # noqa: E402
+from coderush_cli.serialization import MetricsJSONEncoder, metrics_to_dict  # noqa: E402
+
+
+def legacy_to_dict(self):
+  """BaseMetrics.to_dict as it was before the compiled serializers"""
+
+  def convert(obj):
+    if isinstance(obj, datetime):
+      return obj.isoformat()
+    if isinstance(obj, set):
+      return list(obj)
+    if isinstance(obj, defaultdict):
+      return dict(obj)
+    if callable(obj):
+      return None
+    if hasattr(obj, "to_dict"):
+      # Nested metrics used the same reflective to_dict
+      return legacy_to_dict(obj)
+    if hasattr(obj, "__dict__"):
+      return {
+        k: convert(v)
+        for k, v in obj.__dict__.items()
+        if not k.startswith("_") and not callable(v)
+      }
+    return obj
+
+  return {
+    k: convert(v)
+    for k, v in self.__dict__.items()
+    if not k.startswith("_") and not callable(v)
+  }
+
+
+class LegacyMetricsJSONEncoder(json.JSONEncoder):
+  def default(self, obj):
+    if isinstance(obj, datetime):
+      return obj.isoformat()
+    if isinstance(obj, set):
+      return list(obj)
+    if isinstance(obj, defaultdict):
+      return dict(obj)
+    if callable(obj):
+      return None
+    if hasattr(obj, "__dict__"):
+      return {
+        k: v
+        for k, v in obj.__dict__.items()
+        if not k.startswith("_") and not callable(v)
+      }
+    try:
+      return super().default(obj)
+    except Exception:
+      return str(obj)
+
+
+def build_metrics(repos: int, users: int, prs_per_repo: int) -> OrganizationMetrics:
+  rng = random.Random(42)
+  metrics = OrganizationMetrics(name="bench")
+  usernames = [f"user-{index}" for index in range(users)]
+  start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+  for repo_index in range(repos):
+    repo = metrics.get_or_create_repository(f"org/repo-{repo_index}")
+    for number in range(prs_per_repo):
+      author = rng.choice(usernames)
+      user = metrics.get_or_create_user(author, team=f"team-{hash(author) % 10}")
+      repo.contributors.add(author)
+      repo.prs_created += 1
+      user.prs_created += 1
+      for target in (repo, user):
+        target.time_metrics.time_to_merge.append(rng.uniform(1, 200))
+        target.time_metrics.lead_times.append(rng.uniform(1, 400))
+        target.code_metrics.changes_per_pr.append(rng.randrange(1, 2000))
+        target.review_metrics.review_wait_times.append(rng.uniform(0, 72))
+      for reviewer in rng.sample(usernames, 2):
+        repo.review_metrics.reviewers_per_pr[number].add(reviewer)
+        repo.collaboration_metrics.comments_by_user[reviewer][number] += 1
+      repo.last_updated = start + timedelta(hours=number)
+  return metrics
+
+
+def timed(label: str, func, number: int) -> float:
+  seconds = min(timeit.repeat(func, number=number, repeat=5)) / number
+  print(f"  {label:<32} {seconds * 1000:9.2f} ms")
+  return seconds
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--repos", type=int, default=100)
+  parser.add_argument("--users", type=int, default=300)
+  parser.add_argument("--prs-per-repo", type=int, default=200)
+  parser.add_argument("--number", type=int, default=3)
+  args = parser.parse_args()
+
+  metrics = build_metrics(args.repos, args.users, args.prs_per_repo)
+  print(
+    f"OrganizationMetrics with {args.repos} repositories, {args.users} users, "
+    f"{args.repos * args.prs_per_repo} PRs"
+  )
+
+  repositories = list(metrics.repositories.values()) + list(metrics.users.values())
+  print("Compiled serializers: to_dict of every repository and user")
+  # The reflective to_dict copied defaultdicts shallowly, leaving nested sets behind
+  legacy = timed("reflective (before)", lambda: [legacy_to_dict(m) for m in repositories], args.number)
+  compiled = timed("compiled serializer", lambda: [m.to_dict() for m in repositories], args.number)
+  print(f"  speedup {legacy / compiled:.1f}x")
+
+  print("Encoder: json.dumps(OrganizationMetrics)")
+  legacy = timed(
+    "reflective encoder (before)",
+    lambda: json.dumps(metrics, cls=LegacyMetricsJSONEncoder),
+    args.number,
+  )
+  compiled = timed(
+    "shared encoder",
+    lambda: json.dumps(metrics, cls=MetricsJSONEncoder),
+    args.number,
+  )
+  print(f"  speedup {legacy / compiled:.1f}x")
+  # Writing the numbers out costs both encoders the same; the rest is conversion
+  plain = metrics_to_dict(metrics)
+  writing = timed("json module alone, on plain data", lambda: json.dumps(plain), args.number)
+  print(
+    f"  conversion {(legacy - writing) * 1000:.2f} ms before, "
+    f"{(compiled - writing) * 1000:.2f} ms after"
+  )
+
+  print("Round trip removed: metrics summary for the AI analysis")
+  legacy = timed(
+    "json.dumps + json.loads (before)",
+    lambda: json.loads(
+      json.dumps(metrics, cls=LegacyMetricsJSONEncoder, indent=2, default=str)
+    ),
+    args.number,
+  )
+  compiled = timed("compiled serializer", lambda: metrics_to_dict(metrics), args.number)
+  print(f"  speedup {legacy / compiled:.1f}x")
+
+
+if __name__ == "__main__":
+  main()
@@ -19,8 +19,13 @@ setup(
     "rich-click>=1.6.1",
     "rich>=13.3.5",
     "plotly",
+    "numpy>=1.22.0",
     "markdown",
+    "msgpack>=1.0.0",
   ],
+  extras_require={
+    "images": ["kaleido>=0.2.1"],
+  },
   entry_points={
     "console_scripts": [
       "coderush-cli=coderush_cli.main:main",
@@ -13,10 +13,13 @@ console = Console()
 
 @click.command()
 @click.argument("initial_question", required=False)
-def chat(initial_question=None):
+@click.option("--run", "run_id", help="Id of the analysis run to chat about (default: latest)")
+def chat(initial_question=None, run_id=None):
   """Interactive chat about your engineering metrics"""
-  # Get the latest analysis data
-  data = get_latest_analysis()
+  # Get the latest analysis data, or the requested run
+  data = get_latest_analysis(run_id)
+  if run_id and not data:
+    return
   if not data:
     console.print("[yellow]No recent analysis found. Running new analysis...[/]\n")
     ctx = click.get_current_context()
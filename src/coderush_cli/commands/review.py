@@ -1,10 +1,16 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from datetime import datetime, timedelta
 from pathlib import Path
+from typing import Any, Callable, NamedTuple, Optional
 
 import rich_click as click
 from anthropic import APIError, InternalServerError, RateLimitError
 from rich.console import Console
 from rich.panel import Panel
+from rich.progress import Progress, SpinnerColumn, TextColumn, TimeElapsedColumn
 
 from .config import config
 from .. import __version__
@@ -22,18 +28,35 @@ from ..github.github_metrics import get_github_metrics
 from ..linear.linear_display import display_linear_metrics
 from ..linear.linear_metrics import get_linear_metrics
 from ..split_metrics import display_split_metrics, get_split_metrics
-from ..utils import load_config, save_analysis_data
+from ..utils import SAVE_FORMATS, load_config, save_analysis_data
 
 console = Console()
 CONFIG_FILE = Path.home() / ".coderush" / "config.json"
 
+SOURCE_LABELS = {"github": "GitHub", "linear": "Linear", "split": "Split"}
+SOURCE_RENDERERS = {"linear": display_linear_metrics, "split": display_split_metrics}
+# Upper bound on each source's wall time, in seconds; collectors run concurrently
+COLLECTOR_TIMEOUTS = {"github": 30 * 60, "linear": 10 * 60, "split": 5 * 60, "ai": 5 * 60}
+
+
+class CollectorResult(NamedTuple):
+  metrics: Any
+  # Why the collector produced no metrics, when it raised or timed out
+  error: Optional[str] = None
+
 
 @click.command()
 @click.option("--start-date", "-s", type=click.DateTime(), help="Start date for analysis (YYYY-MM-DD)", )
 @click.option("--end-date", "-e", type=click.DateTime(), help="End date for analysis (YYYY-MM-DD)")
 @click.option("--user", "-u", help="Filter by GitHub username")
 @click.option("--team", "-t", help="Filter by GitHub team name")
-def review(start_date, end_date, user, team):
+@click.option(
+  "--save-format",
+  type=click.Choice(SAVE_FORMATS),
+  default="snapshot",
+  help="Format of the saved run: compact binary snapshot, or JSON for other tools",
+)
+def review(start_date, end_date, user, team, save_format):
   """Review engineering metrics"""
   # Handle end date
   if end_date is None:
@@ -83,73 +106,154 @@ def review(start_date, end_date, user, team):
   if team:
     console.print(f"👥 Filtering by team: [yellow]{team}[/]")
 
+  collectors = {"github": (get_github_metrics, (entity_name, start_date, end_date, user, team))}
+  if get_linear_api_key():
+    collectors["linear"] = (get_linear_metrics, (start_date, end_date, user))
+  else:
+    console.print("[yellow]⚠️  Linear integration not configured[/]")
+  if get_split_api_key():
+    collectors["split"] = (get_split_metrics, (start_date, end_date))
+  else:
+    console.print("[yellow]⚠️  Split.io integration not configured[/]")
+
   all_metrics = {}
   analysis_result = None
 
-  with console.status("[bold green]Fetching metrics...") as status:
-    # GitHub metrics
-    status.update("Fetching GitHub metrics...")
-    metrics = get_github_metrics(entity_name, start_date, end_date, user, team)
+  with Progress(
+      SpinnerColumn(),
+      TextColumn("[progress.description]{task.description}"),
+      TimeElapsedColumn(),
+      transient=True,
+  ) as progress:
+    pending = {}
+    for source, (collect, args) in collectors.items():
+      task_id = progress.add_task(f"Fetching {SOURCE_LABELS[source]} metrics...", total=None)
+      kwargs = {"progress": progress, "progress_task": task_id} if source == "github" else {}
+      future = run_in_background(collect, *args, **kwargs)
+      pending[future] = (source, task_id, time.monotonic() + COLLECTOR_TIMEOUTS[source])
+
+    ai_future = None
+    while pending:
+      next_deadline = min(deadline for _, _, deadline in pending.values())
+      wait(pending, timeout=max(next_deadline - time.monotonic(), 0), return_when=FIRST_COMPLETED)
+
+      # Settle every finished or expired collector before rendering anything,
+      # so the AI analysis can start while the last section is being printed
+      now = time.monotonic()
+      settled = []
+      for future, (source, task_id, deadline) in list(pending.items()):
+        if not future.done() and now < deadline:
+          continue
+        del pending[future]
+        # Hide rather than remove: a timed-out collector may still report progress
+        progress.update(task_id, visible=False)
+        result = collect_result(source, future)
+        if result.metrics is not None:
+          all_metrics[source] = result.metrics
+        settled.append((source, result))
+
+      if not pending and get_anthropic_api_key():
+        ai_task = progress.add_task("Generating AI analysis...", total=None)
+        ai_future = run_in_background(get_ai_analysis, all_metrics)
+
+      for source, result in settled:
+        render_section(source, result, mode)
+
+    if ai_future is not None:
+      analysis_result = render_ai_analysis(ai_future)
+      progress.update(ai_task, visible=False)
+    elif not get_anthropic_api_key():
+      console.print("[yellow]⚠️  AI analysis not configured[/]")
+
+  # Save the analysis data
+  run_file = save_analysis_data(
+    all_metrics,
+    analysis_result,
+    start_date,
+    end_date,
+    {"user": user, "team": team},
+    save_format,
+  )
+  console.print(f"\n[dim]Analysis saved to: {run_file}[/]")
+
+
+def run_in_background(func: Callable[..., Any], *args: Any, **kwargs: Any) -> "Future[Any]":
+  """Run func on a daemon thread so an abandoned collector cannot block exit"""
+  future: "Future[Any]" = Future()
+
+  def run() -> None:
+    if not future.set_running_or_notify_cancel():
+      return
+    try:
+      future.set_result(func(*args, **kwargs))
+    except BaseException as e:
+      future.set_exception(e)
+
+  threading.Thread(target=run, name=f"coderush-{func.__name__}", daemon=True).start()
+  return future
+
+
+def collect_result(source: str, future: "Future[Any]") -> CollectorResult:
+  """Return a collector's metrics, or why there are none if it failed or timed out"""
+  label = SOURCE_LABELS[source]
+  if not future.done():
+    return CollectorResult(
+      None,
+      f"[yellow]⚠️  {label} metrics timed out after {COLLECTOR_TIMEOUTS[source] // 60} minutes[/]",
+    )
+  try:
+    return CollectorResult(future.result())
+  except Exception as e:
+    return CollectorResult(None, f"[red]Error: Failed to fetch {label} metrics: {str(e)}[/]")
+
 
+def render_section(source: str, result: CollectorResult, mode: str) -> None:
+  """Display one source's metrics as soon as they are available"""
+  metrics = result.metrics
+  if result.error is not None:
+    console.print(result.error)
+  elif source == "github":
     if metrics:
-      all_metrics["github"] = metrics
       display_github_metrics(metrics)
+    elif mode == "organization":
+      console.print("[yellow]⚠️  GitHub App not installed[/]")
+      console.print(f"Please install the app at: {CODERUSH_APP['APP_URL']}")
     else:
-      if mode == "organization":
-        console.print("[yellow]⚠️  GitHub App not installed[/]")
-        console.print(f"Please install the app at: {CODERUSH_APP['APP_URL']}")
-      else:
-        console.print("[red]Error: Failed to fetch GitHub metrics[/]")
-
-    # Linear metrics
-    if get_linear_api_key():
-      status.update("Fetching Linear metrics...")
-      linear_metrics = get_linear_metrics(start_date, end_date, user)
-      all_metrics["linear"] = linear_metrics
-      display_linear_metrics(linear_metrics)
-    else:
-      console.print("[yellow]⚠️  Linear integration not configured[/]")
-
-    # Split metrics
-    if get_split_api_key():
-      status.update("Fetching Split metrics...")
-      split_metrics = get_split_metrics(start_date, end_date)
-      all_metrics["split"] = split_metrics
-      display_split_metrics(split_metrics)
-    else:
-      console.print("[yellow]⚠️  Split.io integration not configured[/]")
-
-    # AI Analysis
-    if get_anthropic_api_key():
-      try:
-        status.update("Generating AI analysis...")
-        analysis_result = get_ai_analysis(all_metrics)
-        format_ai_response(analysis_result)
-      except InternalServerError as e:
-        if "overloaded_error" in str(e):
-          console.print(
-            "\n[yellow]⚠️  Claude is currently overloaded. Analysis will continue without AI insights.[/]"
-          )
-        else:
-          console.print(
-            "\n[yellow]⚠️  Claude encountered an internal error. Analysis will continue without AI insights.[/]"
-          )
-        console.print("[dim]Error details: " + str(e) + "[/dim]")
-      except RateLimitError:
-        console.print(
-          "\n[yellow]⚠️  API rate limit reached. Analysis will continue without AI insights.[/]"
-        )
-      except APIError as e:
-        console.print(f"\n[yellow]⚠️  API error occurred: {str(e)}[/]")
-        console.print("Analysis will continue without AI insights.")
-      except Exception as e:
-        console.print(
-          f"\n[red]Unexpected error during AI analysis: {str(e)}[/]"
-        )
-        console.print("Analysis will continue without AI insights.")
-    else:
-      console.print("[yellow]⚠️  AI analysis not configured[/]")
+      console.print("[red]Error: Failed to fetch GitHub metrics[/]")
+  elif metrics is not None:
+    SOURCE_RENDERERS[source](metrics)
 
-  # Save the analysis data
-  temp_file = save_analysis_data(all_metrics, analysis_result)
-  console.print(f"\n[dim]Analysis saved to: {temp_file}[/]")
+
+def render_ai_analysis(future: "Future[Any]") -> Optional[Any]:
+  """Wait for the AI analysis and display it, returning None if unavailable"""
+  try:
+    analysis_result = future.result(timeout=COLLECTOR_TIMEOUTS["ai"])
+    format_ai_response(analysis_result)
+    return analysis_result
+  except FutureTimeoutError:
+    console.print(
+      "\n[yellow]⚠️  AI analysis timed out. Analysis will continue without AI insights.[/]"
+    )
+  except InternalServerError as e:
+    if "overloaded_error" in str(e):
+      console.print(
+        "\n[yellow]⚠️  Claude is currently overloaded. Analysis will continue without AI insights.[/]"
+      )
+    else:
+      console.print(
+        "\n[yellow]⚠️  Claude encountered an internal error. Analysis will continue without AI insights.[/]"
+      )
+    console.print("[dim]Error details: " + str(e) + "[/dim]")
+  except RateLimitError:
+    console.print(
+      "\n[yellow]⚠️  API rate limit reached. Analysis will continue without AI insights.[/]"
+    )
+  except APIError as e:
+    console.print(f"\n[yellow]⚠️  API error occurred: {str(e)}[/]")
+    console.print("Analysis will continue without AI insights.")
+  except Exception as e:
+    console.print(
+      f"\n[red]Unexpected error during AI analysis: {str(e)}[/]"
+    )
+    console.print("Analysis will continue without AI insights.")
+  return None
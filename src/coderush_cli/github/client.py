@@ -90,6 +90,23 @@ class GithubClient:
       console.print(f"[red]Error checking app installation: {str(e)}[/]")
       return None
 
+  def graphql(self, query: str, variables: dict) -> dict:
+    """Run a GitHub GraphQL query with the user token"""
+    self._ensure_token()
+
+    response = GITHUB_SESSION.post(
+      "https://api.github.com/graphql",
+      json={"query": query, "variables": variables},
+      headers={"Authorization": f"bearer {self._local.token}"},
+      timeout=30,
+    )
+    data = response.json()
+
+    if data.get("errors") or "data" not in data:
+      raise RuntimeError(f"GitHub GraphQL error: {data.get('errors', data)}")
+    result: dict = data["data"]
+    return result
+
   def _check_app_installation(self, org_name: str) -> bool:
     """Check if the GitHub App is installed for the organization"""
     installation_id = self._get_installation_id(org_name)
@@ -127,7 +144,7 @@ class GithubClient:
           return None
 
       # Create GitHub client with user token
-      self._local.github = Github(self._local.token)
+      self._local.github = Github(self._local.token, per_page=100)
       self._local.github._Github__requester._Requester__session = GITHUB_SESSION
 
     return self._local.github
@@ -1,4 +1,3 @@
-import json
 import logging
 import re
 
@@ -7,8 +6,8 @@ from rich.console import Console
 from rich.markdown import Markdown
 from rich.panel import Panel
 
-from .models.metrics import MetricsJSONEncoder
 from ..config import get_anthropic_api_key, get_anthropic_base_url
+from ..serialization import metrics_to_dict
 
 client = Anthropic(
   api_key=get_anthropic_api_key(),
@@ -92,10 +91,8 @@ def get_ai_analysis(all_metrics):
     # GitHub metrics
     if "github" in all_metrics:
       github_data = all_metrics["github"]
-      metrics_json = json.dumps(
-        github_data, cls=MetricsJSONEncoder, indent=2, default=str
-      )
-      metrics_summary = {"github": json.loads(metrics_json)}
+      # Plain data straight from the compiled serializers, not a JSON round trip
+      metrics_summary = {"github": metrics_to_dict(github_data)}
 
     # Linear metrics
     if "linear" in all_metrics:
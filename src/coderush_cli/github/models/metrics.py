@@ -1,62 +1,17 @@
-import json
 import statistics
+import time
 from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Set
-
-from ..utils import ensure_datetime
-
-
-class MetricsJSONEncoder(json.JSONEncoder):
-  def default(self, obj):
-    if isinstance(obj, datetime):
-      return obj.isoformat()
-    if isinstance(obj, set):
-      return list(obj)
-    if isinstance(obj, defaultdict):
-      return dict(obj)
-    if callable(obj):
-      return None
-    if hasattr(obj, "__dict__"):
-      return {
-        k: v
-        for k, v in obj.__dict__.items()
-        if not k.startswith("_") and not callable(v)
-      }
-    try:
-      return super().default(obj)
-    except Exception:
-      return str(obj)
+from typing import AbstractSet, Dict, Iterable, List, Optional, Set, Union
+
+from ...serialization import dataclass_to_dict
+from .records import PullRequestRecord, ReviewRecord
 
 
 @dataclass
 class BaseMetrics:
-  def to_dict(self):
-    def convert(obj):
-      if isinstance(obj, datetime):
-        return obj.isoformat()
-      if isinstance(obj, set):
-        return list(obj)
-      if isinstance(obj, defaultdict):
-        return dict(obj)
-      if callable(obj):
-        return None
-      if hasattr(obj, "to_dict"):
-        return obj.to_dict()
-      if hasattr(obj, "__dict__"):
-        return {
-          k: convert(v)
-          for k, v in obj.__dict__.items()
-          if not k.startswith("_") and not callable(v)
-        }
-      return obj
-
-    result = {}
-    for k, v in self.__dict__.items():
-      if not k.startswith("_") and not callable(v):
-        result[k] = convert(v)
-    return result
+  to_dict = dataclass_to_dict
 
 
 @dataclass
@@ -69,14 +24,15 @@ class BottleneckMetrics(BaseMetrics):
   bottleneck_users: Dict[str, int] = field(default_factory=dict)
 
   def update_from_pr(
-      self, pr, stale_threshold: float = 168, long_running_threshold: float = 336
-  ):
-    """Update metrics from a PR (thresholds in hours)"""
+      self,
+      pr: PullRequestRecord,
+      reviews: Iterable[ReviewRecord] = (),
+      stale_threshold: float = 168,
+      long_running_threshold: float = 336,
+  ) -> None:
+    """Update metrics from a PR record and its reviews (thresholds in hours)"""
     if not pr.merged_at:
-      # Ensure timezone-aware datetime
-      created_at = ensure_datetime(pr.created_at)
-      current_time = datetime.now(timezone.utc)
-      age = (current_time - created_at).total_seconds() / 3600
+      age = (time.time() - pr.created_at) / 3600
 
       if age > stale_threshold:
         self.stale_prs += 1
@@ -84,17 +40,17 @@ class BottleneckMetrics(BaseMetrics):
         self.long_running_prs += 1
 
       # Track blocked PRs
-      if any(label.name.lower() in ["blocked", "on hold"] for label in pr.labels):
+      if any(label in ["blocked", "on hold"] for label in pr.labels):
         self.blocked_prs += 1
-        self.bottleneck_users[pr.user.login] = (
-            self.bottleneck_users.get(pr.user.login, 0) + 1
-        )
-
-      # Fix timezone awareness for review wait times
-      if pr.get_reviews().totalCount > 0:
-        first_review = min(pr.get_reviews(), key=lambda r: r.submitted_at)
-        review_time = ensure_datetime(first_review.submitted_at)
-        wait_time = (review_time - created_at).total_seconds() / 3600
+        # Deleted users have no login to attribute the block to
+        if pr.author:
+          self.bottleneck_users[pr.author] = (
+              self.bottleneck_users.get(pr.author, 0) + 1
+          )
+
+      submitted = [r.submitted_at for r in reviews if r.submitted_at]
+      if submitted:
+        wait_time = (min(submitted) - pr.created_at) / 3600
         self.review_wait_times.append(wait_time)
 
   def get_stats(self) -> Dict:
@@ -129,31 +85,37 @@ class ReviewMetrics(BaseMetrics):
     default_factory=lambda: defaultdict(set)
   )
 
-  def update_from_review(self, review, pr, org_metrics=None):
-    """Update metrics from a single review"""
-    if not review.user:
+  def update_from_review(
+      self,
+      review: ReviewRecord,
+      pr: PullRequestRecord,
+      org_metrics: Optional["OrganizationMetrics"] = None,
+  ) -> None:
+    """Update metrics from a single review record"""
+    if not review.reviewer:
       return
 
     self.reviews_performed += 1
-    self.reviewers_per_pr[pr.number].add(review.user.login)
+    self.reviewers_per_pr[pr.number].add(review.reviewer)
 
     if review.state == "CHANGES_REQUESTED":
       self.blocking_reviews_given += 1
 
-    if review.body:
+    if review.has_body:
       self.review_comments_given += 1
 
-    if review.user.login != pr.user.login and org_metrics:
-      pr_author_metrics = org_metrics.get_or_create_user(pr.user.login)
+    if pr.author and review.reviewer != pr.author and org_metrics:
+      pr_author_metrics = org_metrics.get_or_create_user(pr.author)
       pr_author_metrics.review_metrics.review_comments_received += 1
 
+    if not review.submitted_at:
+      return
+
     if pr.number not in self.time_to_first_review:
-      review_time = (review.submitted_at - pr.created_at).total_seconds() / 3600
+      review_time = (review.submitted_at - pr.created_at) / 3600
       self.time_to_first_review.append(review_time)
 
-    self.review_wait_times.append(
-      (review.submitted_at - pr.created_at).total_seconds() / 3600
-    )
+    self.review_wait_times.append((review.submitted_at - pr.created_at) / 3600)
 
   def get_stats(self) -> Dict:
     return {
@@ -187,22 +149,23 @@ class CodeMetrics(BaseMetrics):
   total_deletions: int = 0
   avg_pr_size: float = 0
 
-  def update_from_pr(self, pr):
-    """Update metrics from a pull request"""
+  def update_from_pr(self, pr: PullRequestRecord) -> None:
+    """Update metrics from a pull request record"""
     changes = pr.additions + pr.deletions
     self.changes_per_pr.append(changes)
-    self.files_changed.append(len(list(pr.get_files())))
-    self.commits_count.append(len(list(pr.get_commits())))
+    self.files_changed.append(pr.changed_files)
+    self.commits_count.append(pr.commits)
     self.total_additions += pr.additions
     self.total_deletions += pr.deletions
 
-    if "revert" in pr.title.lower():
+    title = pr.title.lower()
+    if "revert" in title:
       self.reverts += 1
-    if "hotfix" in pr.title.lower() or any(
-        label.name.lower() == "hotfix" for label in pr.labels
-    ):
+    if "hotfix" in title or "hotfix" in pr.labels:
       self.hotfixes += 1
 
+  def finalize(self) -> None:
+    """Derive averages once all PRs have been accumulated"""
     if self.changes_per_pr:
       self.avg_pr_size = sum(self.changes_per_pr) / len(self.changes_per_pr)
 
@@ -233,27 +196,22 @@ class TimeMetrics(BaseMetrics):
   deployment_frequency: float = 0
   cycle_time: List[float] = field(default_factory=list)
 
-  def update_from_pr(self, pr, first_commit_date=None):
-    """Update metrics from a pull request"""
+  def update_from_pr(self, pr: PullRequestRecord, first_commit_at: Optional[int] = None) -> None:
+    """Update metrics from a pull request record (epoch timestamps)"""
     if not pr.merged_at:
       return
 
-    merge_time = ensure_datetime(pr.merged_at)
-    created_time = ensure_datetime(pr.created_at)
-    first_commit_date = (
-      ensure_datetime(first_commit_date) if first_commit_date else None
-    )
-
     # Time to merge
-    merge_duration = (merge_time - created_time).total_seconds() / 3600
+    merge_duration = (pr.merged_at - pr.created_at) / 3600
     self.time_to_merge.append(merge_duration)
 
     # Lead time (if we have first commit)
-    if first_commit_date:
-      lead_time = (merge_time - first_commit_date).total_seconds() / 3600
+    if first_commit_at:
+      lead_time = (pr.merged_at - first_commit_at) / 3600
       self.lead_times.append(lead_time)
 
     # Update merge distribution
+    merge_time = datetime.fromtimestamp(pr.merged_at, timezone.utc)
     if merge_time.weekday() >= 5:  # Weekend
       self.merge_distribution["weekends"] += 1
     elif 9 <= merge_time.hour < 17:  # Business hours (simplified)
@@ -293,38 +251,40 @@ class CollaborationMetrics(BaseMetrics):
     default_factory=lambda: defaultdict(lambda: defaultdict(int))
   )
 
-  def update_from_review(self, review, pr, author_team=None, reviewer_team=None):
-    """Update metrics from a review"""
-    if not review.user:
+  def update_from_review(
+      self,
+      review: ReviewRecord,
+      pr: PullRequestRecord,
+      author_teams: AbstractSet[str] = frozenset(),
+      reviewer_teams: AbstractSet[str] = frozenset(),
+  ) -> None:
+    """Update metrics from a review record and the teams on both sides"""
+    reviewer = review.reviewer
+    # Authors replying to review threads show up as reviews of their own PR
+    if not reviewer or reviewer == pr.author:
       return
 
-    reviewer = review.user.login
-
     # Track review type
-    if reviewer == pr.user.login:
-      self.self_merges += 1
-    elif author_team and reviewer_team:
-      if author_team == reviewer_team:
-        self.team_reviews += 1
-      else:
-        self.cross_team_reviews += 1
-    else:
+    if not reviewer_teams:
       self.external_reviews += 1
+    elif frozenset(author_teams).isdisjoint(reviewer_teams):
+      self.cross_team_reviews += 1
+    else:
+      self.team_reviews += 1
 
     # Track comments
-    if review.body:
+    if review.has_body:
       self.review_comments_per_pr[pr.number] = (
           self.review_comments_per_pr.get(pr.number, 0) + 1
       )
       self.comments_by_user[reviewer][pr.number] += 1
 
-  def update_from_comments(self, comments, pr_number: int):
-    """Update metrics from PR comments"""
-    for comment in comments:
-      if not comment.user:
+  def update_from_comments(self, commenters: Iterable[Optional[str]], pr_number: int) -> None:
+    """Update metrics from the logins of a PR's commenters"""
+    for commenter in commenters:
+      if not commenter:
         continue
 
-      commenter = comment.user.login
       self.comments_by_user[commenter][pr_number] += 1
       self.review_comments_per_pr[pr_number] = (
           self.review_comments_per_pr.get(pr_number, 0) + 1
@@ -436,8 +396,41 @@ class OrganizationMetrics(BaseMetrics):
       self.users[username] = UserMetrics(username=username, team=team)
       if team:
         self.teams[team].add(username)
+    elif team and not self.users[username].team:
+      # The user was first seen somewhere their team was not known
+      self.users[username].team = team
+      self.teams[team].add(username)
     return self.users[username]
 
+  def finalize(self, start_date: datetime, end_date: datetime) -> None:
+    """Derive ratios and rates once aggregation has completed"""
+    one_day_seconds = 24 * 60 * 60
+    # Ensure minimum 1 day
+    days_in_period = max((end_date - start_date).total_seconds() / one_day_seconds, 1)
+
+    scopes: List[Union[OrganizationMetrics, RepositoryMetrics]] = [
+      self, *self.repositories.values()
+    ]
+    for scope in scopes:
+      scope.time_metrics.deployment_frequency = (
+        scope.prs_merged_to_main / days_in_period
+      )
+
+      collaboration = scope.collaboration_metrics
+      total_reviews = (
+        collaboration.team_reviews
+        + collaboration.cross_team_reviews
+        + collaboration.external_reviews
+      )
+      collaboration.review_participation_rate = (
+        total_reviews / scope.prs_created if scope.prs_created > 0 else 0
+      )
+
+      scope.code_metrics.finalize()
+
+    for user in self.users.values():
+      user.code_metrics.finalize()
+
   def get_repository_stats(self, repo_name: str) -> Dict:
     """Get aggregated statistics for a specific repository"""
     if repo_name not in self.repositories:
@@ -0,0 +1,106 @@
+import sys
+from datetime import datetime
+from typing import Any, Iterable, NamedTuple, Optional, Tuple, Union, overload
+
+from ..utils import ensure_datetime
+
+# PyGithub objects (PullRequest, NamedUser, ...) are typed as Any; records are
+# built from them once and nothing else in the metrics touches them
+
+
+@overload
+def to_epoch(dt: None) -> None: ...
+
+
+@overload
+def to_epoch(dt: Union[datetime, str]) -> int: ...
+
+
+def to_epoch(dt: Union[datetime, str, None]) -> Optional[int]:
+  """Convert a datetime (or ISO string) to integer seconds since the epoch"""
+  if dt is None:
+    return None
+  return int(ensure_datetime(dt).timestamp())
+
+
+def intern_login(user: Any) -> Optional[str]:
+  """Return the interned login of a GitHub user, or None for deleted users"""
+  if user is None:
+    return None
+  return sys.intern(user.login)
+
+
+class PullRequestRecord(NamedTuple):
+  """The fields of a pull request that the metrics need"""
+
+  number: int
+  title: str
+  author: Optional[str]
+  created_at: int
+  merged_at: Optional[int]
+  merged_by: Optional[str]
+  base_ref: str
+  head_ref: str
+  additions: int
+  deletions: int
+  changed_files: int
+  commits: int
+  labels: Tuple[str, ...]
+
+  @property
+  def merged(self) -> bool:
+    return self.merged_at is not None
+
+  @classmethod
+  def from_pull(cls, pr: Any) -> "PullRequestRecord":
+    """Extract a record from a PyGithub PullRequest, completing it if needed"""
+    return cls(
+      number=pr.number,
+      title=pr.title or "",
+      author=intern_login(pr.user),
+      created_at=to_epoch(pr.created_at),
+      merged_at=to_epoch(pr.merged_at),
+      merged_by=intern_login(pr.merged_by) if pr.merged_at else None,
+      base_ref=sys.intern(pr.base.ref),
+      head_ref=sys.intern(pr.head.ref),
+      additions=pr.additions,
+      deletions=pr.deletions,
+      changed_files=pr.changed_files,
+      commits=pr.commits,
+      labels=tuple(sys.intern(label.name.lower()) for label in pr.labels),
+    )
+
+
+class ReviewRecord(NamedTuple):
+  """The fields of a pull request review that the metrics need"""
+
+  reviewer: Optional[str]
+  state: str
+  submitted_at: Optional[int]
+  has_body: bool
+
+  @classmethod
+  def from_review(cls, review: Any) -> "ReviewRecord":
+    return cls(
+      reviewer=intern_login(review.user),
+      state=sys.intern(review.state),
+      submitted_at=to_epoch(review.submitted_at),
+      has_body=bool(review.body),
+    )
+
+
+def extract_reviews(reviews: Iterable[Any]) -> Tuple[ReviewRecord, ...]:
+  """Convert reviews to records as they are paged in"""
+  return tuple(ReviewRecord.from_review(review) for review in reviews)
+
+
+def extract_commenters(comments: Iterable[Any]) -> Tuple[Optional[str], ...]:
+  """Keep only the author login of each comment"""
+  return tuple(intern_login(comment.user) for comment in comments)
+
+
+def extract_first_commit_at(commits: Iterable[Any]) -> Optional[int]:
+  """Keep only the earliest authored commit timestamp"""
+  return min(
+    (to_epoch(commit.commit.author.date) for commit in commits), default=None
+  )
@@ -0,0 +1,177 @@
+import logging
+import threading
+import traceback
+from collections import deque
+from typing import Any, Callable, Deque, Iterable, List, Optional
+
+
+class Task:
+  """A unit of work in the scheduler's dependency graph"""
+
+  __slots__ = (
+    "func",
+    "args",
+    "kwargs",
+    "result",
+    "error",
+    "done",
+    "_dependencies",
+    "_dependents",
+    "_waiting_on",
+  )
+
+  def __init__(self, func: Callable, args: tuple, kwargs: dict, dependencies: tuple):
+    self.func = func
+    self.args = args
+    self.kwargs = kwargs
+    self.result: Any = None
+    self.error: Optional[BaseException] = None
+    self.done = False
+    self._dependencies = dependencies
+    self._dependents: List["Task"] = []
+    self._waiting_on = 0
+
+  @property
+  def name(self) -> str:
+    return getattr(self.func, "__name__", repr(self.func))
+
+
+class TaskScheduler:
+  """Work-stealing scheduler for a graph of dependent tasks.
+
+  A fixed set of workers is the single concurrency budget. A task is only
+  queued once all of its dependencies have finished, so workers never block
+  waiting on each other. Tasks may submit further tasks while running; those
+  land on the submitting worker's own deque (run newest-first) and idle
+  workers steal the oldest work from the other deques.
+  """
+
+  def __init__(self, max_workers: int = 15):
+    self._lock = threading.Lock()
+    self._work_available = threading.Condition(self._lock)
+    self._all_done = threading.Condition(self._lock)
+    self._queues: List[Deque[Task]] = [deque() for _ in range(max_workers)]
+    self._injected: Deque[Task] = deque()
+    self._outstanding = 0
+    self._closed = False
+    self._worker = threading.local()
+    self._threads = [
+      threading.Thread(
+        target=self._work, args=(index,), name=f"coderush-worker-{index}", daemon=True
+      )
+      for index in range(max_workers)
+    ]
+    for thread in self._threads:
+      thread.start()
+
+  def __enter__(self) -> "TaskScheduler":
+    return self
+
+  def __exit__(self, *exc_info: Any) -> None:
+    self.close()
+
+  def submit(
+      self,
+      func: Callable,
+      *args: Any,
+      depends_on: Iterable[Task] = (),
+      after: Iterable[Task] = (),
+      **kwargs: Any,
+  ) -> Task:
+    """Schedule func to run once its dependencies have finished.
+
+    A failure in any depends_on task skips this task; tasks listed in after
+    only order execution and their failures are ignored.
+    """
+    task = Task(func, args, kwargs, tuple(depends_on))
+    with self._lock:
+      if self._closed:
+        raise RuntimeError("Cannot submit to a closed scheduler")
+      self._outstanding += 1
+      for dependency in (*task._dependencies, *after):
+        if not dependency.done:
+          dependency._dependents.append(task)
+          task._waiting_on += 1
+      if task._waiting_on == 0:
+        self._enqueue(task)
+    return task
+
+  def join(self) -> None:
+    """Block the calling thread until the whole graph has drained"""
+    with self._lock:
+      while self._outstanding:
+        self._all_done.wait()
+
+  def close(self) -> None:
+    """Stop the workers once they are idle"""
+    with self._lock:
+      self._closed = True
+      self._work_available.notify_all()
+    for thread in self._threads:
+      thread.join()
+
+  def _enqueue(self, task: Task) -> None:
+    # Caller must hold the lock
+    index = getattr(self._worker, "index", None)
+    if index is None:
+      self._injected.append(task)
+    else:
+      self._queues[index].append(task)
+    self._work_available.notify()
+
+  def _next_task(self, index: int) -> Optional[Task]:
+    # Caller must hold the lock
+    own = self._queues[index]
+    if own:
+      return own.pop()
+    if self._injected:
+      return self._injected.popleft()
+    count = len(self._queues)
+    for offset in range(1, count):
+      victim = self._queues[(index + offset) % count]
+      if victim:
+        return victim.popleft()
+    return None
+
+  def _work(self, index: int) -> None:
+    self._worker.index = index
+    while True:
+      with self._lock:
+        task = self._next_task(index)
+        while task is None:
+          if self._closed:
+            return
+          self._work_available.wait()
+          task = self._next_task(index)
+
+      self._run(task)
+
+      with self._lock:
+        task.done = True
+        for dependent in task._dependents:
+          dependent._waiting_on -= 1
+          if dependent._waiting_on == 0:
+            self._enqueue(dependent)
+        task._dependents = []
+        self._outstanding -= 1
+        if self._outstanding == 0:
+          self._all_done.notify_all()
+
+  @staticmethod
+  def _run(task: Task) -> None:
+    try:
+      failed = next((dep for dep in task._dependencies if dep.error), None)
+      if failed is not None:
+        # The failure was already logged where it happened
+        task.error = failed.error
+        return
+      task.result = task.func(*task.args, **task.kwargs)
+    except Exception as e:
+      task.error = e
+      logging.error(f"Task {task.name} failed: {str(e)}")
+      # The kept traceback would otherwise pin the arguments through frame locals
+      traceback.clear_frames(e.__traceback__)
+    finally:
+      # Release inputs as soon as possible; only the result is kept
+      task.args, task.kwargs = (), {}
+      task._dependencies = ()
@@ -0,0 +1,156 @@
+import json
+import logging
+import time
+from typing import TYPE_CHECKING, Dict, FrozenSet, Iterable, List, Optional, Set
+
+from ..config import CONFIG_DIR
+
+if TYPE_CHECKING:
+  from .client import GithubClient
+
+CACHE_DIR = CONFIG_DIR / "cache"
+# Team membership changes rarely; refresh the index at most once a day
+TEAM_INDEX_TTL = 24 * 60 * 60
+
+TEAMS_QUERY = """
+query ($org: String!, $after: String) {
+  organization(login: $org) {
+    teams(first: 50, after: $after) {
+      nodes {
+        slug
+        name
+        members(first: 100) {
+          nodes { login }
+          pageInfo { hasNextPage endCursor }
+        }
+      }
+      pageInfo { hasNextPage endCursor }
+    }
+  }
+}
+"""
+
+TEAM_MEMBERS_QUERY = """
+query ($org: String!, $slug: String!, $after: String) {
+  organization(login: $org) {
+    team(slug: $slug) {
+      members(first: 100, after: $after) {
+        nodes { login }
+        pageInfo { hasNextPage endCursor }
+      }
+    }
+  }
+}
+"""
+
+
+class TeamIndex:
+  """Login to team lookup for a whole organization"""
+
+  def __init__(self, teams: Dict[str, Dict], fetched_at: float = 0):
+    # teams: slug -> {"name": str, "members": [login, ...]}
+    self.teams = teams
+    self.fetched_at = fetched_at
+    by_login: Dict[str, Set[str]] = {}
+    for team in teams.values():
+      for login in team["members"]:
+        by_login.setdefault(login, set()).add(team["name"])
+    self._by_login = {login: frozenset(names) for login, names in by_login.items()}
+
+  def teams_of(self, login: Optional[str]) -> FrozenSet[str]:
+    """Names of every team the user belongs to"""
+    if login is None:
+      return frozenset()
+    return self._by_login.get(login, frozenset())
+
+  def primary_team(self, login: Optional[str]) -> str:
+    """A stable single team for per-user attribution"""
+    teams = self.teams_of(login)
+    return min(teams) if teams else ""
+
+  def members(self, team_filter: str) -> Set[str]:
+    """Members of the team matching a name or slug, case-insensitively"""
+    wanted = team_filter.lower()
+    for slug, team in self.teams.items():
+      if slug.lower() == wanted or team["name"].lower() == wanted:
+        return set(team["members"])
+    return set()
+
+  def has_team(self, team_filter: str) -> bool:
+    wanted = team_filter.lower()
+    return any(
+      slug.lower() == wanted or team["name"].lower() == wanted
+      for slug, team in self.teams.items()
+    )
+
+  def to_dict(self) -> Dict:
+    return {"fetched_at": self.fetched_at, "teams": self.teams}
+
+
+def load_team_index(github_client: "GithubClient", org: str, ttl: int = TEAM_INDEX_TTL) -> TeamIndex:
+  """Return the organization's team index, refreshing the cache when stale"""
+  cache_file = CACHE_DIR / f"teams-{org.lower()}.json"
+
+  if cache_file.exists():
+    try:
+      with open(cache_file) as f:
+        cached = json.load(f)
+      if time.time() - cached["fetched_at"] < ttl:
+        return TeamIndex(cached["teams"], cached["fetched_at"])
+    except Exception as e:
+      logging.warning(f"Ignoring unreadable team cache {cache_file}: {str(e)}")
+
+  index = TeamIndex(fetch_teams(github_client, org), time.time())
+
+  try:
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(cache_file, "w") as f:
+      json.dump(index.to_dict(), f)
+  except OSError as e:
+    logging.warning(f"Could not cache team index: {str(e)}")
+
+  return index
+
+
+def fetch_teams(github_client: "GithubClient", org: str) -> Dict[str, Dict]:
+  """Fetch every team and its members with a handful of GraphQL queries"""
+  teams: Dict[str, Dict] = {}
+  after: Optional[str] = None
+
+  while True:
+    data = github_client.graphql(TEAMS_QUERY, {"org": org, "after": after})
+    connection = data["organization"]["teams"]
+
+    for node in connection["nodes"]:
+      members = node["members"]
+      logins = _logins(members["nodes"])
+      # Only teams with more than 100 members need follow-up pages
+      if members["pageInfo"]["hasNextPage"]:
+        logins.extend(
+          _fetch_remaining_members(
+            github_client, org, node["slug"], members["pageInfo"]["endCursor"]
+          )
+        )
+      teams[node["slug"]] = {"name": node["name"], "members": logins}
+
+    if not connection["pageInfo"]["hasNextPage"]:
+      return teams
+    after = connection["pageInfo"]["endCursor"]
+
+
+def _fetch_remaining_members(
+    github_client: "GithubClient", org: str, slug: str, after: Optional[str]
+) -> List[str]:
+  logins: List[str] = []
+  while after:
+    data = github_client.graphql(
+      TEAM_MEMBERS_QUERY, {"org": org, "slug": slug, "after": after}
+    )
+    members = data["organization"]["team"]["members"]
+    logins.extend(_logins(members["nodes"]))
+    after = members["pageInfo"]["endCursor"] if members["pageInfo"]["hasNextPage"] else None
+  return logins
+
+
+def _logins(nodes: Iterable[Dict]) -> List[str]:
+  return [node["login"] for node in nodes if node]
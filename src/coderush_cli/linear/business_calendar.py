@@ -0,0 +1,219 @@
+import sys
+from bisect import bisect_left
+from datetime import date, datetime, timedelta, timezone, tzinfo
+from types import ModuleType
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, Sequence, Union
+
+if sys.version_info >= (3, 9):
+  from zoneinfo import ZoneInfo
+else:
+  from dateutil.tz import gettz as ZoneInfo
+
+if TYPE_CHECKING:
+  import numpy
+
+DAY_SECONDS = 24 * 60 * 60
+# numpy weekmask for Monday to Friday
+WEEKMASK = "1111100"
+
+
+class BusinessCalendar:
+  """Working hours and days between two instants, computed in O(1).
+
+  Whole weeks are counted arithmetically, so only the two edge days and the
+  few leftover weekdays are looked at individually. Holidays are kept sorted
+  and counted with bisection.
+  """
+
+  def __init__(
+      self,
+      tz: Union[str, timezone, None] = None,
+      day_start: int = 9,
+      day_end: int = 17,
+      holidays: Iterable[date] = (),
+  ):
+    self.tz: tzinfo = ZoneInfo(tz) if isinstance(tz, str) else (tz or timezone.utc)
+    self.day_start = day_start * 3600
+    self.day_end = day_end * 3600
+    self.hours_per_day = day_end - day_start
+    self.holidays = sorted(set(holidays))
+
+  def work_hours(self, start: Optional[datetime], end: Optional[datetime]) -> float:
+    """Business hours between two instants, in the calendar's time zone"""
+    if not start or not end:
+      return 0
+    start, end = self._local(start), self._local(end)
+    if end <= start:
+      return 0
+
+    start_day, end_day = start.date(), end.date()
+    start_seconds, end_seconds = _seconds_of_day(start), _seconds_of_day(end)
+
+    if start_day == end_day:
+      if not self.is_business_day(start_day):
+        return 0
+      return self._overlap(start_seconds, end_seconds) / 3600
+
+    seconds = 0.0
+    if self.is_business_day(start_day):
+      seconds += self._overlap(start_seconds, DAY_SECONDS)
+    if self.is_business_day(end_day):
+      seconds += self._overlap(0, end_seconds)
+    full_days = self.business_days(start_day + timedelta(days=1), end_day)
+    return seconds / 3600 + full_days * self.hours_per_day
+
+  def work_points(self, start: Optional[datetime], end: Optional[datetime]) -> int:
+    """One point per business day stepped through from start (exclusive of end)"""
+    if not start or not end:
+      return 0
+    start, end = self._local(start), self._local(end)
+    if end <= start:
+      return 0
+    elapsed = end - start
+    # Steps of one day from start that are still before end
+    steps = elapsed.days + (1 if elapsed % timedelta(days=1) else 0)
+    first = start.date()
+    return self.business_days(first, first + timedelta(days=steps))
+
+  def working_days(self, start: Optional[datetime], end: Optional[datetime]) -> int:
+    """Business days between the two dates, both inclusive"""
+    if not start or not end:
+      return 0
+    first, last = self._local(start).date(), self._local(end).date()
+    return self.business_days(first, last + timedelta(days=1))
+
+  def business_days(self, first: date, stop: date) -> int:
+    """Business days in [first, stop)"""
+    days = (stop - first).days
+    if days <= 0:
+      return 0
+    weeks, remainder = divmod(days, 7)
+    weekday = first.weekday()
+    count = weeks * 5 + sum(1 for offset in range(remainder) if (weekday + offset) % 7 < 5)
+    return count - self._holidays_between(first, stop)
+
+  def is_business_day(self, day: date) -> bool:
+    if day.weekday() >= 5:
+      return False
+    index = bisect_left(self.holidays, day)
+    return index == len(self.holidays) or self.holidays[index] != day
+
+  def work_hours_batch(self, starts: Sequence[float], ends: Sequence[float]) -> "numpy.ndarray":
+    """Vectorized work_hours over arrays of epoch seconds.
+
+    Rows where either end is NaN or end <= start yield 0. For time zones with
+    DST the UTC offset is taken at noon of each local day.
+    """
+    np = _numpy()
+    start_epochs = self._local_epoch_seconds(np, np.asarray(starts, dtype="float64"))
+    end_epochs = self._local_epoch_seconds(np, np.asarray(ends, dtype="float64"))
+    valid = end_epochs > start_epochs  # False for NaN as well
+    start_epochs = np.where(valid, start_epochs, 0)
+    end_epochs = np.where(valid, end_epochs, 0)
+
+    start_days = np.floor(start_epochs / DAY_SECONDS).astype("int64")
+    end_days = np.floor(end_epochs / DAY_SECONDS).astype("int64")
+    start_seconds = start_epochs - start_days * DAY_SECONDS
+    end_seconds = end_epochs - end_days * DAY_SECONDS
+    start_dates = start_days.astype("datetime64[D]")
+    end_dates = end_days.astype("datetime64[D]")
+    holidays = np.array(self.holidays, dtype="datetime64[D]")
+
+    same_day = start_days == end_days
+    first_end = np.where(same_day, np.minimum(end_seconds, self.day_end), self.day_end)
+    first = np.clip(first_end - np.maximum(start_seconds, self.day_start), 0, None)
+    last = np.clip(np.minimum(end_seconds, self.day_end) - self.day_start, 0, None)
+    first = first * np.is_busday(start_dates, weekmask=WEEKMASK, holidays=holidays)
+    last = np.where(same_day, 0, last) * np.is_busday(end_dates, weekmask=WEEKMASK, holidays=holidays)
+    between = np.busday_count(start_dates + 1, end_dates, weekmask=WEEKMASK, holidays=holidays)
+
+    hours = (first + last) / 3600 + np.clip(between, 0, None) * self.hours_per_day
+    result: numpy.ndarray = np.where(valid, hours, 0.0)
+    return result
+
+  def _overlap(self, start_seconds: float, end_seconds: float) -> float:
+    return max(0, min(end_seconds, self.day_end) - max(start_seconds, self.day_start))
+
+  def _local(self, moment: datetime) -> datetime:
+    # Naive datetimes are taken as already in the calendar's time zone
+    return moment.astimezone(self.tz) if moment.tzinfo else moment
+
+  def _holidays_between(self, first: date, stop: date) -> int:
+    if not self.holidays:
+      return 0
+    # Holidays falling on weekends were never counted
+    lo, hi = bisect_left(self.holidays, first), bisect_left(self.holidays, stop)
+    return sum(1 for day in self.holidays[lo:hi] if day.weekday() < 5)
+
+  def _local_epoch_seconds(self, np: ModuleType, seconds: "numpy.ndarray") -> "numpy.ndarray":
+    """Shift UTC epoch seconds so whole days fall on local midnight"""
+    if isinstance(self.tz, timezone):
+      return seconds + self.tz.utcoffset(None).total_seconds()
+    days = np.floor(np.nan_to_num(seconds) / DAY_SECONDS).astype("int64")
+    unique_days, inverse = np.unique(days, return_inverse=True)
+    offsets = np.array([
+      _utc_offset_seconds(
+        (datetime(1970, 1, 1, 12) + timedelta(days=int(day))).replace(tzinfo=self.tz)
+      )
+      for day in unique_days
+    ])
+    shifted: numpy.ndarray = seconds + offsets[inverse]
+    return shifted
+
+
+class TeamCalendars:
+  """Business calendars per Linear team key, falling back to a default"""
+
+  def __init__(self, default: BusinessCalendar, by_team: Optional[Dict[str, BusinessCalendar]] = None):
+    self.default = default
+    self.by_team = by_team or {}
+
+  def for_team(self, team_key: Optional[str]) -> BusinessCalendar:
+    if team_key is None:
+      return self.default
+    return self.by_team.get(team_key, self.default)
+
+  @classmethod
+  def from_config(
+      cls,
+      team_timezones: Union[str, Dict[str, str], None] = None,
+      holidays: Union[str, Iterable[str], None] = None,
+  ) -> "TeamCalendars":
+    """Build calendars from config values.
+
+    team_timezones maps team keys to IANA zone names, either as a dict or as
+    "ENG=Europe/Berlin,OPS=America/New_York". holidays is a list or a
+    comma-separated string of YYYY-MM-DD dates shared by every team.
+    """
+    if isinstance(holidays, str):
+      holidays = [day for day in holidays.split(",") if day.strip()]
+    holiday_dates = [date.fromisoformat(day.strip()) for day in holidays or ()]
+
+    if isinstance(team_timezones, str):
+      team_timezones = dict(
+        pair.split("=", 1) for pair in team_timezones.split(",") if "=" in pair
+      )
+    by_team = {
+      key.strip(): BusinessCalendar(tz_name.strip(), holidays=holiday_dates)
+      for key, tz_name in (team_timezones or {}).items()
+    }
+    return cls(BusinessCalendar(holidays=holiday_dates), by_team)
+
+
+def _seconds_of_day(moment: datetime) -> float:
+  return (
+      moment.hour * 3600 + moment.minute * 60 + moment.second + moment.microsecond / 1e6
+  )
+
+
+def _utc_offset_seconds(moment: datetime) -> float:
+  offset = moment.utcoffset()
+  return offset.total_seconds() if offset is not None else 0.0
+
+
+def _numpy() -> ModuleType:
+  # numpy is only needed for batch calculations, so import it lazily
+  import numpy
+
+  return numpy
+
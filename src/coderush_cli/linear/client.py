@@ -0,0 +1,187 @@
+import logging
+import random
+import threading
+import time
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+from ..config import get_linear_api_key
+
+LINEAR_API_ENDPOINT = "https://api.linear.app/graphql"
+
+# Linear rejects any single query above this complexity
+MAX_QUERY_COMPLEXITY = 10_000
+MAX_PAGE_SIZE = 250
+MIN_PAGE_SIZE = 25
+# Keep a little of each budget spare for other tools sharing the API key
+REQUEST_RESERVE = 5
+COMPLEXITY_RESERVE = 2_000
+MAX_RETRIES = 5
+
+
+class LinearAPIError(RuntimeError):
+  """Raised when the Linear API returns errors for a query"""
+
+  def __init__(self, errors: List[Dict]):
+    super().__init__(f"Linear API error: {errors}")
+    self.errors = errors
+
+  @property
+  def rate_limited(self) -> bool:
+    return any(
+      error.get("extensions", {}).get("code") == "RATELIMITED" for error in self.errors
+    )
+
+
+def create_linear_session(pool_size: int = 10) -> requests.Session:
+  """Pooled session so concurrent requests reuse their connections"""
+  session = requests.Session()
+  adapter = HTTPAdapter(
+    pool_connections=pool_size,
+    pool_maxsize=pool_size,
+    max_retries=Retry(total=3, backoff_factor=1, status_forcelist=[500, 502, 503, 504]),
+  )
+  session.mount("https://", adapter)
+  return session
+
+
+class LinearClient:
+  """GraphQL client that paces itself under Linear's rate-limit budgets.
+
+  Linear limits both the number of requests and the summed query complexity
+  per hour, and reports what is left of each in response headers. Requests
+  reserve their expected cost before they are sent, so concurrent callers
+  sharing one client cannot overdraw the budget between two responses.
+  """
+
+  def __init__(self, api_key: Optional[str] = None, session: Optional[requests.Session] = None):
+    self.headers = {
+      "Authorization": api_key or get_linear_api_key(),
+      "Content-Type": "application/json",
+    }
+    self.session = session or create_linear_session()
+    self._lock = threading.Condition()
+    # None until the first response reports the budgets
+    self.requests_remaining: Optional[int] = None
+    self.requests_reset: float = 0
+    self.complexity_remaining: Optional[int] = None
+    self.complexity_reset: float = 0
+
+  def query(self, query: str, variables: Optional[Dict] = None, cost: int = 0) -> Dict:
+    """Run a query, waiting for budget and retrying when rate limited"""
+    data, _ = self._execute(query, variables or {}, cost)
+    return data
+
+  def paginate(
+      self,
+      query: str,
+      variables: Dict,
+      connection: str,
+      node_complexity: float = 1,
+      max_page_size: int = MAX_PAGE_SIZE,
+  ) -> Iterator[List[Dict]]:
+    """Yield the nodes of a top-level connection one page at a time.
+
+    The query must accept $first and $after. Each page is sized from the
+    remaining complexity budget, using the cost Linear reported per node on
+    the previous page.
+    """
+    after = None
+    while True:
+      first = self.page_size(node_complexity, max_page_size)
+      data, complexity = self._execute(
+        query, {**variables, "first": first, "after": after}, int(first * node_complexity)
+      )
+      page = data[connection]
+      if complexity:
+        node_complexity = complexity / first
+      yield page["nodes"]
+      if not page["pageInfo"]["hasNextPage"]:
+        return
+      after = page["pageInfo"]["endCursor"]
+
+  def page_size(self, node_complexity: float, max_page_size: int = MAX_PAGE_SIZE) -> int:
+    """Largest page that fits one query and the remaining complexity budget"""
+    budget = MAX_QUERY_COMPLEXITY
+    with self._lock:
+      if self.complexity_remaining is not None:
+        budget = min(budget, self.complexity_remaining - COMPLEXITY_RESERVE)
+    size = int(budget / max(node_complexity, 0.1))
+    return max(MIN_PAGE_SIZE, min(max_page_size, size))
+
+  def _execute(self, query: str, variables: Dict, cost: int) -> Tuple[Dict, int]:
+    attempt = 0
+    while True:
+      self._reserve(cost)
+      response = self.session.post(
+        LINEAR_API_ENDPOINT,
+        json={"query": query, "variables": variables},
+        headers=self.headers,
+        timeout=30,
+      )
+      self._update_budget(response.headers)
+      payload = response.json()
+
+      if "errors" not in payload:
+        return payload["data"], int(response.headers.get("X-Complexity", 0))
+
+      error = LinearAPIError(payload["errors"])
+      if not error.rate_limited or attempt == MAX_RETRIES:
+        logging.error(str(error))
+        raise error
+
+      delay = min(60, 2 ** attempt) + random.uniform(0, 1)
+      logging.warning(f"Linear rate limit hit, retrying in {delay:.1f}s")
+      time.sleep(delay)
+      attempt += 1
+
+  def _reserve(self, cost: int) -> None:
+    """Block until the budgets allow one more request of the given cost"""
+    with self._lock:
+      while True:
+        now = time.time()
+        if self.requests_remaining is not None and now >= self.requests_reset:
+          self.requests_remaining = None
+        if self.complexity_remaining is not None and now >= self.complexity_reset:
+          self.complexity_remaining = None
+
+        waits = []
+        if self.requests_remaining is not None and self.requests_remaining <= REQUEST_RESERVE:
+          waits.append(self.requests_reset - now)
+        if (
+            self.complexity_remaining is not None
+            and self.complexity_remaining - cost < COMPLEXITY_RESERVE
+        ):
+          waits.append(self.complexity_reset - now)
+
+        if not waits:
+          if self.requests_remaining is not None:
+            self.requests_remaining -= 1
+          if self.complexity_remaining is not None:
+            self.complexity_remaining -= cost
+          return
+
+        delay = max(waits)
+        logging.info(f"Pacing Linear requests for {delay:.1f}s to stay under budget")
+        # Woken early if a response reports a fresh budget
+        self._lock.wait(timeout=delay)
+
+  def _update_budget(self, headers: Mapping[str, str]) -> None:
+    with self._lock:
+      if "X-RateLimit-Requests-Remaining" in headers:
+        self.requests_remaining = int(headers["X-RateLimit-Requests-Remaining"])
+        self.requests_reset = _reset_time(headers.get("X-RateLimit-Requests-Reset"))
+      if "X-RateLimit-Complexity-Remaining" in headers:
+        self.complexity_remaining = int(headers["X-RateLimit-Complexity-Remaining"])
+        self.complexity_reset = _reset_time(headers.get("X-RateLimit-Complexity-Reset"))
+      self._lock.notify_all()
+
+
+def _reset_time(value: Optional[str]) -> float:
+  """Reset headers are epoch milliseconds; assume a minute if missing"""
+  if not value:
+    return time.time() + 60
+  return int(value) / 1000
@@ -1,155 +1,228 @@
-import logging
-from datetime import datetime, timedelta
-
-import requests
-from dateutil import parser, tz
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from pathlib import Path
+from typing import (
+  Any,
+  Callable,
+  Dict,
+  Iterator,
+  List,
+  NamedTuple,
+  Optional,
+  Set,
+  Tuple,
+  Union,
+)
+
+from dateutil import parser
 from rich.console import Console
 
+from .business_calendar import BusinessCalendar, TeamCalendars
+from .client import LinearClient
 from .models.metrics import LinearOrgMetrics, ProjectMetrics, TeamMetrics
-from ..config import get_linear_api_key
+from .models.records import IssueRecord
+from .store import ALL_ISSUES, IssueStore, from_timestamp, to_timestamp
+from ..config import CONFIG_DIR, get_config_value
 
 console = Console()
 
-LINEAR_API_ENDPOINT = "https://api.linear.app/graphql"
-
-
-def get_linear_metrics(start_date, end_date, user_filter=None) -> LinearOrgMetrics:
-  headers = {
-    "Authorization": get_linear_api_key(),
-    "Content-Type": "application/json",
+# One issue store per Linear workspace, named after its organization id
+ISSUE_STORE_DIR = CONFIG_DIR / "cache"
+# Shape of the stored issue payloads; bump whenever ISSUES_QUERY or the
+# history attached to each issue changes, so stale stores are resynced
+ISSUE_PAYLOAD_VERSION = 1
+# Monday to Friday, 9:00 to 17:00 UTC
+DEFAULT_CALENDAR = BusinessCalendar()
+# Number of date shards paginated concurrently
+LINEAR_SHARDS = 4
+UPSERT_BATCH_SIZE = 500
+# Batches waiting for the aggregator; bounds memory when it falls behind
+AGGREGATION_QUEUE_SIZE = 4
+SYNC_OVERLAP = timedelta(minutes=5)
+# Starting estimates of the complexity of one node; refined from the
+# X-Complexity header after each page
+ISSUE_NODE_COMPLEXITY = 5
+LOOKUP_NODE_COMPLEXITY = 2
+# An issue with a first page of 50 history entries
+HISTORY_NODE_COMPLEXITY = 160
+HISTORY_BATCH_SIZE = 25
+# Stored issues refreshed by id per filter, and users a --user value may match
+REFRESH_BATCH_SIZE = 100
+MAX_MATCHING_USERS = 50
+
+WORKSPACE_QUERY = """
+query {
+  organization {
+    id
+  }
+}
+"""
+
+# Issues carry only ids for teams, projects and labels; the metadata is
+# fetched once per run by the lookup queries below and joined locally
+ISSUES_QUERY = """
+query ($filter: IssueFilter, $first: Int!, $after: String) {
+  issues(filter: $filter, first: $first, after: $after) {
+    nodes {
+      id
+      title
+      identifier
+      state {
+        name
+        type
+      }
+      project {
+        id
+      }
+      team {
+        id
+      }
+      labelIds
+      assignee {
+        id
+      }
+      creator {
+        id
+      }
+      priority
+      estimate
+      startedAt
+      completedAt
+      createdAt
+      updatedAt
+    }
+    pageInfo {
+      hasNextPage
+      endCursor
+    }
   }
+}
+"""
+
+LOOKUP_QUERIES = {
+  "teams": """
+    query ($first: Int!, $after: String) {
+      teams(first: $first, after: $after) {
+        nodes { id name key }
+        pageInfo { hasNextPage endCursor }
+      }
+    }
+  """,
+  "projects": """
+    query ($first: Int!, $after: String) {
+      projects(first: $first, after: $after) {
+        nodes { id name slugId startDate targetDate progress }
+        pageInfo { hasNextPage endCursor }
+      }
+    }
+  """,
+  "issueLabels": """
+    query ($first: Int!, $after: String) {
+      issueLabels(first: $first, after: $after) {
+        nodes { id name }
+        pageInfo { hasNextPage endCursor }
+      }
+    }
+  """,
+  "users": """
+    query ($first: Int!, $after: String) {
+      users(first: $first, after: $after) {
+        nodes { id name displayName email }
+        pageInfo { hasNextPage endCursor }
+      }
+    }
+  """,
+}
+
+# Issue roles a user filter matches, and the user fields compared
+USER_ROLES = ("assignee", "creator")
+USER_FIELDS = ("displayName", "name", "email")
 
-  org_metrics = LinearOrgMetrics(name="Organization")
 
-  # GraphQL query remains the same as current implementation
-  query = """
-    query ($after: String) {
-      issues(
-        filter: {
-          createdAt: { gte: "%s", lte: "%s" }
-        }
-        first: 50
-        after: $after
-      ) {
-        nodes {
-          id
-          title
-          identifier
-          state {
-            name
-            type
-          }
-          project {
-            id
-            name
-            slugId
-            startDate
-            targetDate
-            progress
-          }
-          team {
-            id
-            name
-            key
-          }
-          labels {
-            nodes {
-              id
-              name
-            }
-          }
-          estimate
-          startedAt
-          completedAt
-          createdAt
-          updatedAt
-        }
-        pageInfo {
-          hasNextPage
-          endCursor
-        }
+USER_IDS_QUERY = """
+query ($filter: UserFilter, $first: Int!) {
+  users(filter: $filter, first: $first) {
+    nodes { id }
+  }
+}
+"""
+
+
+# State transitions of many issues at once; the rare issue with more than one
+# page of history is completed with ISSUE_HISTORY_QUERY
+HISTORY_QUERY = """
+query ($ids: [ID!], $first: Int!, $after: String) {
+  issues(filter: { id: { in: $ids } }, first: $first, after: $after) {
+    nodes {
+      id
+      history(first: 50) {
+        nodes { createdAt fromState { name type } toState { name type } }
+        pageInfo { hasNextPage endCursor }
       }
     }
-    """ % (
-    start_date.isoformat(),
-    end_date.isoformat(),
+    pageInfo { hasNextPage endCursor }
+  }
+}
+"""
+
+ISSUE_HISTORY_QUERY = """
+query ($id: String!, $after: String) {
+  issue(id: $id) {
+    history(first: 100, after: $after) {
+      nodes { createdAt fromState { name type } toState { name type } }
+      pageInfo { hasNextPage endCursor }
+    }
+  }
+}
+"""
+
+
+class Lookups(NamedTuple):
+  """Workspace metadata keyed by id"""
+
+  teams: Dict[str, Dict]
+  projects: Dict[str, Dict]
+  labels: Dict[str, Dict]
+  users: Dict[str, Dict]
+
+
+def get_linear_metrics(
+    start_date: datetime, end_date: datetime, user_filter: Optional[str] = None
+) -> LinearOrgMetrics:
+  client = LinearClient()
+  org_metrics = LinearOrgMetrics(name="Organization")
+  calendars = TeamCalendars.from_config(
+    get_config_value("LINEAR_TEAM_TIMEZONES"), get_config_value("LINEAR_HOLIDAYS")
   )
 
-  all_issues = []
-  has_next_page = True
-  after = None
-
-  while has_next_page:
-    variables = {"after": after} if after else {}
-    response = requests.post(
-      LINEAR_API_ENDPOINT,
-      json={"query": query, "variables": variables},
-      headers=headers,
-      timeout=30,
-    )
-    data = response.json()
-
-    if "errors" in data:
-      logging.error("Error in Linear API response:", data["errors"])
-      raise RuntimeError(f"Linear API error: {data['errors']}")
-
-    issues_data = data["data"]["issues"]
-    all_issues.extend(issues_data["nodes"])
-    has_next_page = issues_data["pageInfo"]["hasNextPage"]
-    after = issues_data["pageInfo"]["endCursor"]
-
-  # Process all issues
-  for issue in all_issues:
-    # Update issue metrics
-    org_metrics.issues.update_from_issue(issue)
-
-    # Update cycle time metrics
-    org_metrics.cycle_time.update_from_issue(issue)
-
-    # Calculate actual time for estimation metrics
-    actual_time = 0
-    if issue.get("startedAt") and issue.get("completedAt"):
-      started_at = datetime.fromisoformat(
-        issue["startedAt"].replace("Z", "+00:00")
-      )
-      completed_at = datetime.fromisoformat(
-        issue["completedAt"].replace("Z", "+00:00")
+  window = (to_timestamp(start_date), to_timestamp(end_date))
+
+  with IssueStore(issue_store_path(client), ISSUE_PAYLOAD_VERSION) as store:
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="linear-pipeline") as executor:
+      pending_lookups = executor.submit(fetch_lookups, client)
+      # Changed issues are aggregated while later pages are still being fetched
+      batches: "queue.Queue[Optional[List[Dict]]]" = queue.Queue(maxsize=AGGREGATION_QUEUE_SIZE)
+      aggregator = executor.submit(
+        aggregate_batches, batches, org_metrics, pending_lookups, calendars, window, user_filter
       )
-      actual_time = calculate_work_hours(started_at, completed_at)
-
-    # Update estimation metrics
-    org_metrics.estimation.update_from_issue(issue, actual_time)
-
-    # Update team metrics
-    team = issue.get("team", {})
-    if team:
-      team_key = team.get("key")
-      if team_key not in org_metrics.teams:
-        org_metrics.teams[team_key] = TeamMetrics(name=team_key)
-      org_metrics.teams[team_key].update_from_issue(issue)
-
-    # Update project metrics
-    project = issue.get("project", {})
-    if project:
-      project_slug = project.get("slugId")
-      if project_slug not in org_metrics.projects:
-        org_metrics.projects[project_slug] = ProjectMetrics(
-          key=project_slug,
-          name=project.get("name", ""),
-          start_date=project.get("startDate"),
-          target_date=project.get("targetDate"),
-          progress=project.get("progress", 0),
-        )
-      org_metrics.projects[project_slug].update_from_issue(issue)
-
-    # Update label metrics
-    labels = issue.get("labels", {}).get("nodes", [])
-    for label in labels:
-      label_name = label.get("name", "")
-      if label_name:
-        if label_name not in org_metrics.label_counts:
-          org_metrics.label_counts[label_name] = 0
-        org_metrics.label_counts[label_name] += 1
+      try:
+        sync_issues(client, store, start_date, user_filter, on_batch=batches.put)
+      finally:
+        batches.put(None)
+      aggregated = aggregator.result()
+      lookups = pending_lookups.result()
+
+    # Then every issue in the window that did not change since the last sync
+    for issue in store.issues_created_between(start_date, end_date):
+      if issue["id"] in aggregated:
+        continue
+      # The store is shared by every scope, so other users' issues are skipped
+      joined = join_issue(issue, lookups)
+      if not user_filter or matches_user(joined, user_filter):
+        update_org_metrics(org_metrics, IssueRecord.from_issue(joined), calendars, lookups)
 
   # Aggregate metrics after processing all issues
   org_metrics.aggregate_metrics()
@@ -157,7 +230,338 @@ def get_linear_metrics(start_date, end_date, user_filter=None) -> LinearOrgMetri
   return org_metrics
 
 
-def calculate_estimation_accuracy(issues):
+def issue_store_path(client: LinearClient) -> Path:
+  """Store of the workspace the API key belongs to, so workspaces never mix"""
+  workspace_id = client.query(WORKSPACE_QUERY, cost=1)["organization"]["id"]
+  return ISSUE_STORE_DIR / f"linear-issues-{workspace_id}.sqlite3"
+
+
+def aggregate_batches(
+    batches: "queue.Queue[Optional[List[Dict]]]",
+    org_metrics: LinearOrgMetrics,
+    lookups: "Future[Lookups]",
+    calendars: TeamCalendars,
+    window: Tuple[float, float],
+    user_filter: Optional[str] = None,
+) -> Set[str]:
+  """Consume synced batches until the None sentinel, returning the ids aggregated.
+
+  On failure the queue is still drained so the producer never blocks, and
+  the error is raised once the sentinel arrives.
+  """
+  aggregated: Set[str] = set()
+  error: Optional[Exception] = None
+  while True:
+    batch = batches.get()
+    if batch is None:
+      break
+    if error is not None:
+      continue
+    try:
+      tables = lookups.result()
+      for issue in batch:
+        joined = join_issue(issue, tables)
+        if user_filter and not matches_user(joined, user_filter):
+          continue
+        record = IssueRecord.from_issue(joined)
+        if window[0] <= record.created_at <= window[1]:
+          update_org_metrics(org_metrics, record, calendars, tables)
+          aggregated.add(record.id)
+    except Exception as e:
+      error = e
+  if error is not None:
+    raise error
+  return aggregated
+
+
+def update_org_metrics(
+    org_metrics: LinearOrgMetrics, issue: IssueRecord, calendars: TeamCalendars, lookups: Lookups
+) -> None:
+  """Fold one normalized issue into the organization metrics"""
+  # Update issue metrics
+  org_metrics.issues.update_from_issue(issue)
+
+  # Update cycle time metrics
+  org_metrics.cycle_time.update_from_issue(issue)
+
+  # Calculate actual time for estimation metrics
+  actual_time = 0.0
+  if issue.started_at and issue.completed_at:
+    actual_time = calculate_work_hours(
+      datetime.fromtimestamp(issue.started_at, timezone.utc),
+      datetime.fromtimestamp(issue.completed_at, timezone.utc),
+      calendars.for_team(issue.team_key),
+    )
+
+  # Update estimation metrics
+  org_metrics.estimation.update_from_issue(issue, actual_time)
+
+  # Update team metrics
+  if issue.team_key:
+    if issue.team_key not in org_metrics.teams:
+      org_metrics.teams[issue.team_key] = TeamMetrics(name=issue.team_key)
+    org_metrics.teams[issue.team_key].update_from_issue(issue)
+
+  # Update project metrics, seeded once from the project lookup
+  if issue.project_key:
+    if issue.project_key not in org_metrics.projects:
+      project = lookups.projects.get(issue.project_id, {}) if issue.project_id else {}
+      org_metrics.projects[issue.project_key] = ProjectMetrics(
+        key=issue.project_key,
+        name=project.get("name", ""),
+        start_date=project.get("startDate"),
+        target_date=project.get("targetDate"),
+        progress=project.get("progress", 0),
+      )
+    org_metrics.projects[issue.project_key].update_from_issue(issue)
+
+  # Update label metrics
+  for label_name in issue.labels:
+    org_metrics.label_counts[label_name] = org_metrics.label_counts.get(label_name, 0) + 1
+
+
+def fetch_lookups(client: LinearClient) -> Lookups:
+  """Fetch every team, project and label once"""
+  tables = {}
+  for connection, query in LOOKUP_QUERIES.items():
+    tables[connection] = {
+      node["id"]: node
+      for nodes in client.paginate(query, {}, connection, LOOKUP_NODE_COMPLEXITY)
+      for node in nodes
+    }
+  return Lookups(tables["teams"], tables["projects"], tables["issueLabels"], tables["users"])
+
+
+def join_issue(issue: dict, lookups: Lookups) -> dict:
+  """Expand the ids on a stored issue into the objects the metrics read"""
+  joined = dict(issue)
+  team = issue.get("team")
+  if team:
+    joined["team"] = lookups.teams.get(team["id"], team)
+  project = issue.get("project")
+  if project:
+    joined["project"] = lookups.projects.get(project["id"], project)
+  for role in USER_ROLES:
+    user = issue.get(role)
+    if user:
+      joined[role] = lookups.users.get(user["id"], user)
+  label_ids = issue.get("labelIds")
+  if label_ids is not None:
+    joined["labels"] = {
+      "nodes": [lookups.labels[label_id] for label_id in label_ids if label_id in lookups.labels]
+    }
+  return joined
+
+
+def user_ids(client: LinearClient, user_filter: str) -> List[str]:
+  """Ids of the workspace users a user filter matches"""
+  data = client.query(
+    USER_IDS_QUERY,
+    {
+      "filter": {"or": [{field: {"eqIgnoreCase": user_filter}} for field in USER_FIELDS]},
+      "first": MAX_MATCHING_USERS,
+    },
+    LOOKUP_NODE_COMPLEXITY * MAX_MATCHING_USERS,
+  )
+  return [node["id"] for node in data["users"]["nodes"]]
+
+
+def reassignment_filters(
+    client: LinearClient, store: IssueStore, user_filter: str, changed_since: Optional[datetime]
+) -> List[Dict]:
+  """Filters refreshing the stored issues assigned to the user, by id.
+
+  An issue reassigned away from the user no longer matches the user filter,
+  so only this refresh replaces its stored payload. Without changed_since
+  every such issue is refreshed, since another scope may have stored it.
+  """
+  ids = store.issue_ids_assigned_to(user_ids(client, user_filter))
+  filters = []
+  for index in range(0, len(ids), REFRESH_BATCH_SIZE):
+    issue_filter: Dict = {"id": {"in": ids[index:index + REFRESH_BATCH_SIZE]}}
+    if changed_since is not None:
+      issue_filter["updatedAt"] = {"gt": changed_since.isoformat()}
+    filters.append(issue_filter)
+  return filters
+
+
+def user_issue_filter(user_filter: str) -> Dict:
+  """GraphQL filter for issues assigned to or created by the user"""
+  return {
+    "or": [
+      {role: {"or": [{field: {"eqIgnoreCase": user_filter}} for field in USER_FIELDS]}}
+      for role in USER_ROLES
+    ]
+  }
+
+
+def matches_user(issue: dict, user_filter: str) -> bool:
+  """Local counterpart of user_issue_filter for a joined issue"""
+  wanted = user_filter.lower()
+  return any(
+    str((issue.get(role) or {}).get(field) or "").lower() == wanted
+    for role in USER_ROLES
+    for field in USER_FIELDS
+  )
+
+
+def sync_scope(user_filter: Optional[str]) -> str:
+  """Store key for the marks of a sync, per user when filtered"""
+  return f"user:{user_filter.lower()}" if user_filter else ALL_ISSUES
+
+
+def sync_issues(
+    client: LinearClient,
+    store: IssueStore,
+    start_date: Union[str, datetime],
+    user_filter: Optional[str] = None,
+    on_batch: Optional[Callable[[List[Dict]], None]] = None,
+) -> None:
+  """Bring the store up to date for every issue created since start_date.
+
+  The first sync fetches issues by createdAt. Later syncs fetch only issues
+  updated after the high-water mark, plus a createdAt backfill when the
+  window reaches back before anything synced so far. With a user filter
+  every fetch covers only that user's issues, under marks of their own, and
+  the stored issues assigned to the user are refreshed by id, so an issue
+  reassigned away is not counted under its old assignee. Each stored batch
+  is also handed to on_batch.
+  """
+  scope = sync_scope(user_filter)
+  since = from_timestamp(to_timestamp(start_date))
+  now = datetime.now(timezone.utc)
+  state = store.sync_state(scope)
+
+  changed: List[Dict] = []
+  if state is None:
+    created = shard_window("createdAt", since, now)
+    synced_from = since
+  else:
+    changed = shard_window("updatedAt", state.high_water, now)
+    created = []
+    if since < state.synced_from:
+      created = shard_window("createdAt", since, state.synced_from)
+    synced_from = min(since, state.synced_from)
+
+  filters = changed + created
+  if user_filter:
+    filters = [{**issue_filter, **user_issue_filter(user_filter)} for issue_filter in filters]
+    filters += reassignment_filters(
+      client, store, user_filter, state.high_water if state is not None else None
+    )
+
+  issues = fetch_issues(client, filters)
+  while True:
+    batch = list(islice(issues, UPSERT_BATCH_SIZE))
+    if not batch:
+      break
+    attach_histories(client, batch)
+    store.upsert(batch)
+    if on_batch:
+      on_batch(batch)
+
+  # Changes made while this sync ran may have been missed, so the next sync
+  # overlaps it; upserts are idempotent
+  store.record_sync(now - SYNC_OVERLAP, synced_from, scope)
+
+
+def attach_histories(client: LinearClient, issues: List[Dict]) -> None:
+  """Fetch the state history of a batch of issues in bulk and attach it"""
+  by_id = {issue["id"]: issue for issue in issues}
+  ids = list(by_id)
+  chunks = [ids[i:i + HISTORY_BATCH_SIZE] for i in range(0, len(ids), HISTORY_BATCH_SIZE)]
+
+  with ThreadPoolExecutor(max_workers=LINEAR_SHARDS, thread_name_prefix="linear-history") as executor:
+    for histories in executor.map(lambda chunk: fetch_histories(client, chunk), chunks):
+      for issue_id, entries in histories.items():
+        by_id[issue_id]["history"] = {"nodes": entries}
+
+
+def fetch_histories(client: LinearClient, ids: List[str]) -> Dict[str, List[Dict]]:
+  """State transitions of the given issues, keyed by issue id"""
+  histories: Dict[str, List[Dict]] = {}
+  for nodes in client.paginate(
+      HISTORY_QUERY, {"ids": ids}, "issues", HISTORY_NODE_COMPLEXITY, HISTORY_BATCH_SIZE
+  ):
+    for node in nodes:
+      history = node["history"]
+      entries = history["nodes"]
+      after = history["pageInfo"]["endCursor"] if history["pageInfo"]["hasNextPage"] else None
+      while after:
+        history = client.query(
+          ISSUE_HISTORY_QUERY, {"id": node["id"], "after": after}, HISTORY_NODE_COMPLEXITY * 2
+        )["issue"]["history"]
+        entries.extend(history["nodes"])
+        after = history["pageInfo"]["endCursor"] if history["pageInfo"]["hasNextPage"] else None
+      # History also records assignee, label and other changes; keep state moves
+      histories[node["id"]] = [entry for entry in entries if entry.get("toState")]
+  return histories
+
+
+def shard_window(
+    field: str, start_date: datetime, end_date: datetime, shards: Optional[int] = None
+) -> List[Dict]:
+  """Split a date window into contiguous, non-overlapping filters on field"""
+  if shards is None:
+    # Roughly one shard per week, so short incremental windows stay one request
+    shards = min(LINEAR_SHARDS, max(1, (end_date - start_date).days // 7))
+  step = (end_date - start_date) / shards
+  bounds = [start_date + step * index for index in range(shards)] + [end_date]
+  filters: List[Dict] = []
+  for index in range(shards):
+    # Only the last shard includes its upper bound
+    upper = "lte" if index == shards - 1 else "lt"
+    filters.append({
+      field: {"gte": bounds[index].isoformat(), upper: bounds[index + 1].isoformat()}
+    })
+  return filters
+
+
+def fetch_issues(client: LinearClient, filters: List[Dict]) -> Iterator[Dict]:
+  """Yield every issue matching any of the filters once, fetching them concurrently"""
+  pages: "queue.Queue[Optional[List[Dict]]]" = queue.Queue(maxsize=LINEAR_SHARDS * 2)
+  stop = threading.Event()
+
+  def fetch_shard(issue_filter: Dict) -> None:
+    try:
+      if stop.is_set():
+        return
+      for nodes in client.paginate(
+          ISSUES_QUERY, {"filter": issue_filter}, "issues", ISSUE_NODE_COMPLEXITY
+      ):
+        if stop.is_set():
+          return
+        pages.put(nodes)
+    finally:
+      pages.put(None)
+
+  seen: Set[str] = set()
+  with ThreadPoolExecutor(max_workers=LINEAR_SHARDS, thread_name_prefix="linear-shard") as executor:
+    futures = [executor.submit(fetch_shard, issue_filter) for issue_filter in filters]
+    remaining = len(futures)
+    try:
+      while remaining:
+        nodes = pages.get()
+        if nodes is None:
+          remaining -= 1
+          continue
+        for issue in nodes:
+          # Issues can match several filters, or move between pages mid-fetch
+          if issue["id"] not in seen:
+            seen.add(issue["id"])
+            yield issue
+    finally:
+      # Unblock any shard still waiting on a full queue
+      stop.set()
+      while remaining:
+        if pages.get() is None:
+          remaining -= 1
+
+  for future in futures:
+    future.result()
+
+
+def calculate_estimation_accuracy(issues: List[Dict]) -> Dict[str, Any]:
   """Calculate estimation accuracy metrics"""
   estimated_issues = [
     i
@@ -174,7 +578,7 @@ def calculate_estimation_accuracy(issues):
       "estimation_variance": [],
     }
 
-  accuracy_metrics = {
+  accuracy_metrics: Dict[str, Any] = {
     "total_estimated": len(estimated_issues),
     "accurate_estimates": 0,
     "underestimates": 0,
@@ -182,41 +586,41 @@ def calculate_estimation_accuracy(issues):
     "estimation_variance": [],
   }
 
+  # Parse once, then compute every issue's working hours in one batch
+  parsed: List[Tuple[float, float, float]] = []
   for issue in estimated_issues:
-    estimate = issue["estimate"]
-    started_at = issue["startedAt"]
-    completed_at = issue["completedAt"]
-
     try:
-      started = datetime.fromisoformat(started_at.replace("Z", "+00:00"))
-      completed = datetime.fromisoformat(completed_at.replace("Z", "+00:00"))
-
-      actual_time = calculate_work_hours(started, completed)
-
-      if actual_time == 0:
-        continue
-
-      # Calculate variance percentage
-      variance_percent = ((actual_time - estimate) / estimate) * 100
-      accuracy_metrics["estimation_variance"].append(variance_percent)
-
-      # Categorize accuracy (within 20% is considered accurate)
-      if abs(variance_percent) <= 20:
-        accuracy_metrics["accurate_estimates"] += 1
-      elif variance_percent > 20:
-        accuracy_metrics["underestimates"] += 1
-      else:
-        accuracy_metrics["overestimates"] += 1
-
+      started = datetime.fromisoformat(issue["startedAt"].replace("Z", "+00:00"))
+      completed = datetime.fromisoformat(issue["completedAt"].replace("Z", "+00:00"))
+      parsed.append((issue["estimate"], started.timestamp(), completed.timestamp()))
     except Exception as e:
       # Log the error or handle it more specifically
       console.print(f"Error calculating estimation accuracy: {str(e)}")
+
+  actual_times = DEFAULT_CALENDAR.work_hours_batch(
+    [started for _, started, _ in parsed], [completed for _, _, completed in parsed]
+  )
+
+  for (estimate, _, _), actual_time in zip(parsed, actual_times):
+    if actual_time == 0:
       continue
 
+    # Calculate variance percentage
+    variance_percent = ((actual_time - estimate) / estimate) * 100
+    accuracy_metrics["estimation_variance"].append(float(variance_percent))
+
+    # Categorize accuracy (within 20% is considered accurate)
+    if abs(variance_percent) <= 20:
+      accuracy_metrics["accurate_estimates"] += 1
+    elif variance_percent > 20:
+      accuracy_metrics["underestimates"] += 1
+    else:
+      accuracy_metrics["overestimates"] += 1
+
   return accuracy_metrics
 
 
-def calculate_actual_time(issue):
+def calculate_actual_time(issue: Dict) -> Optional[float]:
   """Calculate actual time spent on an issue in hours"""
   if not issue.get("completed_at"):
     return None
@@ -239,89 +643,34 @@ def calculate_actual_time(issue):
   return work_hours
 
 
-def calculate_work_hours(start_date, end_date):
+def calculate_work_hours(
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    calendar: Optional[BusinessCalendar] = None,
+) -> float:
   """Calculate work hours between two dates, excluding weekends"""
-  if not start_date or not end_date:
-    return 0
-
-  # Convert to UTC for consistent calculations
-  if start_date.tzinfo:
-    start_date = start_date.astimezone(tz.UTC)
-  if end_date.tzinfo:
-    end_date = end_date.astimezone(tz.UTC)
-
-  total_hours = 0
-  current_date = start_date
-
-  while current_date < end_date:
-    if current_date.weekday() < 5:  # Monday to Friday
-      day_end = min(
-        current_date.replace(hour=17, minute=0, second=0, microsecond=0),
-        end_date,
-      )
-      day_start = current_date.replace(hour=9, minute=0, second=0, microsecond=0)
-
-      if day_end > day_start:
-        work_hours = (day_end - day_start).total_seconds() / 3600
-        total_hours += min(8, work_hours)  # Cap at 8 hours per day
-
-    current_date = current_date.replace(
-      hour=9, minute=0, second=0, microsecond=0
-    ) + timedelta(days=1)
+  return (calendar or DEFAULT_CALENDAR).work_hours(start_date, end_date)
 
-  return total_hours
 
-
-def calculate_work_points(start_date, end_date):
+def calculate_work_points(
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    calendar: Optional[BusinessCalendar] = None,
+) -> int:
   """Calculate work points based on working days between dates"""
-  if not start_date or not end_date:
-    return 0
-
-  # Convert to UTC for consistent calculations
-  if start_date.tzinfo:
-    start_date = start_date.astimezone(tz.UTC)
-  if end_date.tzinfo:
-    end_date = end_date.astimezone(tz.UTC)
-
-  # Calculate working days (excluding weekends)
-  total_points = 0
-  current_date = start_date
-
-  while current_date < end_date:
-    if current_date.weekday() < 5:  # Monday to Friday
-      # Add 1 point per working day
-      total_points += 1
-
-    # Move to next day
-    current_date = current_date + timedelta(days=1)
+  return (calendar or DEFAULT_CALENDAR).work_points(start_date, end_date)
 
-  return total_points
 
-
-def calculate_working_days(start_date, end_date):
+def calculate_working_days(
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    calendar: Optional[BusinessCalendar] = None,
+) -> int:
   """Calculate number of working days between two dates"""
-  if not start_date or not end_date:
-    return 0
-
-  # Convert to UTC for consistent calculations
-  if start_date.tzinfo:
-    start_date = start_date.astimezone(tz.UTC)
-  if end_date.tzinfo:
-    end_date = end_date.astimezone(tz.UTC)
-
-  working_days = 0
-  current_date = start_date.date()  # Use date only for day counting
-  end_date = end_date.date()
-
-  while current_date <= end_date:
-    if current_date.weekday() < 5:  # Monday to Friday
-      working_days += 1
-    current_date += timedelta(days=1)
-
-  return working_days
+  return (calendar or DEFAULT_CALENDAR).working_days(start_date, end_date)
 
 
-def points_to_expected_hours(points):
+def points_to_expected_hours(points: int) -> int:
   """Convert story points to expected working hours using Fibonacci scale mapping"""
   HOURS_PER_DAY = 8
   HOURS_PER_WEEK = 40  # 5 working days
@@ -1,60 +1,30 @@
-import json
 import statistics
 from collections import defaultdict
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Dict, List, Set
-
-
-class MetricsJSONEncoder(json.JSONEncoder):
-  def default(self, obj):
-    if isinstance(obj, datetime):
-      return obj.isoformat()
-    if isinstance(obj, set):
-      return list(obj)
-    if isinstance(obj, defaultdict):
-      return dict(obj)
-    if callable(obj):
-      return None
-    if hasattr(obj, "__dict__"):
-      return {
-        k: v
-        for k, v in obj.__dict__.items()
-        if not k.startswith("_") and not callable(v)
-      }
-    try:
-      return super().default(obj)
-    except Exception:
-      return str(obj)
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from ...serialization import dataclass_to_dict
+from .records import IssueRecord, StateTransition
 
 
 @dataclass
 class BaseMetrics:
-  def to_dict(self):
-    def convert(obj):
-      if isinstance(obj, datetime):
-        return obj.isoformat()
-      if isinstance(obj, set):
-        return list(obj)
-      if isinstance(obj, defaultdict):
-        return dict(obj)
-      if callable(obj):
-        return None
-      if hasattr(obj, "to_dict"):
-        return obj.to_dict()
-      if hasattr(obj, "__dict__"):
-        return {
-          k: convert(v)
-          for k, v in obj.__dict__.items()
-          if not k.startswith("_") and not callable(v)
-        }
-      return obj
+  to_dict = dataclass_to_dict
 
-    return {
-      k: convert(v)
-      for k, v in self.__dict__.items()
-      if not k.startswith("_") and not callable(v)
-    }
+
+def state_intervals(
+    created_at: float, transitions: Iterable[StateTransition]
+) -> Iterator[Tuple[str, str, float]]:
+  """Yield (state name, state type, hours) for every completed stay in a state.
+
+  Transitions arrive sorted, so each stay ends at the next transition out of
+  it. The current, still open stay is not yielded.
+  """
+  entered_at = created_at
+  for transition in transitions:
+    if transition.from_name or transition.from_type:
+      yield transition.from_name, transition.from_type, (transition.changed_at - entered_at) / 3600
+    entered_at = transition.changed_at
 
 
 @dataclass
@@ -113,64 +83,47 @@ class IssueMetrics(BaseMetrics):
       "project_metrics": dict(self.by_project),
     }
 
-  def update_from_issue(self, issue: dict):
+  def update_from_issue(self, issue: IssueRecord) -> None:
     self.total_created += 1
 
-    state = issue.get("state", {})
-    state_type = state.get("type")
-    state_name = state.get("name", "Unknown")
-
     # Update state metrics
-    self.by_state[state_name] += 1
+    self.by_state[issue.state_name] += 1
 
-    if state_type == "completed":
+    if issue.completed:
       self.total_completed += 1
-    elif state_type in ["started", "inProgress"]:
+    elif issue.in_progress:
       self.total_in_progress += 1
 
     # Update bug/feature metrics
-    is_bug = any(
-      label.get("name", "").lower() == "bug"
-      for label in issue.get("labels", {}).get("nodes", [])
-    )
-    is_feature = any(
-      label.get("name", "").lower() in ["feature", "enhancement"]
-      for label in issue.get("labels", {}).get("nodes", [])
-    )
-
-    if is_bug:
+    if issue.is_bug:
       self.bugs_created += 1
-      if state_type == "completed":
+      if issue.completed:
         self.bugs_completed += 1
-    elif is_feature:
+    elif issue.is_feature:
       self.features_created += 1
-      if state_type == "completed":
+      if issue.completed:
         self.features_completed += 1
 
     # Update priority metrics
-    priority = issue.get("priority")
-    if priority:
-      self.by_priority[str(priority)] += 1
+    if issue.priority:
+      self.by_priority[str(issue.priority)] += 1
 
     # Update team metrics
-    team = issue.get("team", {}).get("key")
-    if team:
-      self.by_team[team] += 1
+    if issue.team_key:
+      self.by_team[issue.team_key] += 1
 
     # Update project metrics
-    project = issue.get("project", {})
-    if project:
-      project_key = project.get("key")
-      if project_key:
-        self.by_project[project_key]["total"] += 1
-        if is_bug:
-          self.by_project[project_key]["bugs"] += 1
-        elif is_feature:
-          self.by_project[project_key]["features"] += 1
-        if state_type == "completed":
-          self.by_project[project_key]["completed"] += 1
-        elif state_type in ["started", "inProgress"]:
-          self.by_project[project_key]["in_progress"] += 1
+    project_key = issue.project_key
+    if project_key:
+      self.by_project[project_key]["total"] += 1
+      if issue.is_bug:
+        self.by_project[project_key]["bugs"] += 1
+      elif issue.is_feature:
+        self.by_project[project_key]["features"] += 1
+      if issue.completed:
+        self.by_project[project_key]["completed"] += 1
+      elif issue.in_progress:
+        self.by_project[project_key]["in_progress"] += 1
 
 
 @dataclass
@@ -214,66 +167,46 @@ class CycleTimeMetrics(BaseMetrics):
       ),
     }
 
-  def update_from_issue(self, issue: dict):
-    created_at = datetime.fromisoformat(issue["createdAt"].replace("Z", "+00:00"))
-    completed_at = (
-      None
-      if not issue.get("completedAt")
-      else datetime.fromisoformat(issue["completedAt"].replace("Z", "+00:00"))
-    )
-    started_at = (
-      None
-      if not issue.get("startedAt")
-      else datetime.fromisoformat(issue["startedAt"].replace("Z", "+00:00"))
-    )
+  def update_from_issue(self, issue: IssueRecord) -> None:
+    created_at = issue.created_at
+    completed_at = issue.completed_at
+    started_at = issue.started_at
 
     if completed_at:
-      cycle_time = (completed_at - created_at).total_seconds() / 3600
+      cycle_time = (completed_at - created_at) / 3600
       self.cycle_times.append(cycle_time)
 
-      team = issue.get("team", {}).get("key")
-      if team:
-        self.by_team[team].append(cycle_time)
+      if issue.team_key:
+        self.by_team[issue.team_key].append(cycle_time)
 
-      priority = issue.get("priority")
-      if priority:
-        self.by_priority[str(priority)].append(cycle_time)
+      if issue.priority:
+        self.by_priority[str(issue.priority)].append(cycle_time)
 
     if started_at:
-      time_to_start = (started_at - created_at).total_seconds() / 3600
+      time_to_start = (started_at - created_at) / 3600
       self.time_to_start.append(time_to_start)
 
       if completed_at:
-        time_in_progress = (completed_at - started_at).total_seconds() / 3600
+        time_in_progress = (completed_at - started_at) / 3600
         self.time_in_progress.append(time_in_progress)
 
-    # Track blocked time from history
-    blocked_duration = 0
-    for history in issue.get("history", {}).get("nodes", []):
-      if history.get("toState", {}).get("name", "").lower() == "blocked":
-        blocked_start = datetime.fromisoformat(
-          history["createdAt"].replace("Z", "+00:00")
-        )
-        # Find when it was unblocked
-        for next_history in issue.get("history", {}).get("nodes", []):
-          if (
-              datetime.fromisoformat(
-                next_history["createdAt"].replace("Z", "+00:00")
-              )
-              > blocked_start
-              and next_history.get("fromState", {}).get("name", "").lower()
-              == "blocked"
-          ):
-            blocked_end = datetime.fromisoformat(
-              next_history["createdAt"].replace("Z", "+00:00")
-            )
-            blocked_duration += (
-                                    blocked_end - blocked_start
-                                ).total_seconds() / 3600
-            break
-
-    if blocked_duration > 0:
-      self.blocked_time.append(blocked_duration)
+    # Time spent in each kind of state, from one sweep over the history
+    blocked_time = review_time = triage_time = 0.0
+    for name, state_type, hours in state_intervals(created_at, issue.transitions):
+      name = name.lower()
+      if name == "blocked":
+        blocked_time += hours
+      elif "review" in name:
+        review_time += hours
+      if state_type == "triage":
+        triage_time += hours
+
+    if blocked_time > 0:
+      self.blocked_time.append(blocked_time)
+    if review_time > 0:
+      self.time_in_review.append(review_time)
+    if triage_time > 0:
+      self.time_to_triage.append(triage_time)
 
 
 @dataclass
@@ -326,8 +259,8 @@ class EstimationMetrics(BaseMetrics):
       },
     }
 
-  def update_from_issue(self, issue: dict, actual_time: float):
-    estimate = issue.get("estimate")
+  def update_from_issue(self, issue: IssueRecord, actual_time: float) -> None:
+    estimate = issue.estimate
     if not estimate or actual_time <= 0:
       return
 
@@ -344,9 +277,8 @@ class EstimationMetrics(BaseMetrics):
     else:
       self.overestimates += 1
 
-    team = issue.get("team", {}).get("key")
-    if team:
-      team_stats = self.by_team[team]
+    if issue.team_key:
+      team_stats = self.by_team[issue.team_key]
       team_stats["total"] += 1
       team_stats["variance"].append(variance_percent)
       if abs(variance_percent) <= 20:
@@ -399,39 +331,32 @@ class TeamMetrics(BaseMetrics):
       "projects": self.projects,
     }
 
-  def update_from_issue(self, issue: dict):
+  def update_from_issue(self, issue: IssueRecord) -> None:
     self.issues_created += 1
-    if issue.get("state", {}).get("type") == "completed":
+    if issue.completed:
       self.issues_completed += 1
 
-    is_bug = any(
-      label.get("name", "").lower() == "bug"
-      for label in issue.get("labels", {}).get("nodes", [])
-    )
-    if is_bug:
+    if issue.is_bug:
       self.bugs_created += 1
-      if issue.get("state", {}).get("type") == "completed":
+      if issue.completed:
         self.bugs_completed += 1
 
-    assignee = issue.get("assignee", {}).get("name")
-    if assignee:
-      self.members.add(assignee)
-
-    project = issue.get("project", {})
-    if project:
-      project_key = project.get("key")
-      if project_key:
-        if project_key not in self.projects:
-          self.projects[project_key] = {
-            "total_issues": 0,
-            "completed_issues": 0,
-            "bugs": 0,
-          }
-        self.projects[project_key]["total_issues"] += 1
-        if is_bug:
-          self.projects[project_key]["bugs"] += 1
-        if issue.get("state", {}).get("type") == "completed":
-          self.projects[project_key]["completed_issues"] += 1
+    if issue.assignee:
+      self.members.add(issue.assignee)
+
+    project_key = issue.project_key
+    if project_key:
+      if project_key not in self.projects:
+        self.projects[project_key] = {
+          "total_issues": 0,
+          "completed_issues": 0,
+          "bugs": 0,
+        }
+      self.projects[project_key]["total_issues"] += 1
+      if issue.is_bug:
+        self.projects[project_key]["bugs"] += 1
+      if issue.completed:
+        self.projects[project_key]["completed_issues"] += 1
 
 
 @dataclass
@@ -445,8 +370,9 @@ class ProjectMetrics(BaseMetrics):
   avg_cycle_time: float = 0
   teams_involved: Set[str] = field(default_factory=set)
   estimation_accuracy: float = 0
-  start_date: datetime = None
-  target_date: datetime = None
+  # ISO dates as Linear reports them
+  start_date: Optional[str] = None
+  target_date: Optional[str] = None
   progress: float = 0
 
   def get_stats(self) -> Dict:
@@ -471,31 +397,21 @@ class ProjectMetrics(BaseMetrics):
       "progress": self.progress,
     }
 
-  def update_from_issue(self, issue: dict):
+  def update_from_issue(self, issue: IssueRecord) -> None:
     self.total_issues += 1
 
-    if issue.get("state", {}).get("type") == "completed":
+    if issue.completed:
       self.completed_issues += 1
 
     # Update bug/feature counts
-    is_bug = any(
-      label.get("name", "").lower() == "bug"
-      for label in issue.get("labels", {}).get("nodes", [])
-    )
-    is_feature = any(
-      label.get("name", "").lower() in ["feature", "enhancement"]
-      for label in issue.get("labels", {}).get("nodes", [])
-    )
-
-    if is_bug:
+    if issue.is_bug:
       self.bugs_count += 1
-    elif is_feature:
+    elif issue.is_feature:
       self.features_count += 1
 
     # Track team involvement
-    team = issue.get("team", {}).get("key")
-    if team:
-      self.teams_involved.add(team)
+    if issue.team_key:
+      self.teams_involved.add(issue.team_key)
 
 
 @dataclass
@@ -520,18 +436,13 @@ class LinearOrgMetrics(BaseMetrics):
       "estimation": self.estimation.get_stats(),
     }
 
-  def aggregate_metrics(self):
+  def aggregate_metrics(self) -> None:
     """Aggregate metrics across all teams and projects"""
-    for team in self.teams.values():
-      team_issues = [i for i in team.projects.values()]
-      if team_issues:
-        team.avg_cycle_time = statistics.mean(
-          [i["cycle_time"] for i in team_issues if i.get("cycle_time")]
-        )
-        team.estimation_accuracy = statistics.mean(
-          [
-            i["estimation_accuracy"]
-            for i in team_issues
-            if i.get("estimation_accuracy")
-          ]
-        )
+    # Teams are keyed like the per-team cycle time and estimation data
+    for key, team in self.teams.items():
+      cycle_times = self.cycle_time.by_team.get(key)
+      if cycle_times:
+        team.avg_cycle_time = statistics.mean(cycle_times)
+      estimates = self.estimation.by_team.get(key)
+      if estimates and estimates["total"] > 0:
+        team.estimation_accuracy = estimates["accurate"] / estimates["total"] * 100
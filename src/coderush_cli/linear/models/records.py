@@ -0,0 +1,120 @@
+import sys
+from datetime import datetime
+from typing import Dict, NamedTuple, Optional, Tuple, overload
+
+BUG_LABELS = frozenset({"bug"})
+FEATURE_LABELS = frozenset({"feature", "enhancement"})
+
+
+@overload
+def to_epoch(value: str) -> float: ...
+
+
+@overload
+def to_epoch(value: Optional[str]) -> Optional[float]: ...
+
+
+def to_epoch(value: Optional[str]) -> Optional[float]:
+  """Convert a Linear ISO timestamp to seconds since the epoch"""
+  if not value:
+    return None
+  return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+@overload
+def _intern(value: str) -> str: ...
+
+
+@overload
+def _intern(value: Optional[str]) -> Optional[str]: ...
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+  return sys.intern(value) if value else value
+
+
+class StateTransition(NamedTuple):
+  """A move out of a workflow state"""
+
+  changed_at: float
+  from_name: str
+  from_type: str
+
+
+class IssueRecord(NamedTuple):
+  """The fields of a Linear issue that the metrics need, parsed once"""
+
+  id: str
+  identifier: str
+  title: str
+  state_name: str
+  state_type: Optional[str]
+  team_key: Optional[str]
+  assignee: Optional[str]
+  project_id: Optional[str]
+  project_key: Optional[str]
+  labels: Tuple[str, ...]
+  is_bug: bool
+  is_feature: bool
+  priority: Optional[int]
+  estimate: Optional[float]
+  created_at: float
+  started_at: Optional[float]
+  completed_at: Optional[float]
+  # State transitions sorted by time
+  transitions: Tuple[StateTransition, ...]
+
+  @property
+  def completed(self) -> bool:
+    return self.state_type == "completed"
+
+  @property
+  def in_progress(self) -> bool:
+    return self.state_type in ("started", "inProgress")
+
+  @classmethod
+  def from_issue(cls, issue: Dict) -> "IssueRecord":
+    """Normalize a raw (joined) issue node"""
+    state = issue.get("state") or {}
+    team = issue.get("team") or {}
+    project = issue.get("project") or {}
+    labels = tuple(
+      _intern(label["name"])
+      for label in (issue.get("labels") or {}).get("nodes", [])
+      if label.get("name")
+    )
+    lowered = {label.lower() for label in labels}
+    is_bug = not lowered.isdisjoint(BUG_LABELS)
+
+    return cls(
+      id=issue["id"],
+      identifier=issue.get("identifier", ""),
+      title=issue.get("title", ""),
+      state_name=_intern(state.get("name", "Unknown")),
+      state_type=_intern(state.get("type")),
+      team_key=_intern(team.get("key")),
+      assignee=_intern((issue.get("assignee") or {}).get("name")),
+      project_id=project.get("id"),
+      project_key=_intern(project.get("slugId")),
+      labels=labels,
+      is_bug=is_bug,
+      # Bugs take precedence when an issue carries both kinds of label
+      is_feature=not is_bug and not lowered.isdisjoint(FEATURE_LABELS),
+      priority=issue.get("priority"),
+      estimate=issue.get("estimate"),
+      created_at=to_epoch(issue["createdAt"]),
+      started_at=to_epoch(issue.get("startedAt")),
+      completed_at=to_epoch(issue.get("completedAt")),
+      transitions=tuple(sorted(
+        (
+          StateTransition(
+            to_epoch(entry["createdAt"]),
+            _intern((entry.get("fromState") or {}).get("name", "")),
+            _intern((entry.get("fromState") or {}).get("type", "")),
+          )
+          for entry in (issue.get("history") or {}).get("nodes", [])
+          if entry.get("toState")
+        ),
+        key=lambda transition: transition.changed_at,
+      )),
+    )
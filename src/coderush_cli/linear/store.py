@@ -0,0 +1,139 @@
+import json
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Union
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+  id TEXT PRIMARY KEY,
+  created_at REAL NOT NULL,
+  updated_at REAL NOT NULL,
+  payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS issues_created_at ON issues (created_at);
+CREATE TABLE IF NOT EXISTS sync_state (
+  scope TEXT PRIMARY KEY,
+  high_water REAL NOT NULL,
+  synced_from REAL NOT NULL
+);
+"""
+
+# Scope of a sync that covers every issue in the workspace
+ALL_ISSUES = "*"
+
+
+def to_timestamp(value: Union[str, datetime]) -> float:
+  """Epoch seconds for an ISO string or datetime; naive datetimes are UTC"""
+  if isinstance(value, str):
+    value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+  if value.tzinfo is None:
+    value = value.replace(tzinfo=timezone.utc)
+  return value.timestamp()
+
+
+def from_timestamp(value: float) -> datetime:
+  return datetime.fromtimestamp(value, timezone.utc)
+
+
+class SyncState(NamedTuple):
+  """How far a scope has been synced in both directions"""
+
+  # Every change up to this time has been stored
+  high_water: datetime
+  # Every issue created since this time has been stored
+  synced_from: datetime
+
+
+class IssueStore:
+  """Local SQLite copy of Linear issues, kept fresh by incremental syncs.
+
+  payload_version identifies the shape of the stored issue payloads. A store
+  written with another version is emptied on open, so the next sync fetches
+  every issue again in the current shape.
+  """
+
+  def __init__(self, path: Path, payload_version: int = 1):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    self.connection = sqlite3.connect(str(path))
+    self.connection.executescript(SCHEMA)
+    (stored_version,) = self.connection.execute("PRAGMA user_version").fetchone()
+    if stored_version != payload_version:
+      with self.connection:
+        self.connection.execute("DELETE FROM issues")
+        self.connection.execute("DELETE FROM sync_state")
+        # PRAGMA does not take parameters; the version is always an int
+        self.connection.execute(f"PRAGMA user_version = {int(payload_version)}")
+
+  def __enter__(self) -> "IssueStore":
+    return self
+
+  def __exit__(self, *exc_info: Any) -> None:
+    self.close()
+
+  def close(self) -> None:
+    self.connection.close()
+
+  def sync_state(self, scope: str = ALL_ISSUES) -> Optional[SyncState]:
+    row = self.connection.execute(
+      "SELECT high_water, synced_from FROM sync_state WHERE scope = ?", (scope,)
+    ).fetchone()
+    if row is None:
+      return None
+    return SyncState(from_timestamp(row[0]), from_timestamp(row[1]))
+
+  def record_sync(
+      self, high_water: datetime, synced_from: datetime, scope: str = ALL_ISSUES
+  ) -> None:
+    """Advance a scope's marks once its fetched issues are stored"""
+    with self.connection:
+      self.connection.execute(
+        "INSERT OR REPLACE INTO sync_state (scope, high_water, synced_from) "
+        "VALUES (?, ?, ?)",
+        (scope, to_timestamp(high_water), to_timestamp(synced_from)),
+      )
+
+  def upsert(self, issues: Iterable[Dict]) -> int:
+    """Insert or replace issues, keeping whichever copy was updated last"""
+    rows = [
+      (
+        issue["id"],
+        to_timestamp(issue["createdAt"]),
+        to_timestamp(issue["updatedAt"]),
+        json.dumps(issue),
+      )
+      for issue in issues
+    ]
+    with self.connection:
+      self.connection.executemany(
+        "INSERT INTO issues (id, created_at, updated_at, payload) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT (id) DO UPDATE SET created_at = excluded.created_at, "
+        "updated_at = excluded.updated_at, payload = excluded.payload "
+        "WHERE excluded.updated_at >= issues.updated_at",
+        rows,
+      )
+    return len(rows)
+
+  def issue_ids_assigned_to(self, user_ids: Iterable[str]) -> List[str]:
+    """Ids of the stored issues whose stored assignee is one of user_ids"""
+    user_ids = list(user_ids)
+    if not user_ids:
+      return []
+    placeholders = ", ".join("?" * len(user_ids))
+    rows = self.connection.execute(
+      "SELECT id FROM issues "
+      f"WHERE json_extract(payload, '$.assignee.id') IN ({placeholders})",
+      user_ids,
+    )
+    return [issue_id for (issue_id,) in rows]
+
+  def issues_created_between(
+      self, start_date: Union[str, datetime], end_date: Union[str, datetime]
+  ) -> Iterator[Dict]:
+    """Stream the stored issues created within the window, oldest first"""
+    cursor = self.connection.execute(
+      "SELECT payload FROM issues WHERE created_at BETWEEN ? AND ? ORDER BY created_at",
+      (to_timestamp(start_date), to_timestamp(end_date)),
+    )
+    for (payload,) in cursor:
+      yield json.loads(payload)
@@ -0,0 +1,148 @@
+from typing import (
+  Any,
+  Dict,
+  Iterable,
+  List,
+  Mapping,
+  NamedTuple,
+  Optional,
+  Sequence,
+  Tuple,
+  Union,
+)
+
+import numpy as np
+import plotly.graph_objects as go
+
+HISTOGRAM_BINS = 20
+# Entities shown individually in per-user and per-repo charts
+TOP_N = 25
+OTHER = "Other"
+# Above this many points scatter traces are drawn with WebGL
+WEBGL_THRESHOLD = 1000
+
+
+class Bins(NamedTuple):
+  """Histogram counts with their bin edges (len(edges) == len(counts) + 1)"""
+
+  edges: np.ndarray
+  counts: np.ndarray
+
+  @property
+  def centers(self) -> np.ndarray:
+    centers: np.ndarray = (self.edges[:-1] + self.edges[1:]) / 2
+    return centers
+
+  @property
+  def widths(self) -> np.ndarray:
+    widths: np.ndarray = np.diff(self.edges)
+    return widths
+
+
+class Quantiles(NamedTuple):
+  """Box plot statistics, with Tukey fences clamped to the observed range"""
+
+  size: int
+  mean: float
+  lower_fence: float
+  q1: float
+  median: float
+  q3: float
+  upper_fence: float
+
+
+def as_array(values: Iterable[float]) -> np.ndarray:
+  """Finite values as a float array, whatever iterable they came in"""
+  array = np.fromiter(values, dtype="float64") if not isinstance(values, np.ndarray) else values
+  return array[np.isfinite(array)]
+
+
+def histogram(values: Iterable[float], bins: int = HISTOGRAM_BINS) -> Bins:
+  array = as_array(values)
+  if not array.size:
+    return Bins(np.zeros(1), np.zeros(0, dtype="int64"))
+  counts, edges = np.histogram(array, bins=bins)
+  return Bins(edges, counts)
+
+
+def quantiles(values: Iterable[float]) -> Quantiles:
+  array = as_array(values)
+  if not array.size:
+    return Quantiles(0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+  q1, median, q3 = np.percentile(array, [25, 50, 75])
+  spread = 1.5 * (q3 - q1)
+  # Fences sit on the most extreme points still inside 1.5 IQR, as a box plot draws them
+  inside = array[(array >= q1 - spread) & (array <= q3 + spread)]
+  return Quantiles(
+    size=int(array.size),
+    mean=float(array.mean()),
+    lower_fence=float(inside.min()),
+    q1=float(q1),
+    median=float(median),
+    q3=float(q3),
+    upper_fence=float(inside.max()),
+  )
+
+
+def top_n(
+    counts: Mapping[str, float], n: int = TOP_N, other: Optional[str] = OTHER
+) -> List[Tuple[str, float]]:
+  """The n largest entries, largest first, with the rest summed into one bucket.
+
+  Pass other=None to drop the rest instead.
+  """
+  ranked = sorted(counts.items(), key=lambda item: item[1], reverse=True)
+  top, rest = ranked[:n], ranked[n:]
+  if rest and other is not None:
+    top.append((other, sum(value for _, value in rest)))
+  return top
+
+
+def top_n_rows(
+    rows: Mapping[str, Mapping[str, float]],
+    rank_by: str,
+    n: int = TOP_N,
+    other: str = OTHER,
+) -> Dict[str, Dict[str, float]]:
+  """Like top_n for multi-metric rows: ranked on one metric, every metric summed"""
+  ranked = sorted(rows, key=lambda name: rows[name][rank_by], reverse=True)
+  top = {name: dict(rows[name]) for name in ranked[:n]}
+  rest = ranked[n:]
+  if rest:
+    top[other] = {
+      metric: sum(rows[name][metric] for name in rest) for metric in rows[rest[0]]
+    }
+  return top
+
+
+def histogram_trace(values: Iterable[float], name: str, color: str, bins: int = HISTOGRAM_BINS) -> go.Bar:
+  """A pre-binned histogram: only the bin counts reach the page"""
+  binned = histogram(values, bins)
+  return go.Bar(
+    x=np.round(binned.centers, 2),
+    y=binned.counts,
+    width=binned.widths,
+    name=name,
+    marker_color=color,
+  )
+
+
+def box_trace(values: Iterable[float], name: str, color: str) -> go.Box:
+  """A box plot from precomputed quantiles instead of every sample"""
+  summary = quantiles(values)
+  return go.Box(
+    name=name,
+    q1=[summary.q1],
+    median=[summary.median],
+    q3=[summary.q3],
+    lowerfence=[summary.lower_fence],
+    upperfence=[summary.upper_fence],
+    mean=[summary.mean],
+    marker_color=color,
+  )
+
+
+def scatter_trace(x: Sequence, y: Sequence, **kwargs: Any) -> Union[go.Scatter, go.Scattergl]:
+  """Scatter that switches to WebGL once there are too many points for SVG"""
+  trace = go.Scattergl if len(x) > WEBGL_THRESHOLD else go.Scatter
+  return trace(x=x, y=y, **kwargs)
@@ -0,0 +1,215 @@
+import gzip
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import List, NamedTuple
+
+import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.offline import get_plotlyjs, get_plotlyjs_version
+
+PLOTLYJS_MODES = ("inline", "asset", "cdn")
+CDN_URL = "https://cdn.plot.ly/plotly-{version}.min.js"
+
+
+class ReportSection(NamedTuple):
+  """One chart of the report with its heading and explanation"""
+
+  title: str
+  description: str
+  # The figure serialized by figure_spec
+  spec: str
+
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+  <head>
+    <meta charset="utf-8">
+    <title>Coderush Engineering Report</title>
+    <style>
+      body {{
+        font-family: Arial, sans-serif;
+        background-color: #f5f5f5;
+        max-width: 1200px;
+        margin: 0 auto;
+        padding: 20px;
+      }}
+      .header {{
+        text-align: center;
+        padding: 40px 0;
+        background: linear-gradient(135deg, #4F46E5, #7C3AED);
+        color: white;
+        border-radius: 8px;
+        margin-bottom: 40px;
+      }}
+      .header h1 {{
+        margin: 0;
+        font-size: 2.5em;
+      }}
+      .header p {{
+        margin: 10px 0 0;
+        opacity: 0.9;
+      }}
+      .nav {{
+        text-align: center;
+        margin-bottom: 30px;
+      }}
+      .nav a {{
+        color: #4F46E5;
+        margin: 0 15px;
+        font-weight: bold;
+      }}
+      .chart-container {{
+        background-color: white;
+        padding: 30px;
+        margin: 30px 0;
+        border-radius: 8px;
+        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+      }}
+      .chart {{
+        min-height: 450px;
+      }}
+      .chart-description {{
+        color: #4B5563;
+        margin: 20px 0;
+        line-height: 1.6;
+      }}
+      .section-title {{
+        color: #1F2937;
+        margin-top: 40px;
+        padding-bottom: 10px;
+        border-bottom: 2px solid #E5E7EB;
+      }}
+      .timestamp {{
+        text-align: center;
+        color: #6B7280;
+        margin-top: 40px;
+      }}
+    </style>
+    {plotlyjs}
+  </head>
+  <body>
+    <div class="header">
+      <h1>Coderush Engineering Report</h1>
+      <p>Comprehensive analysis of your engineering team's performance</p>
+    </div>
+{navigation}
+
+    <div class="charts">
+{sections}
+    </div>
+
+    <div class="timestamp">
+      Generated on {timestamp}
+    </div>
+    <script>{hydrate}</script>
+  </body>
+</html>
+"""
+
+SECTION_TEMPLATE = """
+      <h2 class="section-title">{title}</h2>
+      <div class="chart-container">
+        <div class="chart-description">
+          {description}
+        </div>
+        <div class="chart" id="chart-{index}"></div>
+        <script type="application/json" data-chart="chart-{index}">{spec}</script>
+      </div>
+"""
+
+# Charts are drawn from their JSON specs only when scrolled into view
+HYDRATE_SCRIPT = """
+(function () {
+  function draw(target) {
+    var spec = JSON.parse(document.querySelector('[data-chart="' + target.id + '"]').textContent);
+    Plotly.newPlot(target, spec.data, spec.layout, {responsive: true});
+  }
+  var charts = document.querySelectorAll(".chart");
+  if (!("IntersectionObserver" in window)) {
+    charts.forEach(draw);
+    return;
+  }
+  var observer = new IntersectionObserver(function (entries) {
+    entries.forEach(function (entry) {
+      if (entry.isIntersecting) {
+        observer.unobserve(entry.target);
+        draw(entry.target);
+      }
+    });
+  }, {rootMargin: "200px"});
+  charts.forEach(function (chart) { observer.observe(chart); });
+})();
+"""
+
+
+def figure_spec(figure: go.Figure, minify: bool = False) -> str:
+  """Serialize a figure to JSON that is safe to embed in a script tag"""
+  spec: str = pio.to_json(figure, validate=False, pretty=not minify)
+  # Keep "</script>" inside a string from closing the tag
+  return spec.replace("</", "<\\/")
+
+
+def plotlyjs_tag(mode: str, output_dir: Path) -> str:
+  """The single script tag that loads plotly.js for the whole report"""
+  version = get_plotlyjs_version()
+  if mode == "cdn":
+    return f'<script src="{CDN_URL.format(version=version)}"></script>'
+  if mode == "asset":
+    # Shared by every report in the directory; written once per plotly.js version
+    asset = output_dir / f"plotly-{version}.min.js"
+    if not asset.exists():
+      asset.write_text(get_plotlyjs(), encoding="utf-8")
+    return f'<script src="{asset.name}"></script>'
+  return f"<script>{get_plotlyjs()}</script>"
+
+
+def render_html(
+    sections: List[ReportSection],
+    plotlyjs: str,
+    minify: bool = False,
+    navigation: str = "",
+) -> str:
+  """Assemble the report page around the already serialized chart specs"""
+  body = "".join(
+    SECTION_TEMPLATE.format(
+      title=section.title,
+      description=section.description,
+      index=index,
+      spec=section.spec,
+    )
+    for index, section in enumerate(sections)
+  )
+  html = PAGE_TEMPLATE.format(
+    plotlyjs=plotlyjs,
+    navigation=navigation,
+    sections=body,
+    timestamp=datetime.now().strftime("%B %d, %Y at %I:%M %p"),
+    hydrate=HYDRATE_SCRIPT,
+  )
+  if minify:
+    # Collapse indentation between tags; specs are already compact JSON
+    html = re.sub(r">\s+<", "><", html)
+  return html
+
+
+def write_report(
+    sections: List[ReportSection],
+    report_file: Path,
+    plotlyjs: str = "inline",
+    minify: bool = False,
+    compress: bool = False,
+) -> Path:
+  """Write the report, plus a gzip-precompressed copy when asked to"""
+  html = render_html(sections, plotlyjs_tag(plotlyjs, report_file.parent), minify)
+  write_page(report_file, html, compress)
+  return report_file
+
+
+def write_page(path: Path, text: str, compress: bool = False) -> None:
+  """Write one file of the report, plus a gzip-precompressed copy when asked to"""
+  path.write_text(text, encoding="utf-8")
+  if compress:
+    with gzip.open(path.with_name(path.name + ".gz"), "wt", encoding="utf-8") as f:
+      f.write(text)
+
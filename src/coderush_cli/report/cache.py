@@ -0,0 +1,64 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+# Bump when chart builders change so fragments cached by older code are ignored
+CACHE_VERSION = 1
+# Fragments not used for this long are deleted
+MAX_AGE_SECONDS = 30 * 24 * 60 * 60
+
+
+def fingerprint(*parts: Any) -> str:
+  """Content hash of JSON-serializable parts, stable across runs and processes"""
+  payload = json.dumps(
+    [CACHE_VERSION, *parts], sort_keys=True, separators=(",", ":"), default=str
+  )
+  return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class FragmentCache:
+  """Rendered chart fragments on disk, keyed by the fingerprint of their inputs.
+
+  A fragment is the bytes of a serialized chart. An empty fragment records that
+  the chart had no data, so that too is answered without rebuilding.
+  """
+
+  def __init__(self, directory: Path):
+    self.directory = directory
+    self.directory.mkdir(parents=True, exist_ok=True)
+
+  def get(self, name: str, key: str) -> Optional[bytes]:
+    path = self._path(name, key)
+    try:
+      fragment = path.read_bytes()
+    except FileNotFoundError:
+      return None
+    # Mark the fragment as recently used so prune() keeps it
+    os.utime(path)
+    return fragment
+
+  def put(self, name: str, key: str, fragment: bytes) -> None:
+    path = self._path(name, key)
+    # Write then rename, so concurrent reports never read a partial fragment
+    partial = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    partial.write_bytes(fragment)
+    os.replace(partial, path)
+
+  def prune(self, max_age: float = MAX_AGE_SECONDS) -> int:
+    """Delete fragments that have not been used recently"""
+    cutoff = time.time() - max_age
+    removed = 0
+    for path in self.directory.glob("*.fragment"):
+      try:
+        if path.stat().st_mtime < cutoff:
+          path.unlink()
+          removed += 1
+      except FileNotFoundError:
+        continue
+    return removed
+
+  def _path(self, name: str, key: str) -> Path:
+    return self.directory / f"{name}-{key}.fragment"
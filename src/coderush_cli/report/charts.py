@@ -0,0 +1,602 @@
+import importlib.util
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import plotly
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from .aggregates import (
+  box_trace,
+  histogram_trace,
+  scatter_trace,
+  top_n,
+  top_n_rows,
+)
+from .assembler import ReportSection, figure_spec
+from .cache import FragmentCache, fingerprint
+from .model import ReportModel
+
+IMAGE_FORMATS = ("png", "svg", "pdf")
+# plotly renders images through kaleido, installed with the "images" extra
+IMAGE_EXPORT_HINT = (
+  "Exporting png, svg or pdf charts needs kaleido. "
+  "Install it with: pip install 'coderush-cli[images]'"
+)
+CHART_BACKGROUND = "#F3F4F6"
+
+# Heading and explanation shown above each chart
+SECTIONS = {
+  "overview": (
+    "Organization Overview",
+    """This chart provides a high-level view of your organization's GitHub activity,
+    showing the total number of repositories, active contributors, and PR metrics.
+    It helps identify the overall scale of your engineering operations.""",
+  ),
+  "merge_dist": (
+    "Time and Efficiency Metrics",
+    """The Time to Merge distribution shows how quickly PRs move through your review process.
+    A left-skewed distribution indicates efficient PR processing, while long tails might
+    suggest bottlenecks in your review process.""",
+  ),
+  "merge_by_repo": (
+    "Time to Merge by Repository",
+    """The spread of merge times in each of the busiest repositories. The box covers
+    the middle half of PRs, so a tall box or a high median points at a repository
+    whose reviews are slower or less predictable.""",
+  ),
+  "user_activity": (
+    "Team Activity Analysis",
+    """This visualization breaks down individual contributions across different metrics,
+    helping identify team members' strengths and participation patterns in the
+    development process.""",
+  ),
+  "repo_activity": (
+    "Repository Performance",
+    """Compare activity levels across different repositories to understand where most
+    development is happening and identify potential areas needing more attention
+    or support.""",
+  ),
+  "quality": (
+    "Code Quality Indicators",
+    """Track key quality metrics including hotfixes, reverts, and blocking reviews.
+    These indicators help identify potential areas for process improvement and
+    where additional code review attention might be needed.""",
+  ),
+  "review_dist": (
+    "Review Process Analysis",
+    """The PR Review Time Distribution shows how long PRs typically wait for review.
+    This helps identify if your review process is running smoothly or if there are
+    delays that need addressing.""",
+  ),
+  "collaboration": (
+    "Team Collaboration Patterns",
+    """Understand how your team collaborates through different types of reviews.
+    High cross-team review numbers indicate good knowledge sharing, while high
+    self-merges might suggest areas for process improvement.""",
+  ),
+  "bottlenecks": (
+    "Development Bottlenecks",
+    """Stale, long-running and blocked PRs, together with PRs that waited more than
+    two days for review, show where work is getting stuck.""",
+  ),
+  "velocity": (
+    "Team Velocity",
+    """The number of PRs merged each week shows the team's delivery pace over time
+    and makes slowdowns easy to spot.""",
+  ),
+  "reviewers": (
+    "Code Review Participation",
+    """How reviews are spread across team members. A few people carrying most of the
+    reviews can point to a review bottleneck or a knowledge silo.""",
+  ),
+  "pr_activity": (
+    "PR Activity by Developer",
+    """Created, merged and still-open PRs for each developer, showing how work flows
+    through each person's queue.""",
+  ),
+  "pr_metrics": (
+    "PR Metrics by Developer",
+    """Average PR size alongside average time to merge for each developer. Larger PRs
+    usually take longer to review and merge.""",
+  ),
+}
+
+
+def top_developer_counts(model: ReportModel) -> Dict[str, Dict]:
+  """PR counts of the most active developers, with the rest as "Other" """
+  return top_n_rows(
+    {
+      username: {metric: data[metric] for metric in ("Created", "Merged", "Open")}
+      for username, data in model.developer_rows.items()
+    },
+    "Created",
+  )
+
+
+def overview_chart(model: ReportModel) -> Optional[go.Figure]:
+  overview = go.Figure(
+    data=[
+      go.Bar(
+        x=list(model.org_stats.keys()),
+        y=list(model.org_stats.values()),
+        marker_color=["#6366F1", "#EC4899", "#10B981", "#F59E0B"],
+      )
+    ]
+  )
+  overview.update_layout(
+    title="Organization Overview",
+    yaxis_title="Count",
+    plot_bgcolor=CHART_BACKGROUND,
+    paper_bgcolor=CHART_BACKGROUND,
+  )
+  return overview
+
+
+def merge_dist_chart(model: ReportModel) -> Optional[go.Figure]:
+  if not model.time_to_merge:
+    return None
+
+  merge_dist = go.Figure(
+    data=[
+      histogram_trace(model.time_to_merge, "Time to Merge Distribution", "#EC4899")
+    ]
+  )
+  merge_dist.update_layout(
+    title="Time to Merge Distribution",
+    xaxis_title="Hours",
+    yaxis_title="Frequency",
+    bargap=0,
+    plot_bgcolor=CHART_BACKGROUND,
+    paper_bgcolor=CHART_BACKGROUND,
+  )
+  return merge_dist
+
+
+def merge_by_repo_chart(model: ReportModel) -> Optional[go.Figure]:
+  # Merge time spread of the busiest repositories, as precomputed boxes
+  busiest_repos = top_n(
+    {
+      repo_name: model.repo_rows[repo_name]["PRs Created"]
+      for repo_name in model.time_to_merge_by_repo
+    },
+    other=None,
+  )
+  if not busiest_repos:
+    return None
+
+  merge_by_repo = go.Figure(
+    data=[
+      box_trace(model.time_to_merge_by_repo[repo_name], repo_name, "#EC4899")
+      for repo_name, _ in busiest_repos
+    ]
+  )
+  merge_by_repo.update_layout(
+    title="Time to Merge by Repository",
+    yaxis_title="Hours",
+    showlegend=False,
+    plot_bgcolor=CHART_BACKGROUND,
+    paper_bgcolor=CHART_BACKGROUND,
+  )
+  return merge_by_repo
+
+
+def user_activity_chart(model: ReportModel) -> Optional[go.Figure]:
+  if not model.user_rows:
+    return None
+
+  user_data = top_n_rows(model.user_rows, "PRs Created")
+  user_activity = go.Figure()
+  for metric in ["PRs Created", "PRs Merged", "Reviews Given", "Comments Given"]:
+    user_activity.add_trace(
+      go.Bar(
+        name=metric,
+        x=list(user_data.keys()),
+        y=[user_data[user][metric] for user in user_data],
+      )
+    )
+
+  user_activity.update_layout(
+    title="User Activity",
+    barmode="group",
+    xaxis_title="Users",
+    yaxis_title="Count",
+    plot_bgcolor=CHART_BACKGROUND,
+    paper_bgcolor=CHART_BACKGROUND,
+  )
+  return user_activity
+
+
+def repo_activity_chart(model: ReportModel) -> Optional[go.Figure]:
+  if not model.repo_rows:
+    return None
+
+  repo_metrics = top_n_rows(model.repo_rows, "PRs Created")
+  repo_activity = go.Figure()
+  for metric in ["PRs Created", "PRs Merged", "Contributors", "Reviews"]:
+    repo_activity.add_trace(
+      go.Bar(
+        name=metric,
+        x=list(repo_metrics.keys()),
+        y=[repo_metrics[repo][metric] for repo in repo_metrics],
+      )
+    )
+
+  repo_activity.update_layout(
+    title="Repository Activity",
+    barmode="group",
+    xaxis_title="Repositories",
+    yaxis_title="Count",
+    plot_bgcolor=CHART_BACKGROUND,
+    paper_bgcolor=CHART_BACKGROUND,
+  )
+  return repo_activity
+
+
+def quality_chart(model: ReportModel) -> Optional[go.Figure]:
+  quality = go.Figure(
+    data=[
+      go.Bar(
+        x=list(model.code_quality.keys()),
+        y=list(model.code_quality.values()),
+        marker_color=["#EF4444", "#F59E0B", "#6366F1", "#EC4899"],
+      )
+    ]
+  )
+  quality.update_layout(
+    title="Code Quality Metrics",
+    yaxis_title="Count",
+    plot_bgcolor=CHART_BACKGROUND,
+    paper_bgcolor=CHART_BACKGROUND,
+  )
+  return quality
+
+
+def review_dist_chart(model: ReportModel) -> Optional[go.Figure]:
+  if not model.review_wait_times:
+    return None
+
+  review_dist = go.Figure(
+    data=[
+      histogram_trace(model.review_wait_times, "Review Time Distribution", "#8B5CF6")
+    ]
+  )
+  review_dist.update_layout(
+    title="PR Review Time Distribution",
+    xaxis_title="Hours",
+    yaxis_title="Frequency",
+    bargap=0,
+    plot_bgcolor=CHART_BACKGROUND,
+    paper_bgcolor=CHART_BACKGROUND,
+  )
+  return review_dist
+
+
+def collaboration_chart(model: ReportModel) -> Optional[go.Figure]:
+  if not model.collaboration:
+    return None
+
+  collaboration = go.Figure(
+    data=[
+      go.Bar(
+        x=list(model.collaboration.keys()),
+        y=list(model.collaboration.values()),
+        marker_color=["#3B82F6", "#EF4444", "#10B981", "#F59E0B"],
+      )
+    ]
+  )
+  collaboration.update_layout(
+    title="Team Collaboration Overview",
+    yaxis_title="Count",
+    plot_bgcolor=CHART_BACKGROUND,
+    paper_bgcolor=CHART_BACKGROUND,
+  )
+  return collaboration
+
+
+def bottlenecks_chart(model: ReportModel) -> Optional[go.Figure]:
+  bottlenecks = go.Figure(
+    data=[
+      go.Bar(
+        x=list(model.bottlenecks.keys()),
+        y=list(model.bottlenecks.values()),
+        marker_color="#EF4444",
+      )
+    ]
+  )
+  bottlenecks.update_layout(
+    title="Development Bottlenecks",
+    yaxis_title="Count",
+    plot_bgcolor=CHART_BACKGROUND,
+    paper_bgcolor=CHART_BACKGROUND,
+  )
+  return bottlenecks
+
+
+def velocity_chart(model: ReportModel) -> Optional[go.Figure]:
+  if not model.weekly_velocity:
+    return None
+
+  weeks = sorted(model.weekly_velocity.keys())
+  velocity = go.Figure(
+    data=[
+      scatter_trace(
+        weeks,
+        [model.weekly_velocity[week] for week in weeks],
+        mode="lines+markers",
+        line=dict(color="#10B981"),
+      )
+    ]
+  )
+  velocity.update_layout(
+    title="Team Velocity (PRs Merged per Week)",
+    xaxis_title="Week",
+    yaxis_title="PRs Merged",
+    plot_bgcolor=CHART_BACKGROUND,
+    paper_bgcolor=CHART_BACKGROUND,
+  )
+  return velocity
+
+
+def reviewers_chart(model: ReportModel) -> Optional[go.Figure]:
+  if not model.reviewers:
+    return None
+
+  top_reviewers = top_n(model.reviewers)
+  reviewers = go.Figure(
+    data=[
+      go.Bar(
+        x=[reviewer for reviewer, _ in top_reviewers],
+        y=[count for _, count in top_reviewers],
+        marker_color="#6366F1",
+      )
+    ]
+  )
+  reviewers.update_layout(
+    title="Code Review Participation by Team Member",
+    xaxis_title="Team Member",
+    yaxis_title="Reviews Performed",
+    plot_bgcolor=CHART_BACKGROUND,
+    paper_bgcolor=CHART_BACKGROUND,
+  )
+  return reviewers
+
+
+def pr_activity_chart(model: ReportModel) -> Optional[go.Figure]:
+  if not model.developer_rows:
+    return None
+
+  # PR Creation and Merge Rate, for the most active developers
+  pr_counts = top_developer_counts(model)
+  pr_activity = go.Figure()
+  for metric, name, color in (
+      ("Created", "Created PRs", "#3B82F6"),
+      ("Merged", "Merged PRs", "#10B981"),
+      ("Open", "Open PRs", "#F59E0B"),
+  ):
+    pr_activity.add_trace(
+      go.Bar(
+        name=name,
+        x=list(pr_counts.keys()),
+        y=[data[metric] for data in pr_counts.values()],
+        marker_color=color,
+      )
+    )
+
+  pr_activity.update_layout(
+    title="PR Activity by Developer",
+    barmode="group",
+    xaxis_title="Developer",
+    yaxis_title="Number of PRs",
+    plot_bgcolor=CHART_BACKGROUND,
+    paper_bgcolor=CHART_BACKGROUND,
+    showlegend=True,
+  )
+  return pr_activity
+
+
+def pr_metrics_chart(model: ReportModel) -> Optional[go.Figure]:
+  # Averages don't add up into an "Other" bucket, so only the top developers are shown
+  top_developers = {
+    username: model.developer_rows[username]
+    for username in top_developer_counts(model)
+    if username in model.developer_rows
+  }
+  # PR Size and Review Time (only if we have data)
+  if not any(
+      data["Avg Size"] > 0 or data["Avg Review Time"] > 0
+      for data in top_developers.values()
+  ):
+    return None
+
+  pr_metrics = go.Figure()
+  pr_metrics.add_trace(
+    go.Bar(
+      name="Avg PR Size (changes)",
+      x=list(top_developers.keys()),
+      y=[data["Avg Size"] for data in top_developers.values()],
+      marker_color="#8B5CF6",
+      yaxis="y",
+    )
+  )
+  pr_metrics.add_trace(
+    scatter_trace(
+      list(top_developers.keys()),
+      [data["Avg Review Time"] for data in top_developers.values()],
+      name="Avg Review Time (hours)",
+      marker_color="#EC4899",
+      yaxis="y2",
+    )
+  )
+
+  pr_metrics.update_layout(
+    title="PR Metrics by Developer",
+    xaxis_title="Developer",
+    yaxis=dict(
+      title=dict(text="Average PR Size", font=dict(color="#8B5CF6")),
+      tickfont=dict(color="#8B5CF6"),
+    ),
+    yaxis2=dict(
+      title=dict(text="Average Review Time (hours)", font=dict(color="#EC4899")),
+      tickfont=dict(color="#EC4899"),
+      overlaying="y",
+      side="right",
+    ),
+    plot_bgcolor=CHART_BACKGROUND,
+    paper_bgcolor=CHART_BACKGROUND,
+    showlegend=True,
+  )
+  return pr_metrics
+
+
+# Chart builders in report order; each one returns None when it has no data
+CHART_BUILDERS = {
+  "overview": overview_chart,
+  "merge_dist": merge_dist_chart,
+  "merge_by_repo": merge_by_repo_chart,
+  "user_activity": user_activity_chart,
+  "repo_activity": repo_activity_chart,
+  "quality": quality_chart,
+  "review_dist": review_dist_chart,
+  "collaboration": collaboration_chart,
+  "bottlenecks": bottlenecks_chart,
+  "velocity": velocity_chart,
+  "reviewers": reviewers_chart,
+  "pr_activity": pr_activity_chart,
+  "pr_metrics": pr_metrics_chart,
+}
+
+# The model fields each chart is built from; a chart is rebuilt only when these change
+CHART_INPUTS = {
+  "overview": ("org_stats",),
+  "merge_dist": ("time_to_merge",),
+  "merge_by_repo": ("time_to_merge_by_repo", "repo_rows"),
+  "user_activity": ("user_rows",),
+  "repo_activity": ("repo_rows",),
+  "quality": ("code_quality",),
+  "review_dist": ("review_wait_times",),
+  "collaboration": ("collaboration",),
+  "bottlenecks": ("bottlenecks",),
+  "velocity": ("weekly_velocity",),
+  "reviewers": ("reviewers",),
+  "pr_activity": ("developer_rows",),
+  "pr_metrics": ("developer_rows",),
+}
+
+
+class ImageExportError(RuntimeError):
+  """Raised when charts are exported as images without kaleido installed"""
+
+
+def image_export_available() -> bool:
+  return importlib.util.find_spec("kaleido") is not None
+
+
+# Report model of the current worker process, set once by the pool initializer
+_model: Optional[ReportModel] = None
+
+
+def _init_worker(model: Optional[ReportModel]) -> None:
+  global _model
+  _model = model
+
+
+def _render_chart(name: str, minify: bool, image_format: Optional[str]) -> bytes:
+  """Build one chart and serialize it, as a JSON spec or an image.
+
+  Returns empty bytes when the chart has no data.
+  """
+  if _model is None:
+    raise RuntimeError("Chart worker has no report model; start it through _init_worker")
+  figure = CHART_BUILDERS[name](_model)
+  if figure is None:
+    return b""
+  if image_format:
+    image: bytes = pio.to_image(figure, format=image_format, validate=False)
+    return image
+  return figure_spec(figure, minify).encode("utf-8")
+
+
+def chart_key(model: ReportModel, name: str, minify: bool, image_format: Optional[str]) -> str:
+  """Fingerprint of everything a chart's fragment depends on"""
+  inputs = {field: getattr(model, field) for field in CHART_INPUTS[name]}
+  return fingerprint(name, inputs, minify, image_format, plotly.__version__)
+
+
+def render_charts(
+    model: ReportModel,
+    minify: bool = False,
+    image_format: Optional[str] = None,
+    image_prefix: Optional[Path] = None,
+    jobs: Optional[int] = None,
+    cache_dir: Optional[Path] = None,
+) -> Tuple[List[ReportSection], List[Path]]:
+  """Build and serialize every chart, one process per core.
+
+  The report model reaches each worker once, through the pool initializer,
+  rather than with every task. Results come back in CHART_BUILDERS order
+  whatever order they finish in. With jobs=1 everything runs in this process.
+
+  With a cache_dir, charts whose inputs are unchanged since an earlier run are
+  taken from the cache, and the pool is only started for the rest.
+  """
+  if image_format:
+    if not image_export_available():
+      raise ImageExportError(IMAGE_EXPORT_HINT)
+    if image_prefix is None:
+      raise ValueError("image_prefix is required to export charts as images")
+
+  names = list(CHART_BUILDERS)
+  cache = FragmentCache(cache_dir) if cache_dir else None
+  keys, fragments = {}, {}
+  if cache:
+    for name in names:
+      keys[name] = chart_key(model, name, minify, image_format)
+      fragment = cache.get(name, keys[name])
+      if fragment is not None:
+        fragments[name] = fragment
+
+  pending = [name for name in names if name not in fragments]
+  jobs = min(jobs or os.cpu_count() or 1, len(pending))
+  if jobs == 1:
+    _init_worker(model)
+    try:
+      built = [_render_chart(name, minify, image_format) for name in pending]
+    finally:
+      _init_worker(None)
+  elif pending:
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_worker, initargs=(model,)
+    ) as pool:
+      built = list(
+        pool.map(
+          _render_chart,
+          pending,
+          [minify] * len(pending),
+          [image_format] * len(pending),
+        )
+      )
+  else:
+    built = []
+
+  for name, fragment in zip(pending, built):
+    fragments[name] = fragment
+    if cache:
+      cache.put(name, keys[name], fragment)
+  if cache:
+    cache.prune()
+
+  sections, images = [], []
+  for name in names:
+    fragment = fragments[name]
+    if not fragment:
+      continue
+    if image_format and image_prefix is not None:
+      image_file = image_prefix.with_name(f"{image_prefix.name}_{name}.{image_format}")
+      image_file.write_bytes(fragment)
+      images.append(image_file)
+    else:
+      sections.append(ReportSection(*SECTIONS[name], fragment.decode("utf-8")))
+  return sections, images
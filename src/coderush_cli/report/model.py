@@ -0,0 +1,141 @@
+import statistics
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List
+
+# Review waits longer than this count as a bottleneck
+HIGH_REVIEW_WAIT_HOURS = 48
+
+COLLABORATION_FIELDS = (
+  ("Cross-team Reviews", "cross_team_reviews"),
+  ("Self-merges", "self_merges"),
+  ("Team Reviews", "team_reviews"),
+  ("External Reviews", "external_reviews"),
+)
+
+
+@dataclass
+class ReportModel:
+  """Chart-ready aggregates of the GitHub analysis data, built in one pass"""
+
+  org_stats: Dict[str, int] = field(default_factory=dict)
+  # Distributions, in hours
+  time_to_merge: List[float] = field(default_factory=list)
+  time_to_merge_by_repo: Dict[str, List[float]] = field(default_factory=dict)
+  review_wait_times: List[float] = field(default_factory=list)
+  # Rows keyed by username or repository name
+  user_rows: Dict[str, Dict[str, int]] = field(default_factory=dict)
+  repo_rows: Dict[str, Dict[str, int]] = field(default_factory=dict)
+  developer_rows: Dict[str, Dict[str, float]] = field(default_factory=dict)
+  code_quality: Dict[str, int] = field(default_factory=dict)
+  collaboration: Dict[str, int] = field(default_factory=dict)
+  bottlenecks: Dict[str, int] = field(default_factory=dict)
+  # Reviews performed per reviewer
+  reviewers: Dict[str, int] = field(default_factory=dict)
+  # PRs per "%Y-%W" week
+  weekly_velocity: Dict[str, int] = field(default_factory=dict)
+
+  @classmethod
+  def from_github_data(cls, github_data: Dict) -> "ReportModel":
+    model = cls()
+    repositories = github_data.get("repositories", {})
+    users = github_data.get("users", {})
+
+    contributors = set()
+    total_prs = merged_prs = 0
+    hotfixes = reverts = 0
+    stale = long_running = blocked = high_wait = 0
+
+    for repo_name, repo in repositories.items():
+      review_metrics = repo.get("review_metrics", {})
+      time_metrics = repo.get("time_metrics", {})
+      code_metrics = repo.get("code_metrics", {})
+      bottleneck_metrics = repo.get("bottleneck_metrics", {})
+      collaboration_metrics = repo.get("collaboration_metrics", {})
+      repo_contributors = repo.get("contributors", [])
+
+      contributors.update(repo_contributors)
+      total_prs += repo.get("prs_created", 0)
+      merged_prs += repo.get("prs_merged", 0)
+      model.repo_rows[repo_name] = {
+        "PRs Created": repo.get("prs_created", 0),
+        "PRs Merged": repo.get("prs_merged", 0),
+        "Contributors": len(repo_contributors),
+        "Reviews": review_metrics.get("reviews_performed", 0),
+      }
+
+      time_to_merge = time_metrics.get("time_to_merge", [])
+      model.time_to_merge.extend(time_to_merge)
+      if time_to_merge:
+        model.time_to_merge_by_repo[repo_name] = time_to_merge
+      model.review_wait_times.extend(review_metrics.get("review_wait_times", []))
+
+      for lead_time in time_metrics.get("lead_times", []):
+        week = datetime.fromtimestamp(lead_time * 3600).strftime(
+          "%Y-%W"
+        )  # Convert hours to timestamp
+        model.weekly_velocity[week] = model.weekly_velocity.get(week, 0) + 1
+
+      for reviewer_data in review_metrics.get("reviewers_per_pr", {}).values():
+        for reviewer in reviewer_data:
+          model.reviewers[reviewer] = model.reviewers.get(reviewer, 0) + 1
+
+      for label, key in COLLABORATION_FIELDS:
+        model.collaboration[label] = model.collaboration.get(
+          label, 0
+        ) + collaboration_metrics.get(key, 0)
+
+      hotfixes += code_metrics.get("hotfixes", 0)
+      reverts += code_metrics.get("reverts", 0)
+      stale += bottleneck_metrics.get("stale_prs", 0)
+      long_running += bottleneck_metrics.get("long_running_prs", 0)
+      blocked += bottleneck_metrics.get("blocked_prs", 0)
+      high_wait += sum(
+        1
+        for wait in bottleneck_metrics.get("review_wait_times", [])
+        if wait > HIGH_REVIEW_WAIT_HOURS
+      )
+
+    blocking_reviews = 0
+    for username, user in users.items():
+      review_metrics = user.get("review_metrics", {})
+      blocking_reviews += review_metrics.get("blocking_reviews_given", 0)
+      model.user_rows[user.get("username", "")] = {
+        "PRs Created": user.get("prs_created", 0),
+        "PRs Merged": user.get("prs_merged", 0),
+        "Reviews Given": review_metrics.get("reviews_performed", 0),
+        "Comments Given": review_metrics.get("review_comments_given", 0),
+      }
+
+      if username.endswith("[bot]"):  # Skip bot users
+        continue
+      time_to_merge = user.get("time_metrics", {}).get("time_to_merge", [])
+      model.developer_rows[username] = {
+        "Created": user.get("prs_created", 0),
+        "Merged": user.get("prs_merged", 0),
+        "Open": user.get("prs_created", 0) - user.get("prs_merged", 0),
+        "Avg Size": round(user.get("code_metrics", {}).get("avg_pr_size", 0), 2),
+        "Avg Review Time": (
+          round(statistics.mean(time_to_merge)) if time_to_merge else 0
+        ),
+      }
+
+    model.org_stats = {
+      "Total Repositories": len(repositories),
+      "Active Contributors": len(contributors),
+      "Total PRs": total_prs,
+      "Merged PRs": merged_prs,
+    }
+    model.code_quality = {
+      "Hotfixes": hotfixes,
+      "Reverts": reverts,
+      "Blocking Reviews": blocking_reviews,
+      "Stale PRs": stale,
+    }
+    model.bottlenecks = {
+      "Stale PRs": stale,
+      "Long-running PRs": long_running,
+      "Blocked PRs": blocked,
+      "High Review Wait Time": high_wait,
+    }
+    return model
@@ -0,0 +1,292 @@
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+from .aggregates import histogram, quantiles
+from .assembler import ReportSection, plotlyjs_tag, render_html, write_page
+from .model import ReportModel
+
+# Entities listed per page of the repository and user listings
+PAGE_SIZE = 50
+
+NAVIGATION = """
+    <div class="nav">
+      <a href="index.html">Overview</a>
+      <a href="entities.html?kind=repos">Repositories</a>
+      <a href="entities.html?kind=users">Users</a>
+    </div>
+"""
+
+# Pages open from file://, where fetch() is blocked, so data files are scripts
+# that hand their payload to coderushData() and are loaded with a script tag
+LOADER_SCRIPT = """
+var params = new URLSearchParams(window.location.search);
+var kind = params.get("kind") === "users" ? "users" : "repos";
+var content = document.getElementById("content");
+
+function loadData(path, render) {
+  window.coderushData = render;
+  var script = document.createElement("script");
+  script.src = path;
+  script.onerror = function () { content.textContent = "No data found for this page."; };
+  document.head.appendChild(script);
+}
+
+function element(tag, text, className) {
+  var node = document.createElement(tag);
+  if (text !== undefined) node.textContent = text;
+  if (className) node.className = className;
+  return node;
+}
+
+function link(text, href) {
+  var node = element("a", text);
+  node.href = href;
+  return node;
+}
+"""
+
+LISTING_SCRIPT = """
+var page = Math.max(parseInt(params.get("page") || "1", 10) || 1, 1);
+document.getElementById("title").textContent = kind === "users" ? "Users" : "Repositories";
+
+loadData("data/" + kind + "/page-" + page + ".js", function (data) {
+  var table = element("table");
+  var header = element("tr");
+  header.appendChild(element("th", "Name"));
+  data.columns.forEach(function (column) { header.appendChild(element("th", column)); });
+  table.appendChild(header);
+  data.entities.forEach(function (entity) {
+    var row = element("tr");
+    var name = element("td");
+    name.appendChild(link(entity.name, "entity.html?kind=" + kind + "&id=" + entity.id));
+    row.appendChild(name);
+    data.columns.forEach(function (column) { row.appendChild(element("td", entity.row[column])); });
+    table.appendChild(row);
+  });
+  content.appendChild(table);
+
+  var pager = element("div", undefined, "pager");
+  if (page > 1) pager.appendChild(link("Previous", "entities.html?kind=" + kind + "&page=" + (page - 1)));
+  pager.appendChild(element("span", "Page " + page + " of " + data.pages));
+  if (page < data.pages) pager.appendChild(link("Next", "entities.html?kind=" + kind + "&page=" + (page + 1)));
+  content.appendChild(pager);
+});
+"""
+
+ENTITY_SCRIPT = """
+var id = params.get("id") || "";
+if (!/^[A-Za-z0-9_-]+$/.test(id)) {
+  content.textContent = "Unknown " + kind + " page.";
+} else {
+  loadData("data/" + kind + "/" + id + ".js", function (data) {
+    document.getElementById("title").textContent = data.name;
+    var table = element("table");
+    Object.keys(data.stats).forEach(function (key) {
+      var row = element("tr");
+      row.appendChild(element("th", key));
+      row.appendChild(element("td", data.stats[key]));
+      table.appendChild(row);
+    });
+    content.appendChild(table);
+
+    if (data.time_to_merge) {
+      var chart = element("div", undefined, "chart");
+      content.appendChild(chart);
+      Plotly.newPlot(chart, [{
+        type: "bar",
+        x: data.time_to_merge.hours,
+        y: data.time_to_merge.counts,
+        width: data.time_to_merge.widths,
+        marker: {color: "#EC4899"},
+      }], {
+        title: {text: "Time to Merge Distribution"},
+        xaxis: {title: {text: "Hours"}},
+        yaxis: {title: {text: "Frequency"}},
+        bargap: 0,
+        plot_bgcolor: "#F3F4F6",
+        paper_bgcolor: "#F3F4F6",
+      }, {responsive: true});
+    }
+  });
+}
+"""
+
+DETAIL_TEMPLATE = """<!DOCTYPE html>
+<html>
+  <head>
+    <meta charset="utf-8">
+    <title>Coderush Engineering Report</title>
+    <style>
+      body {{
+        font-family: Arial, sans-serif;
+        background-color: #f5f5f5;
+        max-width: 1200px;
+        margin: 0 auto;
+        padding: 20px;
+      }}
+      .header {{
+        text-align: center;
+        padding: 30px 0;
+        background: linear-gradient(135deg, #4F46E5, #7C3AED);
+        color: white;
+        border-radius: 8px;
+        margin-bottom: 30px;
+      }}
+      .nav, .pager {{
+        text-align: center;
+        margin: 20px 0;
+      }}
+      .nav a, .pager a, .pager span {{
+        color: #4F46E5;
+        margin: 0 15px;
+        font-weight: bold;
+      }}
+      #content {{
+        background-color: white;
+        padding: 30px;
+        border-radius: 8px;
+        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+      }}
+      table {{
+        width: 100%;
+        border-collapse: collapse;
+      }}
+      th, td {{
+        text-align: left;
+        padding: 8px;
+        border-bottom: 1px solid #E5E7EB;
+      }}
+      .chart {{
+        min-height: 450px;
+        margin-top: 30px;
+      }}
+    </style>
+    {plotlyjs}
+  </head>
+  <body>
+    <div class="header"><h1 id="title"></h1></div>
+{navigation}
+    <div id="content"></div>
+    <script>{loader}{script}</script>
+  </body>
+</html>
+"""
+
+
+def entity_id(name: str) -> str:
+  """A file-name-safe id for a repository or user name, unique per name"""
+  slug = re.sub(r"[^A-Za-z0-9_-]+", "-", name).strip("-")[:40]
+  digest = hashlib.sha1(name.encode("utf-8")).hexdigest()[:8]
+  return f"{slug}-{digest}" if slug else digest
+
+
+def repo_entities(model: ReportModel) -> Iterator[Tuple[str, Dict, Dict]]:
+  """(name, listing row, detail data) for every repository"""
+  for name, row in model.repo_rows.items():
+    stats: Dict[str, float] = dict(row)
+    detail: Dict[str, Any] = {"name": name, "stats": stats, "time_to_merge": None}
+    times = model.time_to_merge_by_repo.get(name)
+    if times:
+      summary = quantiles(times)
+      stats.update({
+        "Median Time to Merge (hours)": round(summary.median, 1),
+        "75th Percentile Time to Merge (hours)": round(summary.q3, 1),
+      })
+      binned = histogram(times)
+      detail["time_to_merge"] = {
+        "hours": [round(hour, 2) for hour in binned.centers.tolist()],
+        "widths": binned.widths.tolist(),
+        "counts": binned.counts.tolist(),
+      }
+    yield name, row, detail
+
+
+def user_entities(model: ReportModel) -> Iterator[Tuple[str, Dict, Dict]]:
+  """(name, listing row, detail data) for every user"""
+  for name, row in model.user_rows.items():
+    stats: Dict[str, float] = dict(row)
+    stats["PRs Reviewed"] = model.reviewers.get(name, 0)
+    developer = model.developer_rows.get(name)
+    if developer:
+      stats["Open PRs"] = developer["Open"]
+      stats["Avg PR Size"] = developer["Avg Size"]
+      stats["Avg Time to Merge (hours)"] = developer["Avg Review Time"]
+    yield name, row, {"name": name, "stats": stats, "time_to_merge": None}
+
+
+def write_data_file(path: Path, payload: Dict, compress: bool = False) -> None:
+  write_page(path, f"coderushData({json.dumps(payload, separators=(',', ':'))});\n", compress)
+
+
+def write_entity_data(
+    data_dir: Path,
+    entities: Iterator[Tuple[str, Dict, Dict]],
+    page_size: int = PAGE_SIZE,
+    compress: bool = False,
+) -> int:
+  """One data file per entity plus listing pages of page_size entities each"""
+  data_dir.mkdir(parents=True, exist_ok=True)
+  listing: List[Dict] = []
+  columns: List[str] = []
+  for name, row, detail in entities:
+    current_id = entity_id(name)
+    write_data_file(data_dir / f"{current_id}.js", detail, compress)
+    listing.append({"id": current_id, "name": name, "row": row})
+    columns = columns or list(row)
+
+  # Busiest first, so the first page holds the entities most people look for
+  listing.sort(key=lambda entity: (-entity["row"].get("PRs Created", 0), entity["name"]))
+  pages = max(1, -(-len(listing) // page_size))
+  for page in range(pages):
+    write_data_file(
+      data_dir / f"page-{page + 1}.js",
+      {
+        "columns": columns,
+        "pages": pages,
+        "entities": listing[page * page_size:(page + 1) * page_size],
+      },
+      compress,
+    )
+  return len(listing)
+
+
+def write_multipage_report(
+    model: ReportModel,
+    sections: List[ReportSection],
+    report_dir: Path,
+    plotlyjs: str = "asset",
+    minify: bool = False,
+    compress: bool = False,
+    page_size: int = PAGE_SIZE,
+) -> Path:
+  """Write an index page of org-wide charts with paged repository and user drill-downs.
+
+  Every page stays small whatever the size of the org: charts on the index are
+  capped to the top entities, listings are paged, and each detail page loads
+  only its own entity's data file. With compress, every page and data file
+  gets a gzip-precompressed copy next to it.
+  """
+  report_dir.mkdir(parents=True, exist_ok=True)
+  # Several pages need plotly.js, so share one copy rather than inlining it in each
+  script = plotlyjs_tag("asset" if plotlyjs == "inline" else plotlyjs, report_dir)
+
+  index = report_dir / "index.html"
+  write_page(index, render_html(sections, script, minify, NAVIGATION), compress)
+  for page, page_script in (("entities.html", LISTING_SCRIPT), ("entity.html", ENTITY_SCRIPT)):
+    write_page(
+      report_dir / page,
+      DETAIL_TEMPLATE.format(
+        plotlyjs=script,
+        navigation=NAVIGATION,
+        loader=LOADER_SCRIPT,
+        script=page_script,
+      ),
+      compress,
+    )
+
+  write_entity_data(report_dir / "data" / "repos", repo_entities(model), page_size, compress)
+  write_entity_data(report_dir / "data" / "users", user_entities(model), page_size, compress)
+  return index
@@ -0,0 +1,164 @@
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+RUNS_DIR = Path.home() / ".coderush" / "runs"
+INDEX_FILE = "index.json"
+INDEX_VERSION = 1
+# Runs kept by default when pruning after a save
+DEFAULT_KEEP_RUNS = 50
+
+
+class RunInfo(NamedTuple):
+  """Index entry of one saved analysis run"""
+
+  run_id: str
+  file_name: str
+  created_at: str
+  start_date: Optional[str]
+  end_date: Optional[str]
+  filters: Dict[str, str]
+  size: int
+  content_hash: str
+
+
+class RunStore:
+  """Saved analysis runs, one file each, found through a small index.
+
+  The index maps run ids to their metadata and remembers the latest run, so
+  finding a run never lists or stats the run files themselves. The store is
+  format-agnostic: it keeps whatever bytes it is given.
+  """
+
+  def __init__(self, directory: Path = RUNS_DIR):
+    self.directory = directory
+    self.index_path = directory / INDEX_FILE
+
+  def save(
+      self,
+      content: bytes,
+      suffix: str = ".json",
+      start_date: Optional[datetime] = None,
+      end_date: Optional[datetime] = None,
+      filters: Optional[Dict[str, str]] = None,
+      keep: Optional[int] = DEFAULT_KEEP_RUNS,
+  ) -> RunInfo:
+    """Store a run and make it the latest one"""
+    self.directory.mkdir(parents=True, exist_ok=True)
+    created_at = datetime.now(timezone.utc)
+    content_hash = hashlib.sha256(content).hexdigest()
+    run_id = f"{created_at.strftime('%Y%m%dT%H%M%S%fZ')}-{content_hash[:8]}"
+    run = RunInfo(
+      run_id=run_id,
+      file_name=f"{run_id}{suffix}",
+      created_at=created_at.isoformat(),
+      start_date=start_date.isoformat() if start_date else None,
+      end_date=end_date.isoformat() if end_date else None,
+      filters={key: value for key, value in (filters or {}).items() if value},
+      size=len(content),
+      content_hash=content_hash,
+    )
+    _write_atomic(self.directory / run.file_name, content)
+
+    index = self._read_index()
+    index["runs"][run_id] = run._asdict()
+    index["latest"] = run_id
+    self._write_index(index)
+    if keep:
+      self.prune(keep=keep)
+    return run
+
+  def latest(self) -> Optional[RunInfo]:
+    index = self._read_index()
+    return self._run(index, index.get("latest"))
+
+  def get(self, run_id: str) -> Optional[RunInfo]:
+    return self._run(self._read_index(), run_id)
+
+  def runs(self) -> List[RunInfo]:
+    """Every indexed run, newest first"""
+    return self._sorted_runs(self._read_index())
+
+  def path(self, run: RunInfo) -> Path:
+    return self.directory / run.file_name
+
+  def read(self, run_id: Optional[str] = None) -> Optional[bytes]:
+    """Content of a run, the latest one by default"""
+    run = self.get(run_id) if run_id else self.latest()
+    if run is None:
+      return None
+    try:
+      return self.path(run).read_bytes()
+    except FileNotFoundError:
+      return None
+
+  def prune(
+      self, keep: Optional[int] = DEFAULT_KEEP_RUNS, max_age: Optional[timedelta] = None
+  ) -> List[RunInfo]:
+    """Delete all but the newest keep runs and any run older than max_age"""
+    index = self._read_index()
+    runs = self._sorted_runs(index)
+    cutoff = (
+      (datetime.now(timezone.utc) - max_age).isoformat() if max_age is not None else None
+    )
+    removed = [
+      run
+      for position, run in enumerate(runs)
+      if (keep is not None and position >= keep)
+      or (cutoff is not None and run.created_at < cutoff)
+    ]
+    if not removed:
+      return []
+
+    for run in removed:
+      index["runs"].pop(run.run_id, None)
+      try:
+        self.path(run).unlink()
+      except FileNotFoundError:
+        pass
+    if index.get("latest") not in index["runs"]:
+      remaining = self._sorted_runs(index)
+      index["latest"] = remaining[0].run_id if remaining else None
+    self._write_index(index)
+    return removed
+
+  @staticmethod
+  def _sorted_runs(index: Dict) -> List[RunInfo]:
+    return sorted(
+      (RunInfo(**entry) for entry in index["runs"].values()),
+      key=lambda run: run.created_at,
+      reverse=True,
+    )
+
+  @staticmethod
+  def _run(index: Dict, run_id: Optional[str]) -> Optional[RunInfo]:
+    entry = index["runs"].get(run_id) if run_id else None
+    return RunInfo(**entry) if entry else None
+
+  def _read_index(self) -> Dict:
+    try:
+      index: Dict = json.loads(self.index_path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+      return {"version": INDEX_VERSION, "latest": None, "runs": {}}
+    if index.get("version") != INDEX_VERSION:
+      return {"version": INDEX_VERSION, "latest": None, "runs": {}}
+    return index
+
+  def _write_index(self, index: Dict) -> None:
+    _write_atomic(self.index_path, json.dumps(index, indent=2).encode("utf-8"))
+
+
+def _write_atomic(path: Path, content: bytes) -> None:
+  """Write to a temporary file beside path, then rename it into place"""
+  descriptor, partial = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+  try:
+    with os.fdopen(descriptor, "wb") as f:
+      f.write(content)
+    os.replace(partial, path)
+  except BaseException:
+    os.unlink(partial)
+    raise
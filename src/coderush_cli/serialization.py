@@ -0,0 +1,252 @@
+import dataclasses
+import json
+from datetime import date, datetime
+from typing import (
+  Any,
+  Callable,
+  Dict,
+  Iterable,
+  Iterator,
+  Optional,
+  Type,
+  Union,
+  get_args,
+  get_origin,
+  get_type_hints,
+)
+
+# Field types whose values are stored as they are, without a conversion call
+SCALAR_TYPES = (bool, int, float, str)
+SCALAR_TYPES_SET = frozenset(SCALAR_TYPES)
+# Item types a container can be copied with, rather than converted item by item
+_PLAIN_TYPES = frozenset(SCALAR_TYPES + (type(None),))
+
+# Converter per concrete value type, filled in as new types are seen
+_converters: Dict[type, Callable[[Any], Any]] = {}
+# Compiled serializer per dataclass
+_serializers: Dict[type, Callable[[Any], Dict]] = {}
+# Dataclasses whose serializer is being generated, so recursive fields don't loop
+_compiling: set = set()
+
+
+def to_jsonable(value: Any) -> Any:
+  """Convert a metrics value into plain dicts, lists and scalars.
+
+  The conversion is looked up by exact type, so each type is classified once
+  rather than probed with isinstance/hasattr on every value.
+  """
+  converter = _converters.get(type(value))
+  if converter is None:
+    converter = _converters[type(value)] = _converter_for(type(value))
+  return converter(value)
+
+
+def serializer_for(cls: Type) -> Callable[[Any], Dict]:
+  """The compiled serializer of a dataclass, generated on first use.
+
+  The serializer is a function generated from the class's fields and their
+  annotations that reads each public field directly: scalars and lists of
+  scalars are kept, sets and dicts of scalars are copied in one call, and
+  everything else goes through to_jsonable.
+  """
+  serializer = _serializers.get(cls)
+  if serializer is None:
+    serializer = _serializers[cls] = _compile_serializer(cls)
+  return serializer
+
+
+def dataclass_to_dict(self: Any) -> Dict:
+  """A to_dict method serializing a dataclass through its compiled serializer"""
+  return serializer_for(type(self))(self)
+
+
+def _compiled(cls: type) -> bool:
+  """Whether cls is serialized by its compiled serializer, not its own to_dict"""
+  return (
+    dataclasses.is_dataclass(cls)
+    and getattr(cls, "to_dict", dataclass_to_dict) is dataclass_to_dict
+  )
+
+
+def metrics_to_dict(value: Any) -> Any:
+  """Plain data of a metrics value, as MetricsJSONEncoder would write it.
+
+  Unlike to_dict, dataclasses always give every public field, even where
+  their to_dict picks a summary.
+  """
+  if dataclasses.is_dataclass(value) and not isinstance(value, type):
+    return serializer_for(type(value))(value)
+  return to_jsonable(value)
+
+
+def register_converter(value_type: type, converter: Callable[[Any], Any]) -> None:
+  """Convert values of exactly value_type with converter from now on"""
+  _converters[value_type] = converter
+
+
+class MetricsJSONEncoder(json.JSONEncoder):
+  """Encoder writing metrics values through their compiled serializers.
+
+  The whole value is converted to plain data in one pass before the json
+  module sees it, so default is only reached for values no converter knows.
+  """
+
+  def iterencode(self, o: Any, _one_shot: bool = False) -> Iterator[str]:
+    return super().iterencode(metrics_to_dict(o), _one_shot)
+
+  def default(self, obj: Any) -> Any:
+    try:
+      return super().default(obj)
+    except Exception:
+      return str(obj)
+
+
+def _identity(value: Any) -> Any:
+  return value
+
+
+def _isoformat(value: date) -> str:
+  return value.isoformat()
+
+
+def _convert_dict(value: Dict) -> Dict:
+  # Most metrics dicts hold only numbers; the type scan runs at C speed
+  if _PLAIN_TYPES.issuperset(map(type, value.values())):
+    return dict(value)
+  return {key: to_jsonable(item) for key, item in value.items()}
+
+
+def _convert_sequence(value: Iterable[Any]) -> list:
+  if _PLAIN_TYPES.issuperset(map(type, value)):
+    return list(value)
+  return [to_jsonable(item) for item in value]
+
+
+def _convert_callable(value: Any) -> None:
+  return None
+
+
+def _convert_attributes(value: Any) -> Any:
+  try:
+    attributes = vars(value)
+  except TypeError:
+    # Instances of classes with __slots__ or of builtins like object()
+    return value
+  return {
+    key: to_jsonable(item)
+    for key, item in attributes.items()
+    if not key.startswith("_") and not callable(item)
+  }
+
+
+def _converter_for(value_type: type) -> Callable[[Any], Any]:
+  if value_type in SCALAR_TYPES or value_type is type(None):
+    return _identity
+  if issubclass(value_type, (datetime, date)):
+    return _isoformat
+  # defaultdicts and other dict subclasses become plain dicts
+  if issubclass(value_type, dict):
+    return _convert_dict
+  if issubclass(value_type, (list, tuple, set, frozenset)):
+    return _convert_sequence
+  if _compiled(value_type):
+    return serializer_for(value_type)
+  if hasattr(value_type, "to_dict"):
+    to_dict: Callable[[Any], Any] = value_type.to_dict
+    return to_dict
+  if any("__call__" in vars(base) for base in value_type.__mro__[:-1]):
+    # Functions, methods and other callables aren't data
+    return _convert_callable
+  if hasattr(value_type, "__dict__"):
+    return _convert_attributes
+  return _identity
+
+
+def _field_expression(
+    hint: Any, expression: str, namespace: Dict[str, Any], depth: int = 0
+) -> str:
+  """Source that converts expression, a value annotated with hint.
+
+  Sets and dicts of scalars are copied with a single list() or dict() call,
+  nested containers become comprehensions and nested dataclasses call their
+  own serializer; anything the annotation doesn't pin down goes through
+  convert at run time.
+  """
+  if hint in SCALAR_TYPES:
+    return expression
+  if isinstance(hint, type) and _compiled(hint) and hint not in _compiling:
+    # Guarded by an exact type check, since subclasses have fields of their own
+    name = f"{hint.__name__}_{len(namespace)}"
+    namespace[name], namespace[f"serialize_{name}"] = hint, serializer_for(hint)
+    value = f"value{depth}"
+    return (
+      f"(serialize_{name}({value}) if type({value} := {expression}) is {name}"
+      f" else convert({value}))"
+    )
+  origin, args = get_origin(hint), get_args(hint)
+  if origin is Union:
+    if len(args) == 2 and type(None) in args:
+      inner = args[0] if args[1] is type(None) else args[1]
+      if inner in SCALAR_TYPES:
+        return expression
+    return f"convert({expression})"
+  if origin in (list, set, frozenset) and args:
+    if args[0] in SCALAR_TYPES:
+      # Lists of scalars are already plain data, as to_dict always returned them
+      return expression if origin is list else f"list({expression})"
+    copy = _copy_function(args[0])
+    if copy is not None:
+      return f"list(map({copy}, {expression}))"
+    item = f"item{depth}"
+    converted = _field_expression(args[0], item, namespace, depth + 1)
+    return f"[{converted} for {item} in {expression}]"
+  if origin is dict and len(args) == 2 and args[0] in SCALAR_TYPES:
+    if args[1] in SCALAR_TYPES:
+      return f"dict({expression})"
+    copy = _copy_function(args[1])
+    if copy is not None:
+      # Keys and converted values are paired at C speed, without a comprehension
+      return f"dict(zip({expression}, map({copy}, {expression}.values())))"
+    key, value = f"key{depth}", f"value{depth}"
+    converted = _field_expression(args[1], value, namespace, depth + 1)
+    return f"{{{key}: {converted} for {key}, {value} in {expression}.items()}}"
+  return f"convert({expression})"
+
+
+def _copy_function(hint: Any) -> Optional[str]:
+  """The builtin that converts a container of scalars annotated with hint, if any"""
+  origin, args = get_origin(hint), get_args(hint)
+  if origin in (list, set, frozenset) and args and args[0] in SCALAR_TYPES:
+    return "list"
+  if origin is dict and len(args) == 2 and SCALAR_TYPES_SET.issuperset(args):
+    return "dict"
+  return None
+
+
+def _compile_serializer(cls: Type) -> Callable[[Any], Dict]:
+  try:
+    hints = get_type_hints(cls)
+  except Exception:
+    # Unresolvable annotations only cost the fast paths
+    hints = {}
+
+  namespace: Dict[str, Any] = {"convert": to_jsonable}
+  items = []
+  _compiling.add(cls)
+  try:
+    for field in dataclasses.fields(cls):
+      if field.name.startswith("_"):
+        continue
+      hint = hints.get(field.name)
+      expression = _field_expression(hint, f"obj.{field.name}", namespace)
+      items.append(f"{field.name!r}: {expression}")
+  finally:
+    _compiling.discard(cls)
+
+  source = (
+    f"def serialize_{cls.__name__}(obj, convert=convert):\n"
+    f"  return {{{', '.join(items)}}}\n"
+  )
+  exec(compile(source, f"<serializer {cls.__qualname__}>", "exec"), namespace)
+  serializer: Callable[[Any], Dict] = namespace[f"serialize_{cls.__name__}"]
+  return serializer
@@ -0,0 +1,218 @@
+import io
+import mmap
+import struct
+import zlib
+from collections.abc import Mapping
+from pathlib import Path
+from typing import (
+  Any,
+  BinaryIO,
+  Callable,
+  Dict,
+  Iterator,
+  NamedTuple,
+  Optional,
+  Tuple,
+  Union,
+)
+
+import msgpack
+
+SNAPSHOT_SUFFIX = ".crs"
+MAGIC = b"CRSNAP"
+SCHEMA_VERSION = 1
+# Each frame: path length, payload length, then the path and the deflated payload
+FRAME_HEADER = struct.Struct("<HQ")
+# Keys in a frame path are joined with the ASCII unit separator, which never
+# appears in repository, user or section names
+PATH_SEPARATOR = "\x1f"
+# Favour speed; msgpack is already much smaller than pretty-printed JSON
+COMPRESS_LEVEL = 1
+# What frames are read from: the bytes of a snapshot or a memory map of its file
+SnapshotBuffer = Union[bytes, mmap.mmap]
+# Paths stored as one frame per child, so each child can be decoded on its own
+SPLIT_PATHS = frozenset({
+  (),
+  ("metrics",),
+  ("metrics", "github"),
+  ("metrics", "github", "repositories"),
+  ("metrics", "github", "users"),
+})
+
+
+class SnapshotError(ValueError):
+  """Raised for files that are not snapshots or use an unknown schema"""
+
+
+def frames(
+    value: Any,
+    default: Optional[Callable[[Any], Any]] = None,
+    path: Tuple[str, ...] = (),
+) -> Iterator[Tuple[Tuple[str, ...], Any]]:
+  """The (path, value) pairs a snapshot of data is made of"""
+  if path in SPLIT_PATHS:
+    if not isinstance(value, dict) and hasattr(value, "to_dict") and default:
+      # Metrics objects are split too, through their dict form
+      value = default(value)
+    if isinstance(value, dict) and value:
+      for key, child in value.items():
+        yield from frames(child, default, path + (str(key),))
+      return
+  yield path, value
+
+
+def write_snapshot(
+    f: BinaryIO, data: Dict, default: Optional[Callable[[Any], Any]] = None
+) -> None:
+  """Write data as a snapshot in one pass.
+
+  default converts values msgpack can't pack natively (datetimes, sets,
+  dataclasses...), like the default of a json.JSONEncoder.
+  """
+  packer = msgpack.Packer(default=default, datetime=False)
+  f.write(MAGIC)
+  f.write(bytes([SCHEMA_VERSION]))
+  for path, value in frames(data, default):
+    encoded_path = PATH_SEPARATOR.join(path).encode("utf-8")
+    payload = zlib.compress(packer.pack(value), COMPRESS_LEVEL)
+    f.write(FRAME_HEADER.pack(len(encoded_path), len(payload)))
+    f.write(encoded_path)
+    f.write(payload)
+
+
+def dumps_snapshot(data: Dict, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+  buffer = io.BytesIO()
+  write_snapshot(buffer, data, default)
+  return buffer.getvalue()
+
+
+def read_header(f: BinaryIO) -> int:
+  """Check the magic bytes and return the schema version"""
+  header = f.read(len(MAGIC) + 1)
+  if len(header) < len(MAGIC) + 1 or header[: len(MAGIC)] != MAGIC:
+    raise SnapshotError("Not a coderush snapshot")
+  version = header[-1]
+  if version > SCHEMA_VERSION:
+    raise SnapshotError(f"Snapshot schema version {version} is newer than supported")
+  return version
+
+
+def iter_frames(f: BinaryIO) -> Iterator[Tuple[Tuple[str, ...], Any]]:
+  """Stream (path, value) pairs, decoding one frame at a time"""
+  read_header(f)
+  while True:
+    header = f.read(FRAME_HEADER.size)
+    if not header:
+      return
+    if len(header) < FRAME_HEADER.size:
+      raise SnapshotError("Truncated snapshot frame header")
+    path_length, payload_length = FRAME_HEADER.unpack(header)
+    path = f.read(path_length).decode("utf-8").split(PATH_SEPARATOR)
+    payload = f.read(payload_length)
+    if len(payload) < payload_length:
+      raise SnapshotError("Truncated snapshot frame")
+    yield tuple(path), unpack_payload(payload)
+
+
+class Frame(NamedTuple):
+  """Where a frame's payload sits in the snapshot"""
+
+  offset: int
+  length: int
+
+
+def scan_frames(buffer: SnapshotBuffer) -> Dict:
+  """Tree of frame locations keyed by path, read from frame headers alone"""
+  read_header(io.BytesIO(buffer[: len(MAGIC) + 1]))
+  tree: Dict = {}
+  position, end = len(MAGIC) + 1, len(buffer)
+  while position < end:
+    if position + FRAME_HEADER.size > end:
+      raise SnapshotError("Truncated snapshot frame header")
+    path_length, payload_length = FRAME_HEADER.unpack_from(buffer, position)
+    position += FRAME_HEADER.size
+    path = bytes(buffer[position:position + path_length]).decode("utf-8")
+    position += path_length
+    if position + payload_length > end:
+      raise SnapshotError("Truncated snapshot frame")
+
+    *parents, key = path.split(PATH_SEPARATOR)
+    node = tree
+    for parent in parents:
+      node = node.setdefault(parent, {})
+    node[key] = Frame(position, payload_length)
+    position += payload_length
+  return tree
+
+
+class LazyAnalysis(Mapping):
+  """Read-only mapping over a snapshot that decodes frames on first access.
+
+  Opening only walks the frame headers; a section such as
+  analysis["metrics"]["github"]["repositories"]["org/api"] decodes just its
+  own frame. Sections stored as several frames come back as LazyAnalysis
+  views themselves.
+  """
+
+  def __init__(
+      self, buffer: SnapshotBuffer, tree: Dict, cache: Optional[Dict[int, Any]] = None
+  ):
+    self._buffer = buffer
+    self._tree = tree
+    self._cache = {} if cache is None else cache
+
+  def __getitem__(self, key: str) -> Any:
+    entry = self._tree[key]
+    if isinstance(entry, Frame):
+      if entry.offset not in self._cache:
+        payload = self._buffer[entry.offset:entry.offset + entry.length]
+        self._cache[entry.offset] = unpack_payload(payload)
+      return self._cache[entry.offset]
+    return LazyAnalysis(self._buffer, entry, self._cache)
+
+  def __iter__(self) -> Iterator[str]:
+    return iter(self._tree)
+
+  def __len__(self) -> int:
+    return len(self._tree)
+
+  def __repr__(self) -> str:
+    # Shown as the data it stands for, e.g. when formatted into a prompt
+    return repr(self.to_dict())
+
+  def to_dict(self) -> Dict:
+    """Decode every frame below this view into plain dicts"""
+    return {
+      key: value.to_dict() if isinstance(value, LazyAnalysis) else value
+      for key, value in self.items()
+    }
+
+
+def open_snapshot(path: Path) -> LazyAnalysis:
+  """Memory-map a snapshot file and index its frames without decoding them"""
+  with open(path, "rb") as f:
+    buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+  return LazyAnalysis(buffer, scan_frames(buffer))
+
+
+def unpack_payload(payload: bytes) -> Any:
+  try:
+    packed = zlib.decompress(payload)
+  except zlib.error as e:
+    raise SnapshotError(f"Corrupt snapshot frame: {e}") from e
+  return msgpack.unpackb(packed, raw=False, strict_map_key=False)
+
+
+def read_snapshot(f: BinaryIO) -> Dict:
+  """Rebuild the full data of a snapshot"""
+  data: Dict = {}
+  for path, value in iter_frames(f):
+    parent = data
+    for key in path[:-1]:
+      parent = parent.setdefault(key, {})
+    parent[path[-1]] = value
+  return data
+
+
+def loads_snapshot(content: bytes) -> Dict:
+  return read_snapshot(io.BytesIO(content))
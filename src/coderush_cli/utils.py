@@ -1,111 +1,111 @@
 import json
-import os
-import tempfile
-from collections import defaultdict
-from datetime import date, datetime, timezone
+from collections.abc import Mapping
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Any, Iterator
 
 import pandas as pd
 from rich.console import Console
 
+from .run_store import RunStore
+from .serialization import register_converter, to_jsonable
+from .snapshot import SNAPSHOT_SUFFIX, dumps_snapshot, open_snapshot
+
 console = Console()
 
+# Formats a run can be saved in; JSON is an explicit export for other tools
+SAVE_FORMATS = ("snapshot", "json")
+
 # Define config file location
 CONFIG_DIR = Path.home() / ".coderush"
 CONFIG_FILE = CONFIG_DIR / "config.json"
 
 
+register_converter(pd.DataFrame, lambda frame: frame.to_dict(orient="records"))
+register_converter(pd.Series, lambda series: series.to_dict())
+
+
 class CoderushJSONEncoder(json.JSONEncoder):
+  def iterencode(self, o: Any, _one_shot: bool = False) -> Iterator[str]:
+    # Convert everything up front, through the compiled metrics serializers
+    return super().iterencode(to_jsonable(o), _one_shot)
+
   def default(self, obj):
-    if isinstance(obj, datetime):
-      return obj.isoformat()
-    if isinstance(obj, set):
-      return list(obj)  # Convert sets to lists for JSON serialization
-    if isinstance(obj, defaultdict):
-      return dict(obj)  # Convert defaultdict to regular dict
-    if isinstance(obj, (datetime, date)):
-      return obj.isoformat()
     if isinstance(obj, pd.DataFrame):
       return obj.to_dict(orient="records")
     if isinstance(obj, pd.Series):
       return obj.to_dict()
-    if hasattr(obj, "to_dict"):
-      return obj.to_dict()
+    # Datetimes, sets, defaultdicts and metrics objects
+    converted = to_jsonable(obj)
+    if converted is not obj:
+      return converted
     return super().default(obj)
 
 
-def save_analysis_data(metrics_data, analysis_result):
-  """Save metrics and analysis data to a temporary file"""
-  # Convert any defaultdict to regular dict before serialization
-  metrics_data = json.loads(json.dumps(metrics_data, cls=CoderushJSONEncoder))
-
+def save_analysis_data(
+    metrics_data,
+    analysis_result,
+    start_date=None,
+    end_date=None,
+    filters=None,
+    save_format="snapshot",
+):
+  """Save metrics and analysis data as a new run in the run store"""
   data = {
     "metrics": metrics_data,
     "analysis": analysis_result,
     "timestamp": datetime.now(timezone.utc).isoformat(),
   }
+  if save_format == "json":
+    content = json.dumps(data, indent=2, cls=CoderushJSONEncoder).encode("utf-8")
+    suffix = ".json"
+  else:
+    content = dumps_snapshot(data, default=CoderushJSONEncoder().default)
+    suffix = SNAPSHOT_SUFFIX
 
-  temp_file = tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False)
-
-  with temp_file:
-    json.dump(data, temp_file, indent=2, cls=CoderushJSONEncoder)
-
-  return temp_file.name
+  store = RunStore()
+  run = store.save(content, suffix, start_date, end_date, filters)
+  return store.path(run)
 
 
-def get_latest_analysis():
-  """Get the most recent analysis data"""
+def get_latest_analysis(run_id=None):
+  """Get the most recent analysis data, or the data of a specific run"""
   try:
-    # Get the temp directory
-    temp_dir = tempfile.gettempdir()
-
-    # Find all JSON files in temp directory that match our pattern
-    analysis_files = [f for f in os.listdir(temp_dir) if f.endswith(".json")]
+    store = RunStore()
+    run = store.get(run_id) if run_id else store.latest()
+    if run is None:
+      if run_id:
+        console.print(f"[yellow]No analysis run found with id {run_id}.[/]")
+      else:
+        console.print(
+          "[yellow]No previous analysis found. Please run 'analyze' first.[/]"
+        )
+      return None
 
-    if not analysis_files:
+    try:
+      if run.file_name.endswith(SNAPSHOT_SUFFIX):
+        # Sections are decoded only when a command reads them
+        data = open_snapshot(store.path(run))
+      else:
+        data = json.loads(store.path(run).read_bytes())
+    except FileNotFoundError:
       console.print(
-        "[yellow]No previous analysis found. Please run 'analyze' first.[/]"
+        "[yellow]Analysis run file is missing. Please run 'analyze' again.[/]"
       )
       return None
+    except ValueError as e:
+      console.print(f"[red]Error reading analysis file: {str(e)}[/]")
+      console.print("[yellow]Please run 'analyze' again to generate new data.[/]")
+      return None
 
-    # Get the most recent file
-    latest_file = max(
-      [os.path.join(temp_dir, f) for f in analysis_files], key=os.path.getmtime
-    )
-
-    # Read and validate JSON content
-    with open(latest_file, "r") as f:
-      try:
-        content = f.read()
-        # Try to parse the JSON
-        data = json.loads(content)
-
-        # Validate expected structure
-        if not isinstance(data, dict) or "metrics" not in data:
-          console.print(
-            "[yellow]Invalid analysis file format. Please run 'analyze' again.[/]"
-          )
-          return None
-
-        return data
-      except json.JSONDecodeError as e:
-        console.print(f"[red]Error reading analysis file: {str(e)}[/]")
-        console.print(
-          "[yellow]Please run 'analyze' again to generate new data.[/]"
-        )
-
-        # Optionally, remove the corrupted file
-        try:
-          os.remove(latest_file)
-        except OSError:
-          pass
+    # Validate expected structure
+    if not isinstance(data, Mapping) or "metrics" not in data:
+      console.print(
+        "[yellow]Invalid analysis file format. Please run 'analyze' again.[/]"
+      )
+      return None
 
-        return None
-      except Exception as e:
-        console.print(
-          f"[red]Unexpected error reading analysis file: {str(e)}[/]"
-        )
-        return None
+    return data
 
   except Exception as e:
     console.print(f"[red]Error accessing analysis data: {str(e)}[/]")
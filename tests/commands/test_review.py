@@ -0,0 +1,69 @@
+import importlib
+import threading
+from concurrent.futures import Future
+from io import StringIO
+
+import pytest
+
+pytest.importorskip("rich_click")
+pytest.importorskip("anthropic")
+
+from rich.console import Console  # noqa: E402
+
+# The commands package re-exports the click command under the module's name
+review = importlib.import_module("coderush_cli.commands.review")
+
+
+@pytest.fixture
+def output(monkeypatch):
+  buffer = StringIO()
+  monkeypatch.setattr(review, "console", Console(file=buffer, width=200))
+  return buffer
+
+
+def settle(source, func, timeout):
+  """Run a collector in the background and settle it the way review does"""
+  future = review.run_in_background(func)
+  try:
+    future.result(timeout=timeout)
+  except Exception:
+    pass
+  return review.collect_result(source, future)
+
+
+def test_timed_out_collector_is_reported_as_a_timeout(monkeypatch, output):
+  """Test that a collector past its deadline reports a timeout, not a missing app."""
+  monkeypatch.setitem(review.COLLECTOR_TIMEOUTS, "github", 5 * 60)
+  release = threading.Event()
+
+  result = settle("github", release.wait, timeout=0.05)
+  review.render_section("github", result, "organization")
+  release.set()
+
+  assert result.metrics is None
+  assert "GitHub metrics timed out after 5 minutes" in output.getvalue()
+  assert "not installed" not in output.getvalue()
+
+
+def test_failed_collector_reports_its_error(output):
+  """Test that a collector that raised reports the exception, not a missing app."""
+
+  def fail():
+    raise RuntimeError("rate limited")
+
+  result = settle("github", fail, timeout=1)
+  review.render_section("github", result, "organization")
+
+  assert result.metrics is None
+  assert "Failed to fetch GitHub metrics: rate limited" in output.getvalue()
+  assert "not installed" not in output.getvalue()
+
+
+def test_missing_app_is_reported_when_the_collector_returns_none(output):
+  """Test that only a collector returning None means the GitHub App is missing."""
+  future: Future = Future()
+  future.set_result(None)
+
+  review.render_section("github", review.collect_result("github", future), "organization")
+
+  assert "GitHub App not installed" in output.getvalue()
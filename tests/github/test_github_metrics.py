@@ -1,4 +1,8 @@
-from coderush_cli.github.models.metrics import OrganizationMetrics
+from datetime import datetime
+from types import SimpleNamespace
+
+from coderush_cli.github.models.metrics import CollaborationMetrics, OrganizationMetrics
+from coderush_cli.github.models.records import ReviewRecord
 
 
 def test_github_metrics_initialization():
@@ -9,3 +13,42 @@ def test_github_metrics_initialization():
   assert metrics.repositories == {}
   assert metrics.teams == {}
   assert metrics.users == {}
+
+
+def test_review_classification_by_team_membership():
+  """Test that reviews are split into team, cross-team and external reviews."""
+  pr = SimpleNamespace(number=1, author="alice")
+  metrics = CollaborationMetrics()
+
+  def review(reviewer):
+    return ReviewRecord(reviewer=reviewer, state="APPROVED", submitted_at=1, has_body=False)
+
+  author_teams = frozenset({"web", "platform"})
+  metrics.update_from_review(review("bob"), pr, author_teams, frozenset({"platform"}))
+  metrics.update_from_review(review("carol"), pr, author_teams, frozenset({"data"}))
+  metrics.update_from_review(review("dave"), pr, author_teams, frozenset())
+  metrics.update_from_review(review("alice"), pr, author_teams, author_teams)
+
+  assert metrics.team_reviews == 1
+  assert metrics.cross_team_reviews == 1
+  assert metrics.external_reviews == 1
+  assert metrics.self_merges == 0
+
+
+def test_finalize_derives_rates_after_aggregation():
+  """Test that rates are derived once from the accumulated counters."""
+  metrics = OrganizationMetrics(name="test")
+  repo = metrics.get_or_create_repository("api")
+  for scope in (metrics, repo):
+    scope.prs_created = 4
+    scope.prs_merged_to_main = 14
+    scope.collaboration_metrics.team_reviews = 3
+    scope.collaboration_metrics.external_reviews = 3
+    scope.code_metrics.changes_per_pr = [10, 30]
+
+  metrics.finalize(datetime(2024, 3, 1), datetime(2024, 3, 8))
+
+  for scope in (metrics, repo):
+    assert scope.time_metrics.deployment_frequency == 2
+    assert scope.collaboration_metrics.review_participation_rate == 1.5
+    assert scope.code_metrics.avg_pr_size == 20
@@ -0,0 +1,58 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from coderush_cli.github.models.metrics import CodeMetrics, ReviewMetrics
+from coderush_cli.github.models.records import PullRequestRecord, ReviewRecord
+
+
+def make_pull(**overrides):
+  pull = SimpleNamespace(
+    number=7,
+    title="Hotfix: revert flaky cache",
+    user=SimpleNamespace(login="alice"),
+    created_at=datetime(2024, 3, 4, 9, 0, tzinfo=timezone.utc),
+    merged_at=datetime(2024, 3, 4, 11, 0, tzinfo=timezone.utc),
+    merged_by=SimpleNamespace(login="bob"),
+    base=SimpleNamespace(ref="main"),
+    head=SimpleNamespace(ref="fix-cache"),
+    additions=10,
+    deletions=5,
+    changed_files=3,
+    commits=2,
+    labels=[SimpleNamespace(name="Bug")],
+  )
+  for key, value in overrides.items():
+    setattr(pull, key, value)
+  return pull
+
+
+def test_pull_request_record_keeps_epoch_timestamps_and_lowercase_labels():
+  """Test that a record holds only plain values extracted from the PR."""
+  record = PullRequestRecord.from_pull(make_pull())
+
+  assert record.author == "alice"
+  assert record.merged_by == "bob"
+  assert record.merged_at - record.created_at == 2 * 3600
+  assert record.labels == ("bug",)
+  assert record.merged
+
+
+def test_metrics_consume_records():
+  """Test that code and review metrics update from records alone."""
+  pr = PullRequestRecord.from_pull(make_pull())
+  review = ReviewRecord(
+    reviewer="bob", state="CHANGES_REQUESTED", submitted_at=pr.created_at + 1800,
+    has_body=True,
+  )
+  code_metrics = CodeMetrics()
+  review_metrics = ReviewMetrics()
+
+  code_metrics.update_from_pr(pr)
+  review_metrics.update_from_review(review, pr)
+
+  assert code_metrics.files_changed == [3]
+  assert code_metrics.commits_count == [2]
+  assert code_metrics.reverts == 1
+  assert code_metrics.hotfixes == 1
+  assert review_metrics.blocking_reviews_given == 1
+  assert review_metrics.review_wait_times == [0.5]
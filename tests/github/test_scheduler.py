@@ -0,0 +1,66 @@
+import gc
+import weakref
+
+from coderush_cli.github.scheduler import TaskScheduler
+
+
+def test_dependent_task_runs_after_nested_submissions():
+  """Test that a task only runs once every task it depends on has finished."""
+  results = []
+
+  with TaskScheduler(max_workers=2) as scheduler:
+    def fan_out(count):
+      leaves = [scheduler.submit(lambda i=i: i * 2) for i in range(count)]
+      scheduler.submit(
+        lambda: results.append(sum(leaf.result for leaf in leaves)),
+        depends_on=leaves,
+      )
+
+    for count in range(10):
+      scheduler.submit(fan_out, count)
+    scheduler.join()
+
+  assert sorted(results) == sorted(sum(range(count)) * 2 for count in range(10))
+
+
+def test_failed_dependency_skips_dependents():
+  """Test that dependents of a failed task are skipped and inherit its error."""
+  ran = []
+
+  def fail():
+    raise ValueError("boom")
+
+  with TaskScheduler(max_workers=2) as scheduler:
+    failing = scheduler.submit(fail)
+    dependent = scheduler.submit(lambda: ran.append(True), depends_on=[failing])
+    scheduler.join()
+
+  assert ran == []
+  assert isinstance(dependent.error, ValueError)
+
+
+def test_completed_tasks_release_their_arguments():
+  """Test that a finished task, failed or not, holds no references to its inputs."""
+
+  class Payload:
+    pass
+
+  def fail(payload, extra=None):
+    raise ValueError("boom")
+
+  payloads = [Payload() for _ in range(4)]
+  refs = [weakref.ref(payload) for payload in payloads]
+  with TaskScheduler(max_workers=2) as scheduler:
+    tasks = [
+      scheduler.submit(len, [payloads[0]]),
+      scheduler.submit(lambda payload, extra=None: 1, payloads[1], extra=payloads[2]),
+      scheduler.submit(fail, payloads[3]),
+    ]
+    scheduler.join()
+  del payloads
+  gc.collect()
+
+  assert [task.result for task in tasks] == [1, 1, None]
+  assert isinstance(tasks[2].error, ValueError)
+  assert all(task.args == () and task.kwargs == {} for task in tasks)
+  assert [ref() for ref in refs] == [None] * 4
@@ -0,0 +1,57 @@
+import random
+from datetime import date, datetime, timedelta, timezone
+
+from coderush_cli.linear.business_calendar import BusinessCalendar
+
+
+def reference_work_hours(start, end, holidays=()):
+  """Hour-by-hour walk over the 9:00-17:00 weekday window."""
+  total = timedelta()
+  day = start.replace(hour=0, minute=0, second=0, microsecond=0)
+  while day < end:
+    if day.weekday() < 5 and day.date() not in holidays:
+      opens, closes = day.replace(hour=9), day.replace(hour=17)
+      overlap = min(closes, end) - max(opens, start)
+      if overlap > timedelta():
+        total += overlap
+    day += timedelta(days=1)
+  return total.total_seconds() / 3600
+
+
+def test_work_hours_matches_day_by_day_walk():
+  """Test that the closed form agrees with walking every day."""
+  holidays = [date(2024, 3, 29), date(2024, 4, 1), date(2024, 4, 6)]
+  calendar = BusinessCalendar(holidays=holidays)
+  rng = random.Random(7)
+  origin = datetime(2024, 3, 1, tzinfo=timezone.utc)
+
+  for _ in range(500):
+    start = origin + timedelta(minutes=rng.randrange(60 * 24 * 60))
+    end = start + timedelta(minutes=rng.randrange(60 * 24 * 40))
+    assert abs(
+      calendar.work_hours(start, end) - reference_work_hours(start, end, holidays)
+    ) < 1e-9
+
+
+def test_first_day_counts_from_actual_start():
+  """Test that an issue started mid-afternoon only gets the remaining hours."""
+  calendar = BusinessCalendar()
+  start = datetime(2024, 3, 4, 15, 30, tzinfo=timezone.utc)  # Monday
+  end = datetime(2024, 3, 5, 10, 0, tzinfo=timezone.utc)
+
+  assert calendar.work_hours(start, end) == 2.5
+
+
+def test_days_and_time_zones():
+  """Test working-day counts, holidays and per-team time zones."""
+  calendar = BusinessCalendar(holidays=[date(2024, 3, 6)])
+  monday = datetime(2024, 3, 4, 12, tzinfo=timezone.utc)
+
+  assert calendar.working_days(monday, monday + timedelta(days=13)) == 9
+  assert calendar.work_points(monday, monday + timedelta(days=7)) == 4
+
+  # 23:00 UTC on Sunday is 8:00 on Monday in Tokyo
+  tokyo = BusinessCalendar("Asia/Tokyo")
+  sunday_night = datetime(2024, 3, 3, 23, tzinfo=timezone.utc)
+  assert tokyo.work_hours(sunday_night, sunday_night + timedelta(hours=3)) == 2
+  assert calendar.work_hours(sunday_night, sunday_night + timedelta(hours=3)) == 0
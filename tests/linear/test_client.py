@@ -0,0 +1,126 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("rich")
+
+from coderush_cli.linear import client as client_module  # noqa: E402
+from coderush_cli.linear.client import (  # noqa: E402
+  COMPLEXITY_RESERVE,
+  MAX_PAGE_SIZE,
+  MIN_PAGE_SIZE,
+  REQUEST_RESERVE,
+  LinearAPIError,
+  LinearClient,
+)
+
+RATELIMITED = {"errors": [{"message": "Rate limited", "extensions": {"code": "RATELIMITED"}}]}
+
+
+class FakeResponse:
+  def __init__(self, payload, headers=None):
+    self.payload = payload
+    self.headers = headers or {}
+
+  def json(self):
+    return self.payload
+
+
+class FakeSession:
+  """Transport that replays canned responses and records each request"""
+
+  def __init__(self, responses):
+    self.responses = list(responses)
+    self.requests = []
+
+  def post(self, url, json, headers, timeout):
+    self.requests.append(json)
+    return self.responses.pop(0)
+
+
+def page(nodes, has_next=False):
+  return {"data": {"issues": {
+    "nodes": nodes,
+    "pageInfo": {"hasNextPage": has_next, "endCursor": "cursor" if has_next else None},
+  }}}
+
+
+def test_page_size_follows_remaining_complexity():
+  """Test that pages shrink with the complexity budget, within the size limits."""
+  client = LinearClient(api_key="key", session=FakeSession([]))
+  assert client.page_size(5) == MAX_PAGE_SIZE
+
+  client.complexity_remaining = COMPLEXITY_RESERVE + 1_000
+  assert client.page_size(5) == 200
+  client.complexity_remaining = COMPLEXITY_RESERVE
+  assert client.page_size(5) == MIN_PAGE_SIZE
+
+
+def test_paginate_sizes_pages_from_reported_complexity():
+  """Test that the next page uses the per-node cost reported by the last one."""
+  reset = str(int((time.time() + 3600) * 1000))
+  session = FakeSession([
+    FakeResponse(page([{"id": "1"}], has_next=True), {
+      "X-Complexity": "2500",
+      "X-RateLimit-Complexity-Remaining": "4000",
+      "X-RateLimit-Complexity-Reset": reset,
+    }),
+    FakeResponse(page([{"id": "2"}])),
+  ])
+  client = LinearClient(api_key="key", session=session)
+
+  pages = list(client.paginate("query", {}, "issues", node_complexity=5))
+
+  assert pages == [[{"id": "1"}], [{"id": "2"}]]
+  assert [request["variables"]["first"] for request in session.requests] == [250, 200]
+  assert session.requests[1]["variables"]["after"] == "cursor"
+  # The second page reserved its expected cost from the reported budget
+  assert client.complexity_remaining == 4000 - 200 * 10
+
+
+def test_rate_limited_queries_are_retried_with_backoff(monkeypatch):
+  """Test that RATELIMITED errors back off and retry, and other errors raise."""
+  delays = []
+  monkeypatch.setattr(client_module.time, "sleep", delays.append)
+  monkeypatch.setattr(client_module.random, "uniform", lambda low, high: 0)
+  session = FakeSession([
+    FakeResponse(RATELIMITED),
+    FakeResponse(RATELIMITED),
+    FakeResponse({"data": {"viewer": {"id": "me"}}}),
+    FakeResponse({"errors": [{"message": "Bad query"}]}),
+  ])
+  client = LinearClient(api_key="key", session=session)
+
+  assert client.query("query") == {"viewer": {"id": "me"}}
+  assert delays == [1, 2]
+
+  with pytest.raises(LinearAPIError) as error:
+    client.query("query")
+  assert not error.value.rate_limited
+  assert delays == [1, 2]
+
+
+def test_requests_wait_for_budget_before_sending():
+  """Test that a drained request budget holds queries until it is replenished."""
+  session = FakeSession([FakeResponse({"data": {"viewer": {"id": "me"}}})])
+  client = LinearClient(api_key="key", session=session)
+  client.requests_remaining = REQUEST_RESERVE
+  client.requests_reset = time.time() + 60
+
+  worker = threading.Thread(target=client.query, args=("query",))
+  worker.start()
+  time.sleep(0.1)
+  assert session.requests == []
+
+  reset = str(int((time.time() + 3600) * 1000))
+  client._update_budget({
+    "X-RateLimit-Requests-Remaining": "100",
+    "X-RateLimit-Requests-Reset": reset,
+  })
+  worker.join(timeout=5)
+
+  assert not worker.is_alive()
+  assert len(session.requests) == 1
+  assert client.requests_remaining == 99
@@ -0,0 +1,200 @@
+import queue
+import threading
+from concurrent.futures import Future
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("dateutil")
+pytest.importorskip("rich")
+
+from coderush_cli.linear import linear_metrics  # noqa: E402
+from coderush_cli.linear.business_calendar import TeamCalendars  # noqa: E402
+from coderush_cli.linear.models.metrics import LinearOrgMetrics  # noqa: E402
+from coderush_cli.linear.store import IssueStore  # noqa: E402
+
+
+class FakeClient:
+  """Serves issue pages per filter and records every filter it was asked for"""
+
+  def __init__(self, pages_by_field=None, user_ids=()):
+    self.pages_by_field = pages_by_field or {}
+    self.user_ids = user_ids
+    self.filters = []
+    self.lock = threading.Lock()
+
+  def query(self, query, variables=None, cost=0):
+    if query == linear_metrics.USER_IDS_QUERY:
+      return {"users": {"nodes": [{"id": user_id} for user_id in self.user_ids]}}
+    return {"organization": {"id": "org-1"}}
+
+  def paginate(self, query, variables, connection, node_complexity=1, max_page_size=250):
+    if query == linear_metrics.HISTORY_QUERY:
+      yield [
+        {"id": issue_id, "history": {"nodes": [], "pageInfo": {"hasNextPage": False}}}
+        for issue_id in variables["ids"]
+      ]
+      return
+    issue_filter = variables["filter"]
+    with self.lock:
+      self.filters.append(issue_filter)
+    field = next(field for field in ("id", "updatedAt", "createdAt") if field in issue_filter)
+    yield from self.pages_by_field.get(field, [])
+
+
+def make_issue(issue_id, assignee, created_at="2024-03-01T10:00:00+00:00"):
+  return {
+    "id": issue_id,
+    "createdAt": created_at,
+    "updatedAt": created_at,
+    "assignee": {"id": assignee},
+  }
+
+
+def test_fetch_issues_keeps_each_issue_once_across_overlapping_shards():
+  """Test that issues returned by several shards are yielded only once."""
+  client = FakeClient()
+  pages = {
+    "a": [[make_issue("1", "u"), make_issue("2", "u")], [make_issue("3", "u")]],
+    "b": [[make_issue("2", "u"), make_issue("4", "u")]],
+    "c": [[make_issue("1", "u")], [make_issue("4", "u"), make_issue("5", "u")]],
+  }
+  client.paginate = lambda query, variables, *args: iter(pages[variables["filter"]["shard"]])
+
+  issues = list(linear_metrics.fetch_issues(client, [{"shard": shard} for shard in pages]))
+
+  assert sorted(issue["id"] for issue in issues) == ["1", "2", "3", "4", "5"]
+
+
+def stored_assignees(store):
+  stored = store.issues_created_between(datetime(2024, 1, 1), datetime(2024, 12, 31))
+  return [issue["assignee"]["id"] for issue in stored]
+
+
+def test_user_sync_refreshes_issues_reassigned_away(tmp_path):
+  """Test that incremental user syncs are filtered but still see reassignments."""
+  start = datetime.now(timezone.utc) - timedelta(days=30)
+  with IssueStore(tmp_path / "issues.sqlite3") as store:
+    linear_metrics.sync_issues(
+      FakeClient({"createdAt": [[make_issue("1", "alice")]]}), store, start, "alice"
+    )
+
+    # Reassigned to bob since the last sync, so the filtered change fetch misses it
+    client = FakeClient({"id": [[make_issue("1", "bob")]]}, user_ids=["alice"])
+    linear_metrics.sync_issues(client, store, start, "alice")
+
+    searches = [issue_filter for issue_filter in client.filters if "id" not in issue_filter]
+    assert searches and all("or" in issue_filter for issue_filter in searches)
+    (refresh,) = [issue_filter for issue_filter in client.filters if "id" in issue_filter]
+    assert refresh["id"] == {"in": ["1"]} and "updatedAt" in refresh
+    assert stored_assignees(store) == ["bob"]
+
+
+def test_new_user_scope_refreshes_issues_synced_for_everyone(tmp_path):
+  """Test that a user's first sync refreshes what the all-issues sync stored."""
+  start = datetime.now(timezone.utc) - timedelta(days=30)
+  with IssueStore(tmp_path / "issues.sqlite3") as store:
+    linear_metrics.sync_issues(FakeClient({"createdAt": [[make_issue("1", "alice")]]}), store, start)
+
+    client = FakeClient({"id": [[make_issue("1", "bob")]]}, user_ids=["alice"])
+    linear_metrics.sync_issues(client, store, start, "alice")
+
+    (refresh,) = [issue_filter for issue_filter in client.filters if "id" in issue_filter]
+    assert refresh == {"id": {"in": ["1"]}}
+    assert stored_assignees(store) == ["bob"]
+
+
+def test_issue_store_is_named_after_the_workspace():
+  """Test that each workspace syncs into a store of its own."""
+  path = linear_metrics.issue_store_path(FakeClient())
+
+  assert path == linear_metrics.ISSUE_STORE_DIR / "linear-issues-org-1.sqlite3"
+
+
+def resolved(value):
+  future = Future()
+  future.set_result(value)
+  return future
+
+
+def aggregate_in_background(batches, lookups, window):
+  """Run aggregate_batches on its own thread, as get_linear_metrics does"""
+  outcome = Future()
+
+  def run():
+    try:
+      outcome.set_result(
+        linear_metrics.aggregate_batches(
+          batches, LinearOrgMetrics(name="Organization"), lookups, TeamCalendars.from_config(), window
+        )
+      )
+    except Exception as e:
+      outcome.set_exception(e)
+
+  threading.Thread(target=run, daemon=True).start()
+  return outcome
+
+
+def test_aggregate_batches_drains_until_the_sentinel():
+  """Test that every batch is consumed and only issues in the window are aggregated."""
+  batches = queue.Queue(maxsize=1)
+  window = (
+    linear_metrics.to_timestamp(datetime(2024, 2, 1, tzinfo=timezone.utc)),
+    linear_metrics.to_timestamp(datetime(2024, 4, 1, tzinfo=timezone.utc)),
+  )
+  outcome = aggregate_in_background(batches, resolved(linear_metrics.Lookups({}, {}, {}, {})), window)
+
+  batches.put([make_issue("1", "alice"), make_issue("2", "bob")], timeout=1)
+  batches.put([make_issue("3", "alice", created_at="2023-03-01T10:00:00+00:00")], timeout=1)
+  batches.put(None, timeout=1)
+
+  assert outcome.result(timeout=1) == {"1", "2"}
+  assert batches.empty()
+
+
+def test_failed_aggregation_keeps_draining_and_reraises():
+  """Test that an aggregator failure never blocks the producer and is raised at the end."""
+  batches = queue.Queue(maxsize=1)
+  lookups = Future()
+  lookups.set_exception(RuntimeError("lookups failed"))
+  outcome = aggregate_in_background(batches, lookups, (0, float("inf")))
+
+  # With a bounded queue, a put would time out here if the consumer had stopped
+  for index in range(5):
+    batches.put([make_issue(str(index), "alice")], timeout=1)
+  batches.put(None, timeout=1)
+
+  with pytest.raises(RuntimeError, match="lookups failed"):
+    outcome.result(timeout=1)
+  assert batches.empty()
+
+
+def test_failed_sync_still_stops_the_aggregator(monkeypatch, tmp_path):
+  """Test that the sentinel is sent when the producer fails mid-sync."""
+  sentinels = []
+
+  def failing_sync(client, store, start_date, user_filter, on_batch):
+    on_batch([make_issue("1", "alice")])
+    raise RuntimeError("sync failed")
+
+  def aggregate(batches, *args):
+    while True:
+      # Fails instead of hanging the executor's shutdown if no sentinel comes
+      batch = batches.get(timeout=1)
+      if batch is None:
+        sentinels.append(batch)
+        return set()
+
+  monkeypatch.setattr(linear_metrics, "LinearClient", FakeClient)
+  monkeypatch.setattr(linear_metrics, "ISSUE_STORE_DIR", tmp_path)
+  monkeypatch.setattr(linear_metrics, "get_config_value", lambda key: None)
+  monkeypatch.setattr(
+    linear_metrics, "fetch_lookups", lambda client: linear_metrics.Lookups({}, {}, {}, {})
+  )
+  monkeypatch.setattr(linear_metrics, "sync_issues", failing_sync)
+  monkeypatch.setattr(linear_metrics, "aggregate_batches", aggregate)
+
+  with pytest.raises(RuntimeError, match="sync failed"):
+    linear_metrics.get_linear_metrics(datetime(2024, 1, 1), datetime(2024, 12, 31))
+  assert sentinels == [None]
@@ -0,0 +1,90 @@
+from coderush_cli.linear.models.metrics import (
+  CycleTimeMetrics,
+  IssueMetrics,
+  LinearOrgMetrics,
+  TeamMetrics,
+)
+from coderush_cli.linear.models.records import IssueRecord
+
+
+def transition(created_at, from_state, to_state):
+  return {
+    "createdAt": created_at,
+    "fromState": {"name": from_state[0], "type": from_state[1]},
+    "toState": {"name": to_state[0], "type": to_state[1]},
+  }
+
+
+def test_time_in_states_from_history_sweep():
+  """Test that review, triage and blocked time come from one history sweep."""
+  triage, todo = ("Triage", "triage"), ("Todo", "unstarted")
+  blocked, review = ("Blocked", "started"), ("In Review", "started")
+  issue = IssueRecord.from_issue({
+    "id": "issue-1",
+    "createdAt": "2024-03-04T09:00:00.000Z",
+    # Deliberately out of order, as pages do not guarantee ordering
+    "history": {"nodes": [
+      transition("2024-03-04T15:00:00.000Z", review, blocked),
+      transition("2024-03-04T11:00:00.000Z", triage, todo),
+      transition("2024-03-04T12:00:00.000Z", todo, review),
+      transition("2024-03-04T17:00:00.000Z", blocked, review),
+    ]},
+  })
+  metrics = CycleTimeMetrics()
+
+  metrics.update_from_issue(issue)
+
+  assert metrics.time_to_triage == [2]
+  assert metrics.time_in_review == [3]
+  assert metrics.blocked_time == [2]
+
+
+def test_models_consume_normalized_record():
+  """Test that labels are classified once and shared by every model."""
+  issue = IssueRecord.from_issue({
+    "id": "issue-2",
+    "createdAt": "2024-03-04T09:00:00.000Z",
+    "completedAt": "2024-03-05T09:00:00.000Z",
+    "state": {"name": "Done", "type": "completed"},
+    "team": {"id": "t1", "key": "ENG", "name": "Engineering"},
+    "project": {"id": "p1", "slugId": "checkout", "name": "Checkout"},
+    "assignee": {"name": "alice"},
+    "labels": {"nodes": [{"id": "l1", "name": "Bug"}, {"id": "l2", "name": "Feature"}]},
+  })
+  issue_metrics = IssueMetrics()
+  team_metrics = TeamMetrics(name="ENG")
+
+  issue_metrics.update_from_issue(issue)
+  team_metrics.update_from_issue(issue)
+
+  assert issue.is_bug and not issue.is_feature
+  assert issue.completed_at - issue.created_at == 24 * 3600
+  assert issue_metrics.bugs_completed == 1
+  assert issue_metrics.by_project["checkout"]["completed"] == 1
+  assert team_metrics.members == {"alice"}
+  assert team_metrics.projects["checkout"]["bugs"] == 1
+
+
+def test_aggregate_metrics_uses_team_cycle_times():
+  """Test that team averages come from the team's cycle time and estimation data."""
+  issue = IssueRecord.from_issue({
+    "id": "issue-3",
+    "createdAt": "2024-03-04T09:00:00.000Z",
+    "completedAt": "2024-03-04T19:00:00.000Z",
+    "estimate": 5,
+    "team": {"id": "t1", "key": "ENG", "name": "Engineering"},
+    "project": {"id": "p1", "slugId": "checkout", "name": "Checkout"},
+  })
+  org = LinearOrgMetrics(name="acme")
+  org.teams["ENG"] = TeamMetrics(name="ENG")
+  org.teams["OPS"] = TeamMetrics(name="OPS")
+
+  org.teams["ENG"].update_from_issue(issue)
+  org.cycle_time.update_from_issue(issue)
+  org.estimation.update_from_issue(issue, 10)
+  org.aggregate_metrics()
+
+  assert org.teams["ENG"].projects["checkout"]["total_issues"] == 1
+  assert org.teams["ENG"].avg_cycle_time == 10
+  assert org.teams["ENG"].estimation_accuracy == 100
+  assert org.teams["OPS"].avg_cycle_time == 0
@@ -0,0 +1,58 @@
+from datetime import datetime, timezone
+
+from coderush_cli.linear.store import IssueStore
+
+
+def make_issue(issue_id, created_at, updated_at, state="Todo"):
+  return {
+    "id": issue_id,
+    "createdAt": created_at,
+    "updatedAt": updated_at,
+    "state": {"name": state},
+  }
+
+
+def test_upsert_keeps_latest_copy_and_filters_by_created_window(tmp_path):
+  """Test that the store keeps the newest version of each issue."""
+  with IssueStore(tmp_path / "issues.sqlite3") as store:
+    store.upsert([
+      make_issue("a", "2024-03-01T10:00:00.000Z", "2024-03-01T10:00:00.000Z"),
+      make_issue("b", "2024-02-01T10:00:00.000Z", "2024-02-01T10:00:00.000Z"),
+    ])
+    store.upsert([make_issue("a", "2024-03-01T10:00:00.000Z", "2024-03-05T10:00:00.000Z", "Done")])
+    # A stale copy arriving late must not overwrite the newer one
+    store.upsert([make_issue("a", "2024-03-01T10:00:00.000Z", "2024-03-02T10:00:00.000Z")])
+
+    issues = list(store.issues_created_between(datetime(2024, 3, 1), datetime(2024, 3, 31)))
+
+  assert [issue["id"] for issue in issues] == ["a"]
+  assert issues[0]["state"]["name"] == "Done"
+
+
+def test_sync_state_round_trips_per_scope(tmp_path):
+  """Test that high-water marks are stored separately for each scope."""
+  high_water = datetime(2024, 3, 5, tzinfo=timezone.utc)
+  synced_from = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+  with IssueStore(tmp_path / "issues.sqlite3") as store:
+    assert store.sync_state() is None
+    store.record_sync(high_water, synced_from)
+
+    assert store.sync_state() == (high_water, synced_from)
+    assert store.sync_state("user:alice") is None
+
+
+def test_store_is_emptied_when_payload_version_changes(tmp_path):
+  """Test that payloads and marks of an older query shape are not reused."""
+  path = tmp_path / "issues.sqlite3"
+  high_water = datetime(2024, 3, 5, tzinfo=timezone.utc)
+  with IssueStore(path, payload_version=1) as store:
+    store.upsert([make_issue("a", "2024-03-01T10:00:00.000Z", "2024-03-01T10:00:00.000Z")])
+    store.record_sync(high_water, high_water)
+
+  with IssueStore(path, payload_version=1) as store:
+    assert store.sync_state() is not None
+
+  with IssueStore(path, payload_version=2) as store:
+    assert store.sync_state() is None
+    assert list(store.issues_created_between(datetime(2024, 1, 1), datetime(2024, 12, 31))) == []
@@ -0,0 +1,44 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("plotly")
+
+from coderush_cli.report.aggregates import (  # noqa: E402
+  histogram,
+  quantiles,
+  top_n,
+  top_n_rows,
+)
+
+
+def test_histogram_and_quantiles_summarize_every_value():
+  """Test that binned counts and box statistics cover the whole sample."""
+  values = list(range(1, 101)) + [float("nan"), 1000.0]
+
+  binned = histogram(values, bins=10)
+  assert binned.counts.sum() == 101
+  assert len(binned.edges) == 11
+
+  summary = quantiles(values)
+  assert summary.size == 101
+  assert summary.median == 51
+  # 1000 lies beyond 1.5 IQR, so the upper whisker stops at 100
+  assert summary.upper_fence == 100
+  assert summary.lower_fence == 1
+
+
+def test_top_n_folds_the_rest_into_other():
+  """Test that only the largest entries are kept and the remainder is summed."""
+  counts = {"alice": 5, "bob": 9, "carol": 1, "dave": 2}
+  assert top_n(counts, n=2) == [("bob", 9), ("alice", 5), ("Other", 3)]
+  assert top_n(counts, n=2, other=None) == [("bob", 9), ("alice", 5)]
+
+  rows = {
+    "api": {"PRs Created": 10, "Reviews": 4},
+    "web": {"PRs Created": 3, "Reviews": 7},
+    "ops": {"PRs Created": 1, "Reviews": 2},
+  }
+  assert top_n_rows(rows, "PRs Created", n=1) == {
+    "api": {"PRs Created": 10, "Reviews": 4},
+    "Other": {"PRs Created": 4, "Reviews": 9},
+  }
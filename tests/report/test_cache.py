@@ -0,0 +1,31 @@
+import os
+
+from coderush_cli.report.cache import FragmentCache, fingerprint
+
+
+def test_fingerprint_depends_only_on_content():
+  """Test that equal inputs hash alike regardless of key order."""
+  assert fingerprint("overview", {"a": 1, "b": [1, 2]}) == fingerprint(
+    "overview", {"b": [1, 2], "a": 1}
+  )
+  assert fingerprint("overview", {"a": 1}) != fingerprint("overview", {"a": 2})
+  assert fingerprint("overview", {"a": 1}) != fingerprint("quality", {"a": 1})
+
+
+def test_fragment_cache_round_trip_and_prune(tmp_path):
+  """Test that fragments, including empty ones, are reused until pruned."""
+  cache = FragmentCache(tmp_path / ".cache")
+  key = fingerprint("velocity", {})
+
+  assert cache.get("velocity", key) is None
+  cache.put("velocity", key, b"")
+  cache.put("overview", key, b'{"data": []}')
+  assert cache.get("velocity", key) == b""
+  assert cache.get("overview", key) == b'{"data": []}'
+
+  # Only fragments unused for longer than max_age are removed
+  stale = tmp_path / ".cache" / f"velocity-{key}.fragment"
+  os.utime(stale, (0, 0))
+  assert cache.prune() == 1
+  assert cache.get("velocity", key) is None
+  assert cache.get("overview", key) == b'{"data": []}'
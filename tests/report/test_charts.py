@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("plotly")
+
+from coderush_cli.report import charts  # noqa: E402
+from coderush_cli.report.charts import SECTIONS, ImageExportError, render_charts  # noqa: E402
+from coderush_cli.report.model import ReportModel  # noqa: E402
+
+GITHUB_DATA = {
+  "repositories": {
+    "api": {
+      "prs_created": 3,
+      "prs_merged": 2,
+      "contributors": ["alice", "bob"],
+      "time_metrics": {"time_to_merge": [2.0, 30.0]},
+    },
+  },
+  "users": {},
+}
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_render_charts_keeps_report_order(jobs):
+  """Test that charts come back in report order and empty charts are skipped."""
+  sections, images = render_charts(
+    ReportModel.from_github_data(GITHUB_DATA), minify=True, jobs=jobs
+  )
+
+  assert images == []
+  titles = [section.title for section in sections]
+  assert titles == [
+    SECTIONS[name][0]
+    for name in ("overview", "merge_dist", "merge_by_repo", "repo_activity",
+                 "quality", "collaboration", "bottlenecks")
+  ]
+  overview = json.loads(sections[0].spec)
+  assert overview["data"][0]["y"] == [1, 2, 3, 2]
+
+
+def test_image_export_without_kaleido_is_reported(monkeypatch, tmp_path):
+  """Test that a missing kaleido fails before any chart is built."""
+  monkeypatch.setattr(charts, "image_export_available", lambda: False)
+
+  with pytest.raises(ImageExportError, match="coderush-cli\\[images\\]"):
+    render_charts(
+      ReportModel.from_github_data(GITHUB_DATA),
+      image_format="png",
+      image_prefix=tmp_path / "report",
+    )
@@ -0,0 +1,85 @@
+from coderush_cli.report.model import ReportModel
+
+GITHUB_DATA = {
+  "repositories": {
+    "org/api": {
+      "prs_created": 4,
+      "prs_merged": 3,
+      "contributors": ["alice", "bob"],
+      "time_metrics": {"time_to_merge": [1.0, 5.0], "lead_times": [0, 1]},
+      "review_metrics": {
+        "reviews_performed": 3,
+        "review_wait_times": [2.0],
+        "reviewers_per_pr": {"1": ["bob"], "2": ["bob", "carol"]},
+      },
+      "code_metrics": {"hotfixes": 1},
+      "bottleneck_metrics": {"stale_prs": 1, "review_wait_times": [50, 10]},
+      "collaboration_metrics": {"team_reviews": 2, "self_merges": 1},
+    },
+    "org/web": {
+      "prs_created": 1,
+      "contributors": ["bob", "dave"],
+      "bottleneck_metrics": {"blocked_prs": 2, "review_wait_times": [72]},
+      "collaboration_metrics": {"cross_team_reviews": 1},
+    },
+  },
+  "users": {
+    "alice": {
+      "username": "alice",
+      "prs_created": 3,
+      "prs_merged": 2,
+      "time_metrics": {"time_to_merge": [1.0, 4.0]},
+      "code_metrics": {"avg_pr_size": 12.345},
+      "review_metrics": {"blocking_reviews_given": 1},
+    },
+    "deploy[bot]": {"username": "deploy[bot]", "prs_created": 2},
+  },
+}
+
+
+def test_model_aggregates_every_chart_input_in_one_pass():
+  """Test that the model matches per-chart sums over the analysis data."""
+  model = ReportModel.from_github_data(GITHUB_DATA)
+
+  assert model.org_stats == {
+    "Total Repositories": 2,
+    "Active Contributors": 3,
+    "Total PRs": 5,
+    "Merged PRs": 3,
+  }
+  assert model.time_to_merge == [1.0, 5.0]
+  assert model.time_to_merge_by_repo == {"org/api": [1.0, 5.0]}
+  assert model.review_wait_times == [2.0]
+  assert model.reviewers == {"bob": 2, "carol": 1}
+  assert sum(model.weekly_velocity.values()) == 2
+  assert model.collaboration == {
+    "Cross-team Reviews": 1,
+    "Self-merges": 1,
+    "Team Reviews": 2,
+    "External Reviews": 0,
+  }
+  assert model.code_quality == {
+    "Hotfixes": 1,
+    "Reverts": 0,
+    "Blocking Reviews": 1,
+    "Stale PRs": 1,
+  }
+  assert model.bottlenecks == {
+    "Stale PRs": 1,
+    "Long-running PRs": 0,
+    "Blocked PRs": 2,
+    "High Review Wait Time": 2,
+  }
+  assert model.repo_rows["org/web"]["Contributors"] == 2
+
+  # Bots show up in user activity but not in the per-developer rows
+  assert set(model.user_rows) == {"alice", "deploy[bot]"}
+  assert model.developer_rows == {
+    "alice": {
+      "Created": 3,
+      "Merged": 2,
+      "Open": 1,
+      "Avg Size": 12.35,
+      "Avg Review Time": 2,
+    },
+  }
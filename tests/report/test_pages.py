@@ -0,0 +1,58 @@
+import gzip
+import json
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("plotly")
+
+from coderush_cli.report.model import ReportModel  # noqa: E402
+from coderush_cli.report.pages import (  # noqa: E402
+  entity_id,
+  write_entity_data,
+  write_multipage_report,
+)
+
+
+def read_data_file(path):
+  text = path.read_text(encoding="utf-8")
+  assert text.startswith("coderushData(") and text.endswith(");\n")
+  return json.loads(text[len("coderushData("):-3])
+
+
+def test_entity_data_is_paged_busiest_first(tmp_path):
+  """Test that listings are bounded pages and every entity gets a data file."""
+  entities = [
+    (f"org/repo-{index}", {"PRs Created": index}, {"name": f"org/repo-{index}"})
+    for index in range(5)
+  ]
+
+  assert write_entity_data(tmp_path, iter(entities), page_size=2) == 5
+
+  first = read_data_file(tmp_path / "page-1.js")
+  assert first["pages"] == 3
+  assert first["columns"] == ["PRs Created"]
+  assert [entity["name"] for entity in first["entities"]] == ["org/repo-4", "org/repo-3"]
+  assert len(read_data_file(tmp_path / "page-3.js")["entities"]) == 1
+
+  detail = read_data_file(tmp_path / f"{entity_id('org/repo-0')}.js")
+  assert detail == {"name": "org/repo-0"}
+  assert entity_id("org/repo-0") != entity_id("org-repo-0")
+
+
+def test_compressed_multipage_report_gzips_every_file(tmp_path):
+  """Test that --gzip with --pages precompresses every page and data file."""
+  model = ReportModel.from_github_data({
+    "repositories": {"org/api": {"prs_created": 2, "contributors": ["alice"]}},
+    "users": {"alice": {"username": "alice", "prs_created": 2}},
+  })
+
+  write_multipage_report(model, [], tmp_path / "report", plotlyjs="cdn", compress=True)
+
+  written = [
+    path for path in (tmp_path / "report").rglob("*") if path.suffix in (".html", ".js")
+  ]
+  assert len(written) == 7
+  for path in written:
+    with gzip.open(path.with_name(path.name + ".gz"), "rt", encoding="utf-8") as f:
+      assert f.read() == path.read_text(encoding="utf-8")
@@ -0,0 +1,48 @@
+import json
+from datetime import datetime, timedelta
+
+from coderush_cli.run_store import INDEX_FILE, RunStore
+
+
+def test_run_store_finds_runs_through_the_index(tmp_path):
+  """Test that the latest and specific runs are found without scanning files."""
+  store = RunStore(tmp_path)
+  assert store.latest() is None
+  assert store.read() is None
+
+  first = store.save(
+    b'{"metrics": 1}',
+    start_date=datetime(2024, 5, 1),
+    end_date=datetime(2024, 5, 7),
+    filters={"user": "alice", "team": None},
+  )
+  second = store.save(b'{"metrics": 2}')
+
+  assert store.latest() == second
+  assert store.get(first.run_id) == first
+  assert store.read() == b'{"metrics": 2}'
+  assert store.read(first.run_id) == b'{"metrics": 1}'
+  assert first.filters == {"user": "alice"}
+  assert first.start_date == "2024-05-01T00:00:00"
+  assert first.size == len(b'{"metrics": 1}')
+  assert [run.run_id for run in store.runs()] == [second.run_id, first.run_id]
+
+  # Unrelated JSON files in the directory are never picked up
+  (tmp_path / "unrelated.json").write_text("{}")
+  assert RunStore(tmp_path).latest() == second
+
+
+def test_prune_keeps_the_newest_runs(tmp_path):
+  """Test that retention removes old run files and their index entries."""
+  store = RunStore(tmp_path)
+  runs = [store.save(f"{index}".encode(), keep=None) for index in range(4)]
+
+  removed = store.prune(keep=2)
+  assert {run.run_id for run in removed} == {runs[0].run_id, runs[1].run_id}
+  assert not store.path(runs[0]).exists()
+  assert store.latest() == runs[3]
+
+  index = json.loads((tmp_path / INDEX_FILE).read_text())
+  assert set(index["runs"]) == {runs[2].run_id, runs[3].run_id}
+
+  assert store.prune(keep=None, max_age=timedelta(0)) and store.latest() is None
@@ -0,0 +1,107 @@
+import json
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from coderush_cli.github.models.metrics import OrganizationMetrics, RepositoryMetrics
+from coderush_cli.linear.models.metrics import TeamMetrics
+from coderush_cli.serialization import (
+  MetricsJSONEncoder,
+  dataclass_to_dict,
+  metrics_to_dict,
+  to_jsonable,
+)
+
+
+def test_to_dict_gives_plain_data():
+  """Test that sets, defaultdicts and datetimes are converted at every depth."""
+  repo = RepositoryMetrics(name="org/api")
+  repo.contributors.update({"alice", "bob"})
+  repo.review_metrics.reviewers_per_pr[7].add("carol")
+  repo.collaboration_metrics.comments_by_user["carol"][7] += 2
+  repo.time_metrics.time_to_merge.append(3.5)
+  repo.last_updated = datetime(2024, 5, 1, 12, tzinfo=timezone.utc)
+  repo._cache = {"not": "serialized"}
+
+  data = repo.to_dict()
+
+  assert data["name"] == "org/api"
+  assert sorted(data["contributors"]) == ["alice", "bob"]
+  assert data["review_metrics"]["reviewers_per_pr"] == {7: ["carol"]}
+  assert type(data["collaboration_metrics"]["comments_by_user"]) is dict
+  assert type(data["collaboration_metrics"]["comments_by_user"]["carol"]) is dict
+  assert data["time_metrics"]["time_to_merge"] == [3.5]
+  assert data["last_updated"] == "2024-05-01T12:00:00+00:00"
+  assert "_cache" not in data
+  json.dumps(data)
+
+  team = TeamMetrics(name="core", members={"dana"})
+  assert team.to_dict()["members"] == ["dana"]
+
+
+def test_overridden_to_dict_is_kept():
+  """Test that to_dict overrides still apply, while the encoder writes every field."""
+  org = OrganizationMetrics(name="org")
+  org.get_or_create_user("alice", team="platform")
+  org.prs_created = 4
+
+  assert to_jsonable(org) == org.to_dict()
+  assert "prs_created" not in org.to_dict()
+  assert org.to_dict()["teams"] == {"platform": ["alice"]}
+
+  summary = metrics_to_dict(org)
+  assert summary["prs_created"] == 4
+  assert summary["users"]["alice"]["team"] == "platform"
+  assert json.loads(json.dumps(org, cls=MetricsJSONEncoder)) == json.loads(
+    json.dumps(summary)
+  )
+
+
+def test_encoder_converts_in_one_pass():
+  """Test that the encoder never falls back to default for metrics values."""
+  org = OrganizationMetrics(name="org")
+  repo = org.get_or_create_repository("org/api")
+  repo.review_metrics.reviewers_per_pr[1].add("alice")
+  repo.last_updated = datetime(2024, 5, 1, tzinfo=timezone.utc)
+  fallbacks = []
+
+  class RecordingEncoder(MetricsJSONEncoder):
+    def default(self, obj):
+      fallbacks.append(obj)
+      return super().default(obj)
+
+  data = json.loads(json.dumps({"github": org}, cls=RecordingEncoder))
+
+  assert fallbacks == []
+  assert data["github"]["repositories"]["org/api"]["review_metrics"]["reviewers_per_pr"] == {
+    "1": ["alice"]
+  }
+
+
+@dataclass
+class Node:
+  name: str
+  tags: List[str] = field(default_factory=list)
+  scores: Dict[str, Dict[str, float]] = field(
+    default_factory=lambda: defaultdict(dict)
+  )
+  child: Optional["Node"] = None
+  to_dict = dataclass_to_dict
+
+
+def test_serializer_follows_annotations_and_falls_back():
+  """Test recursive dataclasses and values their annotations don't describe."""
+  root = Node("root", tags=["a"], child=Node("leaf"))
+  root.scores["x"]["y"] = 1.0
+
+  assert root.to_dict() == {
+    "name": "root",
+    "tags": ["a"],
+    "scores": {"x": {"y": 1.0}},
+    "child": {"name": "leaf", "tags": [], "scores": {}, "child": None},
+  }
+
+  # A value that doesn't match its annotation still converts at run time
+  root.child = {"when": datetime(2024, 1, 1)}
+  assert root.to_dict()["child"] == {"when": "2024-01-01T00:00:00"}
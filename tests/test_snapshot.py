@@ -0,0 +1,98 @@
+import io
+from collections import defaultdict
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("msgpack")
+
+from coderush_cli.snapshot import (  # noqa: E402
+  LazyAnalysis,
+  SnapshotError,
+  dumps_snapshot,
+  iter_frames,
+  loads_snapshot,
+  open_snapshot,
+)
+
+
+def encode_default(obj):
+  if isinstance(obj, datetime):
+    return obj.isoformat()
+  if isinstance(obj, set):
+    return sorted(obj)
+  raise TypeError(obj)
+
+
+def test_snapshot_round_trip_streams_one_frame_per_section():
+  """Test that a snapshot decodes to the same data the JSON path produced."""
+  data = {
+    "metrics": {
+      "github": {"repositories": {"org/api": {"contributors": {"bob", "alice"}}}},
+      "linear": defaultdict(int, {"issues": 3}),
+    },
+    "analysis": "Looks healthy",
+    "timestamp": datetime(2024, 5, 1, 12, 30),
+  }
+
+  content = dumps_snapshot(data, default=encode_default)
+
+  paths = [path for path, _ in iter_frames(io.BytesIO(content))]
+  assert paths == [
+    ("metrics", "github", "repositories", "org/api"),
+    ("metrics", "linear"),
+    ("analysis",),
+    ("timestamp",),
+  ]
+  assert loads_snapshot(content) == {
+    "metrics": {
+      "github": {"repositories": {"org/api": {"contributors": ["alice", "bob"]}}},
+      "linear": {"issues": 3},
+    },
+    "analysis": "Looks healthy",
+    "timestamp": "2024-05-01T12:30:00",
+  }
+
+
+def test_snapshot_rejects_other_files():
+  """Test that JSON or truncated files are reported rather than misread."""
+  with pytest.raises(SnapshotError):
+    loads_snapshot(b'{"metrics": {}}')
+  content = dumps_snapshot({"analysis": "x" * 100})
+  with pytest.raises(SnapshotError):
+    loads_snapshot(content[:-5])
+
+
+class Metrics:
+  def __init__(self, repositories):
+    self.repositories = repositories
+
+  def to_dict(self):
+    return {"repositories": self.repositories, "users": {}}
+
+
+def test_lazy_analysis_decodes_only_the_frames_read(tmp_path):
+  """Test that opening a snapshot indexes frames and decodes them on access."""
+  repositories = {f"org/repo-{index}": {"prs_created": index} for index in range(3)}
+  data = {"metrics": {"github": Metrics(repositories)}, "analysis": "ok"}
+
+  def default(obj):
+    return obj.to_dict()
+
+  path = tmp_path / "run.crs"
+  path.write_bytes(dumps_snapshot(data, default=default))
+
+  analysis = open_snapshot(path)
+  github = analysis["metrics"]["github"]
+  assert isinstance(github["repositories"], LazyAnalysis)
+  assert list(github["repositories"]) == list(repositories)
+  assert analysis._cache == {}
+
+  assert github["repositories"]["org/repo-2"] == {"prs_created": 2}
+  assert len(analysis._cache) == 1
+  assert github["users"] == {}
+  assert analysis.to_dict() == {
+    "metrics": {"github": {"repositories": repositories, "users": {}}},
+    "analysis": "ok",
+  }
+  assert repr(analysis["metrics"]) == repr(analysis.to_dict()["metrics"])